@@ -15,12 +15,19 @@ class Config:
         space_id (str): Storyblok space ID.
         management_token (str): Storyblok management API token.
         public_token (str): Storyblok default public API token.
+        cache_dir (str): Directory for on-disk caches (optional, STORYBLOK_MCP_CACHE_DIR).
+        region (Optional[str]): Pinned space region code (optional, STORYBLOK_REGION);
+            detected automatically when unset.
     """
     def __init__(self):
         """Initializes Config and validates required environment variables."""
         self.space_id = os.getenv("STORYBLOK_SPACE_ID")
         self.management_token = os.getenv("STORYBLOK_MANAGEMENT_TOKEN")
         self.public_token = os.getenv("STORYBLOK_DEFAULT_PUBLIC_TOKEN")
+        self.cache_dir = os.getenv("STORYBLOK_MCP_CACHE_DIR") or os.path.join(
+            os.path.expanduser("~"), ".cache", "storyblok-mcp", str(self.space_id)
+        )
+        self.region = (os.getenv("STORYBLOK_REGION") or "").strip().lower() or None
 
         if not self.space_id:
             raise ConfigError("STORYBLOK_SPACE_ID is missing.")
@@ -28,7 +35,17 @@ class Config:
             raise ConfigError("STORYBLOK_MANAGEMENT_TOKEN is missing.")
         if not self.public_token:
             raise ConfigError("STORYBLOK_DEFAULT_PUBLIC_TOKEN is missing.")
+        if self.region and self.region not in REGION_ENDPOINTS:
+            raise ConfigError(f"STORYBLOK_REGION must be one of {list(REGION_ENDPOINTS)}.")
 
-API_ENDPOINTS = {
-    "MANAGEMENT": "https://mapi.storyblok.com/v1"
+# Management and Delivery API base URLs per Storyblok region
+REGION_ENDPOINTS = {
+    "eu": {"MANAGEMENT": "https://mapi.storyblok.com/v1", "DELIVERY": "https://api.storyblok.com/v2/cdn"},
+    "us": {"MANAGEMENT": "https://api-us.storyblok.com/v1", "DELIVERY": "https://api-us.storyblok.com/v2/cdn"},
+    "ca": {"MANAGEMENT": "https://api-ca.storyblok.com/v1", "DELIVERY": "https://api-ca.storyblok.com/v2/cdn"},
+    "ap": {"MANAGEMENT": "https://api-ap.storyblok.com/v1", "DELIVERY": "https://api-ap.storyblok.com/v2/cdn"},
+    "cn": {"MANAGEMENT": "https://app.storyblokchina.cn/v1", "DELIVERY": "https://app.storyblokchina.cn/v2/cdn"},
 }
+
+# Endpoints of the default (EU) region; use utils.endpoints to build region-aware URLs
+API_ENDPOINTS = dict(REGION_ENDPOINTS["eu"])
@@ -1,5 +1,6 @@
 import sys
 import signal
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
 from config import Config
 from tools.components import register_components
@@ -32,14 +33,43 @@ from tools.approvals import register_approvals
 from tools.activities import register_activities
 from tools.extensions import register_extensions
 from tools.field_plugins import register_field_plugin_retrieval
+from tools.jobs import register_jobs
+from tools.batch import register_batch
+from tools.plans import register_plans
+from utils.api import RetryTransport, api_metrics, call_deadline
+from utils.concurrency import AdaptiveLimitTransport, adaptive_limiter
+from utils.hedging import HedgingTransport
+from utils.resilience import ResilientTransport
+from utils.endpoints import endpoints
 from httpx import AsyncClient
 
 # Load and validate config (space ID, tokens)
 cfg = Config()
-client = AsyncClient() 
+# The limiter sits below hedging so every copy of a request, including an original
+# still finishing after its hedge won, holds its own slot while it runs
+hedging = HedgingTransport(AdaptiveLimitTransport())
+transport = ResilientTransport(RetryTransport(hedging))
+api_metrics.register("resilience", transport.snapshot)
+api_metrics.register("latency", hedging.snapshot)
+api_metrics.register("concurrency", adaptive_limiter.snapshot)
+client = AsyncClient(transport=transport)
+
+
+class StoryblokMCP(FastMCP):
+    """FastMCP server that gives every tool call its own upstream retry deadline."""
+    async def call_tool(self, name, arguments):
+        with call_deadline():
+            return await super().call_tool(name, arguments)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Detect the space's API region once before serving requests."""
+    await endpoints.detect(client)
+    yield
 
 # Create MCP server instance with name/version
-mcp = FastMCP(name="storyblok-mcp-server", version="1.0.0")
+mcp = StoryblokMCP(name="storyblok-mcp-server", version="1.0.0", lifespan=lifespan)
 
 all_tools_info = [
     # access_tokens.py
@@ -51,6 +81,7 @@ all_tools_info = [
     # activities.py
     {"name": "retrieve_multiple_activities", "description": "Retrieve multiple activities."},
     {"name": "retrieve_single_activity", "description": "Retrieve a single activity."},
+    {"name": "query_activities", "description": "Aggregate activity history by user, key, resource and time bucket."},
 
     # approvals.py
     {"name": "retrieve_multiple_approvals", "description": "Retrieve multiple approvals."},
@@ -69,6 +100,8 @@ all_tools_info = [
     {"name": "bulk_restore_assets", "description": "Bulk restore assets."},
     {"name": "init_asset_upload", "description": "Initialize asset upload."},
     {"name": "complete_asset_upload", "description": "Complete asset upload."},
+    {"name": "upload_assets", "description": "Upload local files or globs as assets, resumable."},
+    {"name": "index_assets", "description": "Build the asset fingerprint index for deduplication."},
 
     # assets_folder.py
     {"name": "retrieve_asset_folders", "description": "Retrieve asset folders."},
@@ -76,6 +109,13 @@ all_tools_info = [
     {"name": "create_asset_folder", "description": "Create an asset folder."},
     {"name": "update_asset_folder", "description": "Update an asset folder."},
     {"name": "delete_asset_folder", "description": "Delete an asset folder."},
+    {"name": "get_asset_folder_tree", "description": "Nested asset folder tree with asset counts."},
+    {"name": "list_assets_recursive", "description": "List all assets under a folder and its subfolders."},
+    {"name": "move_asset_folder_tree", "description": "Move a folder subtree, or all of its assets, to another folder."},
+    {"name": "delete_asset_folder_tree", "description": "Delete a folder and its subfolders recursively."},
+
+    # batch.py
+    {"name": "execute_batch", "description": "Run several tool calls in one request, with references between results."},
 
     # branch_deployments.py
     {"name": "create_branch_deployment", "description": "Create a branch deployment."},
@@ -109,6 +149,9 @@ all_tools_info = [
     {"name": "create_datasource_entry", "description": "Create a datasource entry."},
     {"name": "update_datasource_entry", "description": "Update a datasource entry."},
     {"name": "delete_datasource_entry", "description": "Delete a datasource entry."},
+    {"name": "export_datasource", "description": "Export all datasource entries to CSV/NDJSON."},
+    {"name": "import_datasource", "description": "Import datasource entries from CSV/NDJSON with keyed diff."},
+    {"name": "lookup_datasource_values", "description": "Resolve many datasource keys from a cached datasource."},
 
     # data_sources.py
     {"name": "retrieve_multiple_datasources", "description": "Retrieve multiple datasources."},
@@ -124,6 +167,7 @@ all_tools_info = [
     {"name": "create_discussion", "description": "Create a discussion."},
     {"name": "retrieve_my_discussions", "description": "Retrieve my discussions."},
     {"name": "resolve_discussion", "description": "Resolve a discussion."},
+    {"name": "collect_discussions", "description": "Collect discussions and comments across stories into a report."},
     {"name": "retrieve_multiple_comments", "description": "Retrieve multiple comments."},
     {"name": "create_comment", "description": "Create a comment."},
     {"name": "update_comment", "description": "Update a comment."},
@@ -151,11 +195,17 @@ all_tools_info = [
     {"name": "update_internal_tag", "description": "Update an internal tag."},
     {"name": "delete_internal_tag", "description": "Delete an internal tag."},
 
+    # jobs.py
+    {"name": "get_job_status", "description": "Get the status of a background job."},
+    {"name": "get_job_results", "description": "Page through the per-item results of a background job."},
+    {"name": "cancel_job", "description": "Cancel a running background job."},
+
     # meta.py
     {"name": "list_tools", "description": "List all available tools."},
 
     # ping.py
     {"name": "ping", "description": "Ping the server."},
+    {"name": "get_api_metrics", "description": "Upstream request and retry counters."},
 
     # pipelines.py
     {"name": "retrieve_multiple_branches", "description": "Retrieve multiple branches."},
@@ -164,6 +214,10 @@ all_tools_info = [
     {"name": "update_branch", "description": "Update a branch."},
     {"name": "delete_branch", "description": "Delete a branch."},
 
+    # plans.py
+    {"name": "get_plan", "description": "Review a dry-run plan of a bulk mutation."},
+    {"name": "apply_plan", "description": "Apply a dry-run plan by ID without recomputing it."},
+
     # presets.py
     {"name": "retrieve_multiple_presets", "description": "Retrieve multiple presets."},
     {"name": "retrieve_single_preset", "description": "Retrieve a single preset."},
@@ -177,6 +231,7 @@ all_tools_info = [
     {"name": "create_release", "description": "Create a release."},
     {"name": "update_release", "description": "Update a release."},
     {"name": "delete_release", "description": "Delete a release."},
+    {"name": "assemble_release", "description": "Attach a story selection to a release and verify its manifest."},
 
     # scheduling_stories.py
     {"name": "retrieve_multiple_story_schedules", "description": "Retrieve multiple story schedules."},
@@ -184,6 +239,8 @@ all_tools_info = [
     {"name": "create_story_schedule", "description": "Create a story schedule."},
     {"name": "update_story_schedule", "description": "Update a story schedule."},
     {"name": "delete_story_schedule", "description": "Delete a story schedule."},
+    {"name": "get_schedule_overview", "description": "Time-ordered schedule overview with conflict detection."},
+    {"name": "bulk_schedule_stories", "description": "Create or move many story schedules in one batch."},
 
     # space.py
     {"name": "fetch_spaces", "description": "Fetch spaces."},
@@ -204,6 +261,7 @@ all_tools_info = [
     # stories.py
     {"name": "fetch_stories", "description": "Fetch stories."},
     {"name": "get_story", "description": "Get a story."},
+    {"name": "get_stories_batch", "description": "Get many stories by IDs, UUIDs or slugs."},
     {"name": "create_story", "description": "Create a story."},
     {"name": "update_story", "description": "Update a story."},
     {"name": "delete_story", "description": "Delete a story."},
@@ -215,18 +273,22 @@ all_tools_info = [
     {"name": "debug_story_access", "description": "Debug story access."},
     {"name": "bulk_publish_stories", "description": "Bulk publish stories."},
     {"name": "bulk_delete_stories", "description": "Bulk delete stories."},
-    {"name": "bulk_update_stories", "description": "Bulk update stories."},
+    {"name": "bulk_update_stories", "description": "Bulk update stories (dry_run=True returns a plan)."},
     {"name": "bulk_create_stories", "description": "Bulk create stories."},
     {"name": "get_unpublished_dependencies", "description": "Get unpublished dependencies."},
+    {"name": "plan_release_publish", "description": "Plan a dependency-ordered publish for stories or a release."},
     {"name": "ai_translate_story", "description": "AI translate story."},
     {"name": "compare_story_versions", "description": "Compare story versions."},
+    {"name": "diff_story_versions", "description": "Locally diff story versions by blok _uid."},
+    {"name": "diff_stories", "description": "Locally diff the content of two stories."},
 
     # tags.py
     {"name": "retrieve_multiple_tags", "description": "Retrieve multiple tags."},
     {"name": "create_tag", "description": "Create a tag."},
     {"name": "update_tag", "description": "Update a tag."},
     {"name": "delete_tag", "description": "Delete a tag."},
-    {"name": "tag_bulk_association", "description": "Bulk tag association."},
+    {"name": "tag_bulk_association", "description": "Bulk tag association in chunked, retried payloads (dry_run=True returns a plan)."},
+    {"name": "bulk_update_story_tags", "description": "Add/remove tags on many stories, sending only changed tag lists."},
 
     # tasks.py
     {"name": "retrieve_multiple_tasks", "description": "Retrieve multiple tasks."},
@@ -260,6 +322,7 @@ all_tools_info = [
     # workflow_stage_changes.py
     {"name": "retrieve_multiple_workflow_stage_changes", "description": "Retrieve multiple workflow stage changes."},
     {"name": "create_workflow_stage_change", "description": "Create a workflow stage change."},
+    {"name": "bulk_change_workflow_stage", "description": "Validate and apply a workflow stage change to many stories."},
 ]
 
 # Register all modular tool implementations for Storyblok MCP
@@ -293,6 +356,9 @@ register_approvals(mcp, client)
 register_activities(mcp, client)
 register_extensions(mcp, client)
 register_field_plugin_retrieval(mcp, client)
+register_jobs(mcp, client)
+register_batch(mcp, client)
+register_plans(mcp, client)
 
 # Graceful exit on unexpected errors
 def _exit(*args):
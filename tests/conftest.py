@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# config.py validates these at import time; tests never reach the API
+os.environ.setdefault("STORYBLOK_SPACE_ID", "1")
+os.environ.setdefault("STORYBLOK_MANAGEMENT_TOKEN", "test")
+os.environ.setdefault("STORYBLOK_DEFAULT_PUBLIC_TOKEN", "test")
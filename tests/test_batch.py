@@ -0,0 +1,44 @@
+import asyncio
+import time
+import pytest
+from mcp.server.fastmcp import FastMCP
+from tools.batch import BatchError, build_dag, find_references, register_batch, resolve
+from utils.api import TOOL_CALL_DEADLINE, _deadline, call_deadline
+
+
+def test_literal_dollar_text_is_not_a_reference():
+    arguments = {"content": {"text": "Only $100, was $0.5 and $1 off"}, "name": "$$0"}
+    assert find_references(arguments) == set()
+    assert resolve(arguments, {}) == arguments
+    assert build_dag([{"tool": "a", "arguments": arguments}]) == [set()]
+
+
+def test_ref_object_is_replaced_with_referenced_value():
+    results = {0: {"story": {"id": 42, "tag_list": ["a", "b"]}}}
+    arguments = {"story_id": {"$ref": "0.story.id"}, "tags": [{"$ref": "0.story.tag_list.1"}]}
+    assert find_references(arguments) == {0}
+    assert resolve(arguments, results) == {"story_id": 42, "tags": ["b"]}
+
+
+def test_malformed_ref_object_is_rejected():
+    with pytest.raises(BatchError):
+        find_references({"story_id": {"$ref": "first.story.id"}})
+
+
+def test_nested_calls_get_their_own_deadline():
+    mcp = FastMCP("test")
+    register_batch(mcp, None)
+
+    @mcp.tool()
+    async def remaining() -> float:
+        return _deadline.get() - time.monotonic()
+
+    async def main():
+        # An almost spent outer budget must not carry over to the nested call
+        with call_deadline(0.01):
+            await asyncio.sleep(0.02)
+            return await mcp._tool_manager.call_tool("execute_batch", {"calls": [{"tool": "remaining", "arguments": {}}]})
+
+    result = asyncio.run(main())
+    assert result["succeeded"] == 1
+    assert result["results"][0]["result"] > TOOL_CALL_DEADLINE - 5
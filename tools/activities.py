@@ -1,5 +1,9 @@
+import asyncio
 import json
-from typing import Any, Optional, List
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, List, Tuple
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import (
@@ -7,7 +11,137 @@ from utils.api import (
     get_management_headers,
     _handle_response,
     APIError,
+    cfg,
+    fetch_all_pages,
 )
+from utils.columnar import STRING, ColumnStore
+from utils.dates import parse_timestamp
+
+ACTIVITY_SCHEMA = {
+    "id": "q",
+    "created_at": "d",
+    "owner_id": "q",
+    "owner_name": STRING,
+    "trackable_id": "q",
+    "trackable_type": STRING,
+    "trackable_name": STRING,
+    "key": STRING,
+}
+# group_by name -> columns reported for each group
+ACTIVITY_GROUPS = {
+    "owner": ("owner_id", "owner_name"),
+    "key": ("key",),
+    "trackable_type": ("trackable_type",),
+    "trackable": ("trackable_type", "trackable_id", "trackable_name"),
+}
+ACTIVITY_BUCKETS = ("hour", "day", "week", "month")
+# Days of history loaded the first time activities are queried
+DEFAULT_HISTORY_DAYS = 90
+
+_activity_store: Optional[ColumnStore] = None
+# Serializes syncs so concurrent queries never append the same activities twice
+_sync_lock = asyncio.Lock()
+
+
+def get_activity_store() -> ColumnStore:
+    """Columnar activity store under the cache directory, loaded on first use."""
+    global _activity_store
+    if _activity_store is None:
+        _activity_store = ColumnStore(os.path.join(cfg.cache_dir, "activities"), ACTIVITY_SCHEMA)
+    return _activity_store
+
+
+def activity_row(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Flatten an activities list item (bare or wrapped with trackable/user) to a store row."""
+    activity = item.get("activity", item)
+    created = parse_timestamp(activity.get("created_at"))
+    if activity.get("id") is None or created is None:
+        return None
+    user = item.get("user") or {}
+    trackable = item.get("trackable") or {}
+    return {
+        "id": int(activity["id"]),
+        "created_at": created.timestamp(),
+        "owner_id": activity.get("owner_id"),
+        "owner_name": user.get("friendly_name") or user.get("userid"),
+        "trackable_id": activity.get("trackable_id"),
+        "trackable_type": activity.get("trackable_type"),
+        "trackable_name": trackable.get("name"),
+        "key": activity.get("key"),
+    }
+
+
+async def sync_activities(client: AsyncClient, store: ColumnStore, since: datetime) -> int:
+    """
+    Bring the store up to date: fetch activities newer than the newest stored one
+    and, if `since` is earlier than the stored history, backfill the gap.
+    Syncs run one at a time and only activities whose ID is not stored yet are
+    appended; metadata is updated with each append, so a failed range never causes
+    rows to be added twice.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        store (ColumnStore): Activity store.
+        since (datetime): Earliest time the store must cover.
+
+    Returns:
+        int: Rows added.
+    """
+    async with _sync_lock:
+        url = build_management_url("/activities/")
+        day_start = since.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        covered_from = store.meta.get("covered_from")
+        # (query, history start covered once the range is stored)
+        ranges: List[Tuple[Dict[str, str], float]] = []
+        if not len(store) or covered_from is None:
+            ranges.append(({"created_at_gte": since.strftime("%Y-%m-%d")}, day_start))
+        else:
+            last = datetime.fromtimestamp(store.columns["created_at"][-1], timezone.utc)
+            ranges.append(({"created_at_gte": last.strftime("%Y-%m-%d")}, covered_from))
+            if day_start < covered_from:
+                covered = datetime.fromtimestamp(covered_from, timezone.utc)
+                ranges.append((
+                    {"created_at_gte": since.strftime("%Y-%m-%d"), "created_at_lte": covered.strftime("%Y-%m-%d")},
+                    day_start,
+                ))
+
+        known = set(store.columns["id"])
+        added = 0
+        changed = False
+        for params, covers in ranges:
+            items = await fetch_all_pages(client, url, "activities", params)
+            rows = []
+            for row in map(activity_row, items):
+                if row is not None and row["id"] not in known:
+                    known.add(row["id"])
+                    rows.append(row)
+            if rows:
+                added += store.append(rows)
+                store.sort_by("created_at")
+            if rows or covers != store.meta.get("covered_from"):
+                changed = True
+                ids = store.columns["id"]
+                store.meta = {
+                    "max_id": max(ids) if ids else 0,
+                    "min_id": min(ids) if ids else 0,
+                    "covered_from": covers,
+                    "synced_at": time.time(),
+                }
+        if changed:
+            store.save()
+        return added
+
+
+def bucket_label(timestamp: float, bucket: str) -> str:
+    """Start of the UTC time bucket containing a timestamp, as an ISO string."""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    if bucket == "hour":
+        return moment.strftime("%Y-%m-%dT%H:00Z")
+    if bucket == "week":
+        return (moment - timedelta(days=moment.weekday())).strftime("%Y-%m-%d")
+    if bucket == "month":
+        return moment.strftime("%Y-%m")
+    return moment.strftime("%Y-%m-%d")
 
 def register_activities(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -57,4 +191,109 @@ def register_activities(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
-    
\ No newline at end of file
+    @mcp.tool()
+    async def query_activities(
+        group_by: Optional[List[str]] = None,
+        bucket: Optional[str] = None,
+        metric: str = "count",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        keys: Optional[List[str]] = None,
+        trackable_types: Optional[List[str]] = None,
+        owner_ids: Optional[List[int]] = None,
+        top: int = 20,
+        sync: bool = True
+    ) -> Any:
+        """
+        Aggregates activity history stored locally in a compact columnar store.
+        New activities are synced first (sync=False answers from the local store only).
+
+        - group_by: Any of 'owner', 'key', 'trackable_type', 'trackable'.
+        - bucket: Time bucket 'hour', 'day', 'week' or 'month'.
+        - metric: 'count' (activities) or 'distinct_trackables' (e.g. distinct stories touched).
+        - start / end: ISO-8601 bounds (default: the last 90 days).
+        - keys / trackable_types / owner_ids: Filters (e.g. keys=['story.update']).
+        - top: Groups returned (per bucket when bucketing).
+        """
+        try:
+            group_by = group_by or []
+            unknown = [g for g in group_by if g not in ACTIVITY_GROUPS]
+            if unknown or (bucket and bucket not in ACTIVITY_BUCKETS) or metric not in ("count", "distinct_trackables"):
+                return {"isError": True, "content": [{"type": "text", "text": (
+                    f"group_by must be from {list(ACTIVITY_GROUPS)}, bucket from {list(ACTIVITY_BUCKETS)}, "
+                    "metric 'count' or 'distinct_trackables'."
+                )}]}
+            now = datetime.now(timezone.utc)
+            since = parse_timestamp(start) or now - timedelta(days=DEFAULT_HISTORY_DAYS)
+            until = parse_timestamp(end)
+
+            store = get_activity_store()
+            synced = await sync_activities(client, store, since) if sync else 0
+            began = time.perf_counter()
+
+            lo, hi = store.range("created_at", since.timestamp(), until.timestamp() if until else None)
+            columns = store.columns
+            group_columns = list(dict.fromkeys(c for g in group_by for c in ACTIVITY_GROUPS[g]))
+            key_codes = {store.code("key", k) for k in keys or []}
+            type_codes = {store.code("trackable_type", t) for t in trackable_types or []}
+            owners = set(owner_ids or [])
+
+            counts: Dict[Tuple, Any] = {}
+            scanned = 0
+            # Bucket labels only change per hour/day, so they are computed once per slot
+            slot_width = 3600 if bucket == "hour" else 86400
+            labels: Dict[int, str] = {}
+            for i in range(lo, hi):
+                if keys and columns["key"][i] not in key_codes:
+                    continue
+                if trackable_types and columns["trackable_type"][i] not in type_codes:
+                    continue
+                if owners and columns["owner_id"][i] not in owners:
+                    continue
+                scanned += 1
+                group = tuple(columns[c][i] for c in group_columns)
+                if bucket:
+                    slot = int(columns["created_at"][i] // slot_width)
+                    label = labels.get(slot)
+                    if label is None:
+                        label = labels[slot] = bucket_label(slot * slot_width, bucket)
+                    group = (label,) + group
+                if metric == "count":
+                    counts[group] = counts.get(group, 0) + 1
+                else:
+                    counts.setdefault(group, set()).add((columns["trackable_type"][i], columns["trackable_id"][i]))
+
+            def describe(group: Tuple, value: Any) -> Dict[str, Any]:
+                row: Dict[str, Any] = {}
+                if bucket:
+                    row["bucket"], group = group[0], group[1:]
+                for column, raw in zip(group_columns, group):
+                    row[column] = store.decode(column, raw) if ACTIVITY_SCHEMA[column] == STRING else raw
+                row[metric] = value if metric == "count" else len(value)
+                return row
+
+            results = [describe(group, value) for group, value in counts.items()]
+            if bucket:
+                per_bucket: Dict[str, List[Dict[str, Any]]] = {}
+                for row in results:
+                    per_bucket.setdefault(row["bucket"], []).append(row)
+                results = [
+                    row for label in sorted(per_bucket)
+                    for row in sorted(per_bucket[label], key=lambda r: -r[metric])[:top]
+                ]
+            else:
+                results = sorted(results, key=lambda r: -r[metric])[:top]
+
+            return {
+                "results": results,
+                "groups": len(counts),
+                "activities_matched": scanned,
+                "rows_in_range": hi - lo,
+                "store_rows": len(store),
+                "new_rows_synced": synced,
+                "query_ms": round((time.perf_counter() - began) * 1000, 2),
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        except OSError as e:
+            return {"isError": True, "content": [{"type": "text", "text": f"Activity store unavailable: {e}"}]}
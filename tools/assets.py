@@ -1,7 +1,13 @@
+import asyncio
+import glob
+import hashlib
 import json
+import mimetypes
+import os
 from typing import Optional, Dict, Any, Literal, List
+import httpx
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from utils.api import (
     build_management_url,
     get_management_headers,
@@ -9,9 +15,39 @@ from utils.api import (
     create_pagination_params,
     add_optional_params,
     APIError,
+    cfg,
+    fetch_all_pages,
 )
+from utils.asset_index import AssetFingerprintIndex, perceptual_hash, sha256_file
+from utils.concurrency import gather_bounded
+from utils.disk_cache import JSONLJournal
 from datetime import datetime
 
+# Max per-file entries echoed back by upload_assets; the journal keeps the full record
+MAX_UPLOAD_RESULTS = 500
+
+_asset_index: Optional[AssetFingerprintIndex] = None
+
+
+def get_asset_index() -> AssetFingerprintIndex:
+    """Load the asset fingerprint index on first use."""
+    global _asset_index
+    if _asset_index is None:
+        _asset_index = AssetFingerprintIndex()
+    return _asset_index
+
+
+def expand_upload_paths(paths: List[str]) -> List[str]:
+    """
+    Expand local file paths and glob patterns (recursive ** supported) into
+    a sorted, de-duplicated list of absolute file paths.
+    """
+    files = set()
+    for pattern in paths:
+        matches = glob.glob(os.path.expanduser(pattern), recursive=True) or [os.path.expanduser(pattern)]
+        files.update(os.path.abspath(m) for m in matches if os.path.isfile(m))
+    return sorted(files)
+
 
 def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -212,3 +248,231 @@ def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def upload_assets(
+        paths: List[str],
+        asset_folder_id: Optional[int] = None,
+        concurrency: int = 4,
+        manifest_path: Optional[str] = None,
+        deduplicate: bool = True,
+        similarity_threshold: Optional[int] = None,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Uploads local files (paths or glob patterns) as assets in one call:
+        signed upload request, streaming S3 upload from disk, finish_upload.
+        Files are processed with bounded concurrency and each step is journaled to
+        manifest_path, so re-running the same call resumes after an interruption
+        and skips files that already finished.
+        With deduplicate, files whose SHA-256 is already in the asset fingerprint index
+        (see index_assets) return the existing asset instead of uploading again;
+        similarity_threshold (0-64 bits, needs Pillow) also matches near-identical images.
+        """
+        files = expand_upload_paths(paths)
+        if not files:
+            return {"isError": True, "content": [{"type": "text", "text": "No files matched the given paths."}]}
+
+        if not manifest_path:
+            digest = hashlib.sha1("\n".join(files).encode("utf-8")).hexdigest()[:16]
+            manifest_path = os.path.join(cfg.cache_dir, "uploads", f"{digest}.jsonl")
+        journal = JSONLJournal(manifest_path)
+        index = get_asset_index()
+        counts = {"uploaded": 0, "skipped": 0, "duplicates": 0, "failed": 0}
+
+        async def find_existing(sha256: str, phash: Optional[str]) -> Optional[int]:
+            """Return an indexed asset with the same content, dropping stale index entries."""
+            candidates = [index.find_by_sha256(sha256)]
+            if phash and similarity_threshold is not None:
+                candidates.append(index.find_similar(phash, similarity_threshold))
+            for asset_id in filter(None, candidates):
+                url = build_management_url(f"/assets/{asset_id}")
+                resp = await client.get(url, headers=get_management_headers())
+                if resp.status_code == 404 or (not resp.is_error and resp.json().get("deleted_at")):
+                    index.remove(asset_id)
+                    continue
+                _handle_response(resp, url)
+                return int(asset_id)
+            return None
+        results: List[Dict[str, Any]] = []
+
+        async def upload_one(path: str) -> None:
+            stat = os.stat(path)
+            filename = os.path.basename(path)
+            previous = journal.get(path) or {}
+            same_file = previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns
+            if same_file and previous.get("state") == "done":
+                counts["skipped"] += 1
+                results.append({"path": path, "status": "skipped", "asset_id": previous.get("asset_id")})
+                return
+
+            status = "error"
+            try:
+                asset_id = previous.get("asset_id") if same_file else None
+                sha256 = phash = None
+                if deduplicate and not (same_file and previous.get("state") == "uploaded"):
+                    sha256 = await asyncio.to_thread(sha256_file, path)
+                    if similarity_threshold is not None:
+                        phash = await asyncio.to_thread(perceptual_hash, path)
+                    existing = await find_existing(sha256, phash)
+                    if existing:
+                        journal.record(path, state="done", asset_id=existing, duplicate=True,
+                                       size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                        status = "duplicate"
+                        counts["duplicates"] += 1
+                        results.append({"path": path, "status": status, "asset_id": existing})
+                        return
+
+                if not (same_file and previous.get("state") == "uploaded"):
+                    payload: Dict[str, Any] = {
+                        "filename": filename,
+                        "size": stat.st_size,
+                        "content_type": mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    }
+                    if asset_folder_id is not None:
+                        payload["asset_folder_id"] = asset_folder_id
+                    if asset_id:
+                        payload["id"] = asset_id  # re-sign the same asset instead of creating a new one
+                    url = build_management_url("/assets")
+                    resp = await client.post(url, json=payload, headers=get_management_headers())
+                    signed = _handle_response(resp, url)
+                    asset_id = signed["id"]
+                    journal.record(path, state="signed", asset_id=asset_id, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+                    # httpx streams file objects in chunks, so the file is never fully buffered
+                    with open(path, "rb") as f:
+                        s3_resp = await client.post(
+                            signed["post_url"],
+                            data=signed.get("fields", {}),
+                            files={"file": (filename, f, payload["content_type"])},
+                        )
+                    if s3_resp.is_error:
+                        raise APIError(s3_resp.status_code, s3_resp.reason_phrase, s3_resp.text,
+                                       {"endpoint": signed["post_url"], "file": path})
+                    journal.record(path, state="uploaded")
+
+                url = build_management_url(f"/assets/{asset_id}/finish_upload")
+                resp = await client.post(url, headers=get_management_headers())
+                _handle_response(resp, url)
+                journal.record(path, state="done")
+                if sha256:
+                    index.add(asset_id, {"sha256": sha256, "phash": phash, "filename": filename, "size": stat.st_size})
+                status = "success"
+                counts["uploaded"] += 1
+                results.append({"path": path, "status": status, "asset_id": asset_id})
+            except (APIError, httpx.HTTPError, OSError, KeyError) as e:
+                counts["failed"] += 1
+                results.append({"path": path, "status": "error", "error": str(e)})
+            finally:
+                if ctx is not None:
+                    await ctx.report_progress(len(results), len(files), f"{filename}: {status}")
+
+        await gather_bounded(upload_one, files, concurrency)
+        index_error = None
+        if deduplicate:
+            try:
+                index.save()
+            except OSError as e:
+                index_error = f"Fingerprint index not saved: {e}"
+
+        failures = [r for r in results if r["status"] == "error"]
+        others = [r for r in results if r["status"] != "error"]
+        return {
+            "total_files": len(files),
+            "uploaded": counts["uploaded"],
+            "skipped_already_uploaded": counts["skipped"],
+            "duplicates_reused": counts["duplicates"],
+            "failed": counts["failed"],
+            "manifest_path": manifest_path,
+            "failures": failures,
+            "assets": others[:MAX_UPLOAD_RESULTS],
+            "assets_truncated": len(others) > MAX_UPLOAD_RESULTS,
+            "index_error": index_error,
+        }
+
+    @mcp.tool()
+    async def index_assets(
+        folder_id: Optional[int] = None,
+        with_perceptual_hash: bool = False,
+        refresh: bool = False,
+        concurrency: int = 4,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Builds or updates the asset fingerprint index used by upload_assets for
+        deduplication. Lists assets (all pages) and streams each not-yet-indexed file
+        to compute its SHA-256 (plus a perceptual hash for images when requested and
+        Pillow is installed). Private assets are skipped.
+        """
+        try:
+            params = {"in_folder": folder_id} if folder_id is not None else {}
+            assets = await fetch_all_pages(client, build_management_url("/assets"), "assets", params)
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        index = get_asset_index()
+        counts = {"indexed": 0, "already_indexed": 0, "skipped": 0, "failed": 0}
+        failures: List[Dict[str, Any]] = []
+
+        def wants_phash(asset: Dict[str, Any]) -> bool:
+            return with_perceptual_hash and str(asset.get("content_type", "")).startswith("image/")
+
+        todo = []
+        for asset in assets:
+            record = index.assets.get(str(asset["id"]))
+            if record and not refresh and (record.get("phash") or not wants_phash(asset)):
+                counts["already_indexed"] += 1
+            else:
+                todo.append(asset)
+
+        async def fingerprint(asset: Dict[str, Any]) -> None:
+            url = asset.get("filename") or ""
+            if url.startswith("//"):
+                url = "https:" + url
+            if not url or asset.get("is_private"):
+                counts["skipped"] += 1
+                return
+            digest = hashlib.sha256()
+            image = bytearray() if wants_phash(asset) else None
+            try:
+                async with client.stream("GET", url, extensions={"stream": True, "hedge": False}) as resp:
+                    if resp.is_error:
+                        raise APIError(resp.status_code, resp.reason_phrase, "download failed", {"endpoint": url})
+                    async for chunk in resp.aiter_bytes():
+                        digest.update(chunk)
+                        if image is not None:
+                            image.extend(chunk)
+                index.add(asset["id"], {
+                    "sha256": digest.hexdigest(),
+                    "phash": await asyncio.to_thread(perceptual_hash, bytes(image)) if image is not None else None,
+                    "filename": os.path.basename(url),
+                    "size": asset.get("content_length"),
+                })
+                counts["indexed"] += 1
+            except (APIError, httpx.HTTPError) as e:
+                counts["failed"] += 1
+                failures.append({"asset_id": asset["id"], "error": str(e)})
+            if ctx is not None:
+                await ctx.report_progress(sum(counts.values()), len(assets))
+
+        await gather_bounded(fingerprint, todo, concurrency)
+
+        pruned = 0
+        if folder_id is None:
+            live = {str(a["id"]) for a in assets}
+            for asset_id in [a for a in index.assets if a not in live]:
+                index.remove(asset_id)
+                pruned += 1
+        index_error = None
+        try:
+            index.save()
+        except OSError as e:
+            index_error = f"Fingerprint index not saved: {e}"
+
+        return {
+            "assets_listed": len(assets),
+            **counts,
+            "pruned_deleted_assets": pruned,
+            "index_size": len(index.assets),
+            "failures": failures,
+            "index_error": index_error,
+        }
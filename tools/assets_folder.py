@@ -1,13 +1,151 @@
 import json
+from collections import deque
 from typing import Optional, Dict, Any, List
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
     APIError,
+    fetch_all_pages,
 )
+from utils.cache import TTLCache
+from utils.concurrency import DEFAULT_CONCURRENCY, chunked, gather_bounded
+
+# IDs per assets bulk_update / bulk_destroy call
+ASSET_BULK_CHUNK_SIZE = 100
+
+# Folder listing used to build the tree; cleared by any folder write
+asset_folder_cache = TTLCache(ttl=300, maxsize=4)
+
+
+class AssetFolderTree:
+    """
+    Parent/child index over the space's asset folders.
+    Attributes:
+        folders (Dict[int, Dict[str, Any]]): Folders by ID.
+        children (Dict[Optional[int], List[int]]): Child folder IDs per parent (None = root).
+    """
+    def __init__(self, folders: List[Dict[str, Any]]):
+        """
+        Initialize AssetFolderTree.
+        Args:
+            folders (List[Dict[str, Any]]): Items of the asset_folders list response.
+        """
+        self.folders = {f["id"]: f for f in folders}
+        self.children: Dict[Optional[int], List[int]] = {}
+        for folder in sorted(folders, key=lambda f: (f.get("name") or "").lower()):
+            parent = folder.get("parent_id") if folder.get("parent_id") in self.folders else None
+            self.children.setdefault(parent, []).append(folder["id"])
+
+    def subtree(self, folder_id: Optional[int]) -> List[int]:
+        """
+        Folder IDs under a folder (inclusive), parents before children.
+        Args:
+            folder_id (Optional[int]): Subtree root (None = every folder).
+        Returns:
+            List[int]: Folder IDs in breadth-first order.
+        """
+        order = [] if folder_id is None else [folder_id]
+        queue = deque(self.children.get(folder_id, []))
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            queue.extend(self.children.get(current, []))
+        return order
+
+    def path(self, folder_id: int) -> str:
+        """Slash-separated folder names from the root down to a folder."""
+        names = []
+        seen = set()
+        while folder_id in self.folders and folder_id not in seen:
+            seen.add(folder_id)
+            names.append(self.folders[folder_id].get("name") or str(folder_id))
+            folder_id = self.folders[folder_id].get("parent_id")
+        return "/".join(reversed(names))
+
+    def nested(self, folder_id: int, counts: Optional[Dict[int, int]] = None) -> Dict[str, Any]:
+        """
+        A folder with its descendants as nested dicts, with asset counts when given.
+        Args:
+            folder_id (int): Subtree root.
+            counts (Optional[Dict[int, int]]): Assets directly in each folder.
+        Returns:
+            Dict[str, Any]: id, name, path, children and, with counts, asset_count/total_asset_count.
+        """
+        folder = self.folders[folder_id]
+        node: Dict[str, Any] = {"id": folder_id, "name": folder.get("name"), "path": self.path(folder_id)}
+        children = [self.nested(child, counts) for child in self.children.get(folder_id, [])]
+        if counts is not None:
+            node["asset_count"] = counts.get(folder_id, 0)
+            node["total_asset_count"] = node["asset_count"] + sum(c["total_asset_count"] for c in children)
+        node["children"] = children
+        return node
+
+
+async def get_asset_folder_tree_model(client: AsyncClient, refresh: bool = False) -> AssetFolderTree:
+    """
+    The asset folder tree, built from a cached folder listing.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        refresh (bool): Reload the folder listing.
+
+    Returns:
+        AssetFolderTree: Folder index.
+    """
+    tree = None if refresh else asset_folder_cache.get("tree")
+    if tree is None:
+        url = build_management_url("/asset_folders/")
+        resp = await client.get(url, headers=get_management_headers())
+        tree = AssetFolderTree(_handle_response(resp, url).get("asset_folders", []))
+        asset_folder_cache.set("tree", tree)
+    return tree
+
+
+async def count_folder_assets(client: AsyncClient, folder_ids: List[int], concurrency: int = DEFAULT_CONCURRENCY) -> Dict[int, int]:
+    """
+    Assets directly in each folder, from the Total header of a one-item page per folder.
+
+    Returns:
+        Dict[int, int]: Asset count per folder ID.
+    """
+    url = build_management_url("/assets")
+
+    async def count(folder_id: int) -> int:
+        resp = await client.get(url, headers=get_management_headers(), params={"in_folder": folder_id, "per_page": 1, "page": 1})
+        data = _handle_response(resp, url)
+        total = resp.headers.get("total")
+        if total is not None and total.isdigit():
+            return int(total)
+        return len(await fetch_all_pages(client, url, "assets", {"in_folder": folder_id})) if data.get("assets") else 0
+
+    totals = await gather_bounded(count, folder_ids, concurrency)
+    return dict(zip(folder_ids, totals))
+
+
+async def list_subtree_assets(
+    client: AsyncClient,
+    tree: AssetFolderTree,
+    folder_id: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Every asset in a folder and its subfolders, listing the folders concurrently.
+
+    Returns:
+        List[Dict[str, Any]]: Assets in folder order.
+    """
+    url = build_management_url("/assets")
+    folder_ids = tree.subtree(folder_id)
+
+    async def list_folder(current: int) -> List[Dict[str, Any]]:
+        return await fetch_all_pages(client, url, "assets", {**(params or {}), "in_folder": current})
+
+    pages = await gather_bounded(list_folder, folder_ids, concurrency)
+    return [asset for page in pages for asset in page]
 
 
 def register_assets_folder(mcp: FastMCP, client: AsyncClient) -> None:
@@ -102,6 +240,7 @@ def register_assets_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload),
             )
+            asset_folder_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -144,6 +283,7 @@ def register_assets_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload)
             )
+            asset_folder_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -162,6 +302,195 @@ def register_assets_folder(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/asset_folders/{folder_id}")
             resp = await client.delete(url, headers=get_management_headers())
+            asset_folder_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def get_asset_folder_tree(
+        folder_id: Optional[int] = None,
+        with_counts: bool = True,
+        refresh: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Any:
+        """
+        Returns the asset folders as a nested tree (the whole space or one folder's subtree).
+        With with_counts, each folder carries asset_count (assets directly in it) and
+        total_asset_count (including subfolders), counted concurrently.
+        """
+        try:
+            tree = await get_asset_folder_tree_model(client, refresh)
+            if folder_id is not None and folder_id not in tree.folders:
+                return {"isError": True, "content": [{"type": "text", "text": f"Asset folder {folder_id} not found."}]}
+            roots = [folder_id] if folder_id is not None else tree.children.get(None, [])
+            counts = await count_folder_assets(client, tree.subtree(folder_id), concurrency) if with_counts else None
+            nodes = [tree.nested(root, counts) for root in roots]
+            result: Dict[str, Any] = {"folders": len(tree.subtree(folder_id)), "tree": nodes}
+            if counts is not None:
+                result["total_assets"] = sum(node["total_asset_count"] for node in nodes)
+            return result
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def list_assets_recursive(
+        folder_id: int,
+        search: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Any:
+        """
+        Lists every asset in a folder and all of its subfolders in one call.
+        Each asset is returned with its id, filename, folder and folder path.
+        """
+        try:
+            tree = await get_asset_folder_tree_model(client)
+            if folder_id not in tree.folders:
+                return {"isError": True, "content": [{"type": "text", "text": f"Asset folder {folder_id} not found."}]}
+            assets = await list_subtree_assets(client, tree, folder_id, concurrency, {"search": search} if search else None)
+            return {
+                "folder_id": folder_id,
+                "folders_scanned": len(tree.subtree(folder_id)),
+                "total": len(assets),
+                "assets": [
+                    {
+                        "id": asset.get("id"),
+                        "filename": asset.get("filename"),
+                        "content_type": asset.get("content_type"),
+                        "content_length": asset.get("content_length"),
+                        "asset_folder_id": asset.get("asset_folder_id"),
+                        "folder_path": tree.path(asset.get("asset_folder_id")),
+                    }
+                    for asset in assets
+                ],
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def move_asset_folder_tree(
+        folder_id: int,
+        target_folder_id: Optional[int] = None,
+        move_assets_only: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Moves a folder subtree under another folder (None = top level), or with
+        move_assets_only, moves every asset in the subtree into target_folder_id and
+        leaves the folders in place. Moves into the subtree itself are rejected.
+        """
+        try:
+            tree = await get_asset_folder_tree_model(client, refresh=True)
+            subtree = tree.subtree(folder_id)
+            if folder_id not in tree.folders or (target_folder_id is not None and target_folder_id not in tree.folders):
+                return {"isError": True, "content": [{"type": "text", "text": "Source or target asset folder not found."}]}
+            if target_folder_id in subtree and not move_assets_only:
+                return {"isError": True, "content": [{"type": "text", "text": "Cannot move a folder into its own subtree."}]}
+
+            if not move_assets_only:
+                url = build_management_url(f"/asset_folders/{folder_id}")
+                resp = await client.put(url, json={"asset_folder": {"parent_id": target_folder_id}}, headers=get_management_headers())
+                _handle_response(resp, url)
+                asset_folder_cache.invalidate()
+                return {"moved_folder": folder_id, "parent_id": target_folder_id, "folders_moved": len(subtree)}
+
+            if target_folder_id is None:
+                return {"isError": True, "content": [{"type": "text", "text": "move_assets_only needs a target_folder_id."}]}
+            assets = await list_subtree_assets(client, tree, folder_id, concurrency)
+            ids = [asset["id"] for asset in assets if asset.get("asset_folder_id") != target_folder_id]
+            chunks = list(chunked(ids, ASSET_BULK_CHUNK_SIZE))
+            failures: List[Dict[str, Any]] = []
+            done = 0
+
+            async def move(chunk: List[int]) -> None:
+                nonlocal done
+                url = build_management_url("/assets/bulk_update")
+                try:
+                    resp = await client.post(url, json={"ids": chunk, "asset_folder_id": target_folder_id}, headers=get_management_headers())
+                    _handle_response(resp, url)
+                except APIError as e:
+                    failures.append({"asset_ids": chunk, "error": str(e)})
+                done += 1
+                if ctx is not None:
+                    await ctx.report_progress(done, len(chunks), f"{done}/{len(chunks)} batches moved")
+
+            await gather_bounded(move, chunks, concurrency)
+            return {
+                "target_folder_id": target_folder_id,
+                "assets_moved": len(ids) - sum(len(f["asset_ids"]) for f in failures),
+                "folders_scanned": len(subtree),
+                "failed": failures,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def delete_asset_folder_tree(
+        folder_id: int,
+        delete_assets: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Deletes a folder and all of its subfolders, deepest folders first.
+        Refuses when the subtree still holds assets, unless delete_assets is set, in
+        which case those assets are deleted first (in concurrent bulk batches).
+        """
+        try:
+            tree = await get_asset_folder_tree_model(client, refresh=True)
+            if folder_id not in tree.folders:
+                return {"isError": True, "content": [{"type": "text", "text": f"Asset folder {folder_id} not found."}]}
+            subtree = tree.subtree(folder_id)
+            assets = await list_subtree_assets(client, tree, folder_id, concurrency)
+            if assets and not delete_assets:
+                return {"isError": True, "content": [{"type": "text", "text": (
+                    f"{len(assets)} assets are still in this folder tree; set delete_assets=True to delete them too."
+                )}]}
+
+            async def destroy(chunk: List[int]) -> None:
+                url = build_management_url("/assets/bulk_destroy")
+                resp = await client.post(url, json={"ids": chunk}, headers=get_management_headers())
+                _handle_response(resp, url)
+
+            # Any failed batch aborts before folders are touched
+            await gather_bounded(destroy, list(chunked([asset["id"] for asset in assets], ASSET_BULK_CHUNK_SIZE)), concurrency)
+
+            # Delete level by level from the bottom; siblings go concurrently
+            depth = {folder_id: 0}
+            for current in subtree[1:]:
+                depth[current] = depth[tree.folders[current]["parent_id"]] + 1
+            levels: Dict[int, List[int]] = {}
+            for current, level in depth.items():
+                levels.setdefault(level, []).append(current)
+
+            deleted: List[int] = []
+            failures: List[Dict[str, Any]] = []
+
+            async def remove(current: int) -> None:
+                url = build_management_url(f"/asset_folders/{current}")
+                try:
+                    resp = await client.delete(url, headers=get_management_headers())
+                    if resp.is_error:
+                        _handle_response(resp, url)
+                    deleted.append(current)
+                except APIError as e:
+                    failures.append({"folder_id": current, "error": str(e)})
+                if ctx is not None:
+                    await ctx.report_progress(len(deleted) + len(failures), len(subtree), f"{len(deleted)} folders deleted")
+
+            for level in sorted(levels, reverse=True):
+                await gather_bounded(remove, levels[level], concurrency)
+                if failures:
+                    break
+            asset_folder_cache.invalidate()
+            return {
+                "folder_id": folder_id,
+                "assets_deleted": len(assets),
+                "folders_deleted": deleted,
+                "failed": failures,
+                "completed": not failures,
+            }
+        except APIError as e:
+            asset_folder_cache.invalidate()
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import re
+from typing import Any, Dict, List, Optional, Set
+from httpx import AsyncClient
+from mcp.server.fastmcp import Context, FastMCP
+from utils.api import call_deadline
+from utils.concurrency import DEFAULT_CONCURRENCY
+
+# Maximum tool invocations accepted by one execute_batch call
+MAX_BATCH_CALLS = 200
+# {"$ref": "<index>.path"}: index of an earlier call, then optional ".key" / ".0" path segments
+REFERENCE = re.compile(r"(\d+)((?:\.[A-Za-z0-9_\-]+)*)")
+
+
+class BatchError(Exception):
+    """Invalid batch: unknown tool, bad reference or dependency cycle."""
+
+
+def parse_reference(value: Any) -> Optional[re.Match]:
+    """
+    Match a {"$ref": "<index>.path"} object. Anything else, including strings with
+    '$' in them, is a literal value.
+    Args:
+        value (Any): Arguments value.
+    Returns:
+        Optional[re.Match]: Match with the call index and path, or None.
+    Raises:
+        BatchError: If a {"$ref": ...} object is malformed.
+    """
+    if not (isinstance(value, dict) and "$ref" in value):
+        return None
+    match = REFERENCE.fullmatch(str(value["$ref"])) if len(value) == 1 else None
+    if match is None:
+        raise BatchError(f"invalid reference {value!r}; expected {{\"$ref\": \"<index>.path\"}}")
+    return match
+
+
+def find_references(value: Any) -> Set[int]:
+    """
+    Indices of earlier calls referenced anywhere in an arguments value.
+    Args:
+        value (Any): Arguments (nested dicts and lists).
+    Returns:
+        Set[int]: Referenced call indices.
+    """
+    match = parse_reference(value)
+    if match:
+        return {int(match.group(1))}
+    if isinstance(value, dict):
+        return set().union(*(find_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(find_references(v) for v in value)) if value else set()
+    return set()
+
+
+def lookup(result: Any, path: str) -> Any:
+    """
+    Follow a dotted path ('.story.id', '.stories.0.uuid') into a call result.
+    Args:
+        result (Any): Result of the referenced call (JSON strings are parsed).
+        path (str): Dotted path, possibly empty.
+    Returns:
+        Any: The referenced value.
+    Raises:
+        BatchError: If the path does not exist.
+    """
+    value = result
+    for key in [k for k in path.split(".") if k]:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            raise BatchError(f"reference path '{path}' not found (missing '{key}')")
+    return value
+
+
+def resolve(value: Any, results: Dict[int, Any]) -> Any:
+    """
+    Replace {"$ref": ...} objects in arguments with values from earlier results.
+    Args:
+        value (Any): Arguments value.
+        results (Dict[int, Any]): Results of completed calls by index.
+    Returns:
+        Any: Arguments with references replaced.
+    """
+    match = parse_reference(value)
+    if match:
+        return lookup(results[int(match.group(1))], match.group(2))
+    if isinstance(value, dict):
+        return {k: resolve(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, results) for v in value]
+    return value
+
+
+def coerce(value: Any, schema: Dict[str, Any]) -> Any:
+    """
+    Fit a referenced value to a parameter's JSON schema where the API's types differ
+    from the tool's: numeric IDs become strings for string parameters (also inside arrays).
+    Args:
+        value (Any): Resolved argument.
+        schema (Dict[str, Any]): Parameter schema from the tool definition.
+    Returns:
+        Any: The value, converted when needed.
+    """
+    variants = [schema] + schema.get("anyOf", [])
+    types = {v.get("type") for v in variants}
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and "string" in types and not types & {"integer", "number"}:
+        return str(value)
+    if isinstance(value, list) and "array" in types:
+        items = next((v["items"] for v in variants if v.get("type") == "array" and "items" in v), {})
+        return [coerce(v, items) for v in value]
+    return value
+
+
+def build_dag(calls: List[Dict[str, Any]]) -> List[Set[int]]:
+    """
+    Dependencies of each call, from references plus explicit depends_on.
+    Args:
+        calls (List[Dict[str, Any]]): Batch entries.
+    Returns:
+        List[Set[int]]: Dependency indices per call.
+    Raises:
+        BatchError: On out-of-range references or a dependency cycle.
+    """
+    deps = []
+    for i, call in enumerate(calls):
+        try:
+            explicit = {int(d) for d in call.get("depends_on", [])}
+        except (TypeError, ValueError):
+            raise BatchError(f"call {i}: depends_on must be a list of call indices")
+        needed = find_references(call.get("arguments", {})) | explicit
+        bad = [d for d in needed if not 0 <= d < len(calls) or d == i]
+        if bad:
+            raise BatchError(f"call {i} references invalid call index {bad[0]}")
+        deps.append(needed)
+
+    indegree = [len(d) for d in deps]
+    dependents: Dict[int, List[int]] = {i: [] for i in range(len(calls))}
+    for i, needed in enumerate(deps):
+        for d in needed:
+            dependents[d].append(i)
+    ready = [i for i, n in enumerate(indegree) if n == 0]
+    seen = 0
+    while ready:
+        node = ready.pop()
+        seen += 1
+        for nxt in dependents[node]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                ready.append(nxt)
+    if seen != len(calls):
+        cyclic = [i for i, n in enumerate(indegree) if n > 0]
+        raise BatchError(f"dependency cycle between calls {cyclic}")
+    return deps
+
+
+def is_error_result(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("isError"))
+
+
+def register_batch(mcp: FastMCP, client: AsyncClient) -> None:
+
+    @mcp.tool()
+    async def execute_batch(
+        calls: List[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        stop_on_error: bool = False,
+        ctx: Context = None,
+    ) -> Any:
+        """
+        Runs several tool calls in one request. Each call is {"tool": name, "arguments": {...}}
+        and may use results of other calls: an argument value {"$ref": "0.story.id"} is
+        replaced by the 'story.id' value of call 0's result. Strings are never interpreted,
+        so text like "$100" is passed as-is. Optional "depends_on": [indices] adds
+        ordering without a reference. Calls run as soon as their dependencies succeed,
+        independent ones concurrently; calls depending on a failed call are skipped.
+
+        - stop_on_error: Skip every call not yet started once any call fails.
+        """
+        try:
+            if len(calls) > MAX_BATCH_CALLS:
+                raise BatchError(f"at most {MAX_BATCH_CALLS} calls per batch")
+            tools = []
+            for i, call in enumerate(calls):
+                if not isinstance(call, dict):
+                    raise BatchError(f"call {i} must be an object with 'tool' and 'arguments'")
+                name = call.get("tool")
+                tool = mcp._tool_manager.get_tool(name) if isinstance(name, str) else None
+                if tool is None or name == "execute_batch":
+                    raise BatchError(f"call {i}: unknown or unsupported tool '{name}'")
+                tools.append(tool)
+            deps = build_dag(calls)
+        except BatchError as e:
+            return {"isError": True, "content": [{"type": "text", "text": f"Invalid batch: {e}"}]}
+
+        results: Dict[int, Any] = {}
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        finished: List[asyncio.Future] = [asyncio.get_running_loop().create_future() for _ in calls]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        failed = False
+        done = 0
+
+        async def run(i: int) -> None:
+            nonlocal failed, done
+            ok = True
+            try:
+                for d in deps[i]:
+                    ok = await finished[d] and ok
+                if not ok:
+                    outcomes[i] = {"status": "skipped", "reason": "a dependency failed or was skipped"}
+                    return
+                async with semaphore:
+                    if stop_on_error and failed:
+                        ok = False
+                        outcomes[i] = {"status": "skipped", "reason": "stopped after an earlier failure"}
+                        return
+                    try:
+                        arguments = resolve(calls[i].get("arguments", {}), results)
+                        properties = tools[i].parameters.get("properties", {})
+                        arguments = {k: coerce(v, properties.get(k, {})) for k, v in arguments.items()}
+                        # Each nested call gets its own retry budget, like a top-level call
+                        with call_deadline():
+                            result = await tools[i].run(arguments, context=ctx)
+                    except Exception as e:
+                        result = {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+                    ok = not is_error_result(result)
+                    results[i] = result
+                    outcomes[i] = {"status": "success" if ok else "error", "result": result}
+                    failed = failed or not ok
+            finally:
+                if not finished[i].done():
+                    finished[i].set_result(ok)
+                done += 1
+                if ctx is not None:
+                    await ctx.report_progress(done, len(calls), f"{done}/{len(calls)} calls finished")
+
+        await asyncio.gather(*(run(i) for i in range(len(calls))))
+        counts: Dict[str, int] = {"success": 0, "error": 0, "skipped": 0}
+        for outcome in outcomes:
+            counts[outcome["status"]] += 1
+        return {
+            "total_calls": len(calls),
+            "succeeded": counts["success"],
+            "failed": counts["error"],
+            "skipped": counts["skipped"],
+            "results": [
+                {"index": i, "tool": calls[i]["tool"], **outcomes[i]} for i in range(len(calls))
+            ],
+        }
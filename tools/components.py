@@ -8,8 +8,11 @@ from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    fetch_all_pages,
     APIError,
 )
+from utils.concurrency import gather_bounded
+from tools.components_folder import component_group_registry
 
 def register_components(mcp: FastMCP, client: AsyncClient) -> None:
     """
@@ -71,6 +74,8 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             resp = await client.get(url, headers=get_management_headers(), params=params)
             data = _handle_response(resp, url)
             components = data.get("components", [])
+            if not (filter_by_name or is_root is not None or in_group is not None):
+                component_group_registry.record_components(components)
             
             # Summaries or remove schema if requested
             if component_summary:
@@ -81,11 +86,8 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             elif not include_schema_details:
                 components = [{k: v for k, v in c.items() if k != "schema"} for c in components]
 
-            # Also fetch component groups (folders)
-            # API returns component_groups at /component_groups endpoint
-            groups_url = build_management_url("/component_groups")
-            grp_resp = await client.get(groups_url, headers=get_management_headers(), params={})
-            groups_data = _handle_response(grp_resp, groups_url).get("component_groups", [])
+            # Component groups (folders) come from the shared registry
+            groups_data = (await component_group_registry.groups(client))["list"]
 
             return {
                 "components_count": len(components),
@@ -174,6 +176,7 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps({"component": payload_comp})
             )
+            component_group_registry.invalidate_members()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -250,6 +253,7 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps({"component": comp_data})
             )
+            component_group_registry.invalidate_members()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -261,6 +265,7 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/components/{id}")
             resp = await client.delete(url, headers=get_management_headers())
+            component_group_registry.invalidate_members()
             _handle_response(resp, url)
             return {"message": f"Component {id} has been successfully deleted."}
         except APIError as e:
@@ -268,33 +273,37 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
 
     @mcp.tool()
     async def get_component_usage(component_name: str) -> Dict[str, Any]:
-        """Finds stories where a component is used in content (draft & published)."""
+        """
+        Finds stories where a component is used in content (draft & published).
+        A version that cannot be loaded is listed under errors and complete is False.
+        """
         MAX_PAGES = 10
         PER_PAGE = 100
         stories_map: Dict[int, Dict[str, Any]] = {}
         limit_reached = False
-
-        async def fetch_page(version: str, page: int):
-            url = (build_management_url("/stories")
-                   + f"?page={page}&per_page={PER_PAGE}&with_content=1&version={version}")
-            resp = await client.get(url, headers=get_management_headers())
-            return _handle_response(resp, url)
-
-        for version in ("published", "draft"):
-            page = 1
-            while page <= MAX_PAGES:
-                try:
-                    data = await fetch_page(version, page)
-                    for st in data.get("stories", []):
-                        stories_map[st["id"]] = st
-                    if len(data.get("stories", [])) < PER_PAGE:
-                        break
-                    page += 1
-                except APIError:
-                    break
-            else:
+        errors: List[Dict[str, str]] = []
+
+        async def fetch_version(version: str) -> None:
+            nonlocal limit_reached
+            try:
+                stories = await fetch_all_pages(
+                    client,
+                    build_management_url("/stories"),
+                    "stories",
+                    params={"with_content": 1, "version": version},
+                    per_page=PER_PAGE,
+                    max_pages=MAX_PAGES,
+                )
+            except APIError as e:
+                errors.append({"version": version, "error": str(e)})
+                return
+            for st in stories:
+                stories_map[st["id"]] = st
+            if len(stories) >= MAX_PAGES * PER_PAGE:
                 limit_reached = True
 
+        await gather_bounded(fetch_version, ("published", "draft"))
+
         used = []
         def search(val: Any) -> bool:
             if isinstance(val, list):
@@ -314,7 +323,10 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             "usage_count": len(used),
             "stories_analyzed_count": len(stories_map),
             "search_limit_reached": limit_reached,
-            "used_in_stories": used
+            "used_in_stories": used,
+            # A version that failed to load was not searched, so usage may be undercounted
+            "complete": not errors,
+            "errors": errors,
         }
     
     @mcp.tool()
@@ -394,6 +406,7 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload)
             )
+            component_group_registry.invalidate_members()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -10,6 +10,102 @@ from utils.api import (
     _handle_response,
     APIError,
 )
+from utils.cache import TTLCache
+
+
+class ComponentGroupRegistry:
+    """
+    Cached component groups (component folders) with ID/UUID lookup and the
+    components belonging to each group. Group writes clear everything; component
+    writes clear only the membership.
+    Attributes:
+        cache (TTLCache): Holds 'groups' and 'members' entries.
+    """
+    def __init__(self, ttl: float = 600.0):
+        """
+        Initialize ComponentGroupRegistry.
+        Args:
+            ttl (float): Seconds before cached data is reloaded (default 600).
+        """
+        self.cache = TTLCache(ttl=ttl, maxsize=8)
+
+    async def groups(self, client: AsyncClient, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Component groups indexed for lookup.
+        Args:
+            client (AsyncClient): HTTP client.
+            refresh (bool): Reload from the API.
+        Returns:
+            Dict[str, Any]: 'list' (API order), 'by_id' and 'by_uuid'.
+        """
+        groups = None if refresh else self.cache.get("groups")
+        if groups is None:
+            url = build_management_url("/component_groups/")
+            resp = await client.get(url, headers=get_management_headers())
+            items = _handle_response(resp, url).get("component_groups", [])
+            groups = {
+                "list": items,
+                "by_id": {g["id"]: g for g in items},
+                "by_uuid": {g.get("uuid"): g for g in items if g.get("uuid")},
+            }
+            self.cache.set("groups", groups)
+        return groups
+
+    async def find(self, client: AsyncClient, id_or_uuid: Any) -> Optional[Dict[str, Any]]:
+        """
+        Look up a group by numeric ID or UUID.
+        Args:
+            client (AsyncClient): HTTP client.
+            id_or_uuid (Any): Group ID or UUID.
+        Returns:
+            Optional[Dict[str, Any]]: The group, or None.
+        """
+        groups = await self.groups(client)
+        if str(id_or_uuid).isdigit():
+            return groups["by_id"].get(int(id_or_uuid))
+        return groups["by_uuid"].get(id_or_uuid)
+
+    def record_components(self, components: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Precompute group membership from a complete (unfiltered) component list.
+        Args:
+            components (List[Dict[str, Any]]): Components with component_group_uuid.
+        Returns:
+            Dict[str, List[str]]: Component names per group UUID.
+        """
+        members: Dict[str, List[str]] = {}
+        for component in components:
+            if component.get("component_group_uuid"):
+                members.setdefault(component["component_group_uuid"], []).append(component.get("name"))
+        self.cache.set("members", members)
+        return members
+
+    async def members(self, client: AsyncClient) -> Dict[str, List[str]]:
+        """
+        Component names per group UUID, loading the component list if not known yet.
+        Args:
+            client (AsyncClient): HTTP client.
+        Returns:
+            Dict[str, List[str]]: Component names per group UUID.
+        """
+        members = self.cache.get("members")
+        if members is None:
+            url = build_management_url("/components")
+            resp = await client.get(url, headers=get_management_headers())
+            members = self.record_components(_handle_response(resp, url).get("components", []))
+        return members
+
+    def invalidate_members(self) -> None:
+        """Forget group membership after a component write."""
+        self.cache.invalidate("members")
+
+    def invalidate(self) -> None:
+        """Forget everything after a component group write."""
+        self.cache.invalidate()
+
+
+component_group_registry = ComponentGroupRegistry()
+
 
 def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
     @mcp.tool()
@@ -34,6 +130,7 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload),
             )
+            component_group_registry.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -65,6 +162,7 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload)
             )
+            component_group_registry.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -86,6 +184,7 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 url,
                 headers=get_management_headers(),
             )
+            component_group_registry.invalidate()
             _handle_response(resp, url)  # Expecting 200 OK or 204 No Content
 
             return {"message": f"Component folder {folder_id} deleted successfully."}
@@ -95,29 +194,25 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
     @mcp.tool()
     async def fetch_component_folders(
         search: Optional[str] = None,
-        with_parent: Optional[int] = None
+        with_parent: Optional[int] = None,
+        with_components: bool = False,
+        refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Retrieves all component folders (non-paginated), with optional filtering.
+        Served from the component group registry; with_components adds the names of
+        the components in each folder.
         """
         try:
-            
-            url = build_management_url("/component_groups/")
-            
-            # Query params supported: search, with_parent
-            params: Dict[str, Any] = {}
+            groups = (await component_group_registry.groups(client, refresh))["list"]
             if search:
-                params["search"] = search
+                needle = search.lower()
+                groups = [g for g in groups if needle in (g.get("name") or "").lower()]
             if with_parent is not None:
-                params["with_parent"] = with_parent
-
-            resp = await client.get(
-                url,
-                headers=get_management_headers(),
-                params=params
-            )
-            data = _handle_response(resp, url)
-            groups = data.get("component_groups", [])
+                groups = [g for g in groups if g.get("parent_id") == with_parent]
+            if with_components:
+                members = await component_group_registry.members(client)
+                groups = [{**g, "components": members.get(g.get("uuid"), [])} for g in groups]
 
             return {
                 "component_folders": groups,
@@ -131,10 +226,13 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
         folder_id: str
     ) -> Dict[str, Any]:
         """
-        Retrieves a single component folder (component group) by its ID.
+        Retrieves a single component folder (component group) by its ID or UUID.
         """
         try:
-            
+            group = await component_group_registry.find(client, folder_id)
+            if group is not None:
+                return {"component_group": group}
+
             url = build_management_url(f"/component_groups/{folder_id}")
 
             # Send the GET request
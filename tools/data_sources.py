@@ -8,6 +8,7 @@ from utils.api import (
     _handle_response,
     APIError,
 )
+from tools.datasource_entries import datasource_cache
 
 def register_datasources(mcp: FastMCP, client: AsyncClient) -> None:
     @mcp.tool()
@@ -95,6 +96,7 @@ def register_datasources(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/datasources/{datasource_id}")
             resp = await client.put(url, json=payload, headers=get_management_headers())
+            datasource_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -107,6 +109,7 @@ def register_datasources(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/datasources/{datasource_id}")
             resp = await client.delete(url, headers=get_management_headers())
+            datasource_cache.invalidate()
             return {"isError": False, "content": [{"type": "text", "text": "DataSource deleted successfully"}]}
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -1,13 +1,181 @@
+import asyncio
+import csv
 import json
-from typing import Optional, Dict, Any, List
-from mcp.server.fastmcp import FastMCP
+import os
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator, Iterable, Iterator, Literal
+import httpx
+from mcp.server.fastmcp import FastMCP, Context
 from httpx import AsyncClient
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    create_pagination_params,
     APIError,
+    cache_version,
+    delivery_get,
+    use_delivery_api,
 )
+from utils.cache import TTLCache
+from utils.concurrency import DEFAULT_CONCURRENCY, chunked, gather_bounded, stream_bounded
+
+# Columns written by export_datasource and read by import_datasource
+EXPORT_FIELDS = ["id", "name", "value", "dimension_value"]
+# Max failures echoed back by import_datasource
+MAX_REPORTED_FAILURES = 100
+
+
+async def iter_datasource_entry_pages(
+    client: AsyncClient,
+    params: Dict[str, Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield every page of datasource entries in order.
+    After the first page the `Total` header is used to fetch the remaining pages
+    concurrently, `concurrency` pages at a time, so memory stays bounded.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        params (Dict[str, Any]): datasource_id or datasource_slug, optional dimension.
+        concurrency (int): Pages fetched in parallel.
+
+    Yields:
+        List[Dict[str, Any]]: One page of entries.
+    """
+    url = build_management_url("/datasource_entries/")
+    per_page = 100
+
+    async def fetch_page(page: int) -> httpx.Response:
+        resp = await client.get(
+            url,
+            params={**params, **create_pagination_params(page, per_page)},
+            headers=get_management_headers(),
+        )
+        _handle_response(resp, url)
+        return resp
+
+    first = await fetch_page(1)
+    entries = first.json().get("datasource_entries", [])
+    yield entries
+
+    total = first.headers.get("total")
+    if total is not None and total.isdigit():
+        last_page = -(-int(total) // per_page)
+        for window in chunked(range(2, last_page + 1), max(1, concurrency)):
+            for resp in await gather_bounded(fetch_page, window, concurrency):
+                yield resp.json().get("datasource_entries", [])
+        return
+
+    page = 1
+    while len(entries) >= per_page:
+        page += 1
+        entries = (await fetch_page(page)).json().get("datasource_entries", [])
+        yield entries
+
+
+def _ndjson_rows(lines: Iterable[str], invalid_lines: List[int]) -> Iterator[Any]:
+    """Parse NDJSON lines, recording the numbers of lines that are not JSON objects."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        if isinstance(row, dict):
+            yield row
+        else:
+            invalid_lines.append(number)
+
+
+def read_datasource_rows(
+    file_path: str,
+    fmt: str,
+    invalid_lines: Optional[List[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows from a CSV (header row required) or NDJSON file.
+
+    Args:
+        file_path (str): File to read.
+        fmt (str): 'csv' or 'ndjson'.
+        invalid_lines (Optional[List[int]]): Receives the line numbers of malformed
+            NDJSON lines, which are skipped.
+
+    Yields:
+        Dict[str, Any]: One row per entry; rows without a name are skipped.
+    """
+    invalid = [] if invalid_lines is None else invalid_lines
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(f) if fmt == "csv" else _ndjson_rows(f, invalid)
+        for row in rows:
+            if row.get("name"):
+                yield row
+
+
+class DatasourceCache:
+    """
+    In-memory key -> value tables per (datasource slug, dimension), loaded once with
+    all pages and refreshed on expiry or when entries are written through this server.
+    Dimension tables fall back to the default value when an entry has no
+    dimension_value, matching the Delivery API.
+    Attributes:
+        tables (TTLCache): (slug, dimension) -> (loaded_at, {name: value}).
+    """
+    def __init__(self, ttl: float = 600.0):
+        """
+        Initialize DatasourceCache.
+        Args:
+            ttl (float): Seconds before a table is reloaded (default 600).
+        """
+        self.tables = TTLCache(ttl=ttl, maxsize=256)
+        self._loading: Dict[tuple, asyncio.Task] = {}
+
+    async def get_table(
+        self,
+        client: AsyncClient,
+        slug: str,
+        dimension: Optional[str] = None,
+        refresh: bool = False,
+    ) -> tuple:
+        """
+        Return (loaded_at, table, from_cache) for a datasource, loading it if needed.
+        Concurrent callers for the same table share one load.
+        """
+        key = (slug, dimension or "")
+        cached = None if refresh else self.tables.get(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(client, slug, dimension))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        loaded_at, table = await task
+        self.tables.set(key, (loaded_at, table))
+        return loaded_at, table, False
+
+    async def _load(self, client: AsyncClient, slug: str, dimension: Optional[str]) -> tuple:
+        params: Dict[str, Any] = {"datasource_slug": slug}
+        if dimension:
+            params["dimension"] = dimension
+        table: Dict[str, str] = {}
+        async for entries in iter_datasource_entry_pages(client, params):
+            for entry in entries:
+                table[entry["name"]] = entry.get("dimension_value") or entry.get("value")
+        return time.time(), table
+
+    def invalidate(self) -> None:
+        """Drop every cached table (entry writes do not carry the datasource slug) and the Delivery API cv."""
+        self.tables.invalidate()
+        cache_version.reset()
+
+
+datasource_cache = DatasourceCache()
+
 
 def register_datasource_entries(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -15,16 +183,27 @@ def register_datasource_entries(mcp: FastMCP, client: AsyncClient) -> None:
     async def retrieve_multiple_datasource_entries(
         datasource_id: Optional[int] = None,
         datasource_slug: Optional[str] = None,
-        dimension: Optional[str] = None
+        dimension: Optional[str] = None,
+        page: Optional[int] = 1,
+        per_page: Optional[int] = 25,
+        version: Optional[str] = None
     ) -> Any:
         """
         Retrieves multiple datasource entries from a specified Storyblok space.
+        version='published' (requires datasource_slug) reads from the CDN-backed Delivery API.
         """
         try:
             if not (datasource_id or datasource_slug):
                 raise ValueError("At least one of 'datasource_id' or 'datasource_slug' must be provided.")
 
-            params = {}
+            if use_delivery_api(version):
+                if not datasource_slug:
+                    raise ValueError("Published reads need 'datasource_slug'.")
+                return await delivery_get(client, "/datasource_entries", {
+                    "datasource": datasource_slug, "dimension": dimension, **create_pagination_params(page, per_page)
+                })
+
+            params = create_pagination_params(page, per_page)
             if datasource_id:
                 params["datasource_id"] = datasource_id
             if datasource_slug:
@@ -78,6 +257,7 @@ def register_datasource_entries(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/datasource_entries")
             resp = await client.post(url, json=payload, headers=get_management_headers())
+            datasource_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -123,6 +303,7 @@ def register_datasource_entries(mcp: FastMCP, client: AsyncClient) -> None:
                 json=payload,
                 headers=get_management_headers()
             )
+            datasource_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -139,7 +320,216 @@ def register_datasource_entries(mcp: FastMCP, client: AsyncClient) -> None:
                 f"/datasource_entries/{datasource_entry_id}"
             )
             resp = await client.delete(url, headers=get_management_headers())
+            datasource_cache.invalidate()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def export_datasource(
+        file_path: str,
+        datasource_id: Optional[int] = None,
+        datasource_slug: Optional[str] = None,
+        dimension: Optional[str] = None,
+        format: Literal["csv", "ndjson"] = "ndjson",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Exports all entries of a datasource (optionally with a dimension's values) to a
+        CSV or NDJSON file. Pages are fetched concurrently and written as they arrive,
+        so memory use does not grow with the datasource size.
+        """
+        try:
+            if not (datasource_id or datasource_slug):
+                raise ValueError("At least one of 'datasource_id' or 'datasource_slug' must be provided.")
+            params: Dict[str, Any] = {}
+            if datasource_id:
+                params["datasource_id"] = datasource_id
+            if datasource_slug:
+                params["datasource_slug"] = datasource_slug
+            if dimension:
+                params["dimension"] = dimension
+
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            written = 0
+            with open(file_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore") if format == "csv" else None
+                if writer:
+                    writer.writeheader()
+                async for entries in iter_datasource_entry_pages(client, params, concurrency):
+                    for entry in entries:
+                        row = {k: entry.get(k) for k in EXPORT_FIELDS}
+                        if writer:
+                            writer.writerow(row)
+                        else:
+                            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    written += len(entries)
+                    if ctx is not None:
+                        await ctx.report_progress(written, None, f"{written} entries exported")
+
+            return {"file_path": file_path, "format": format, "entries_exported": written}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        except (ValueError, OSError) as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def import_datasource(
+        datasource_id: int,
+        file_path: str,
+        format: Optional[Literal["csv", "ndjson"]] = None,
+        dimension: Optional[str] = None,
+        dimension_id: Optional[int] = None,
+        delete_missing: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Imports datasource entries from a CSV or NDJSON file (columns: name, value and
+        optionally dimension_value). Rows are streamed and diffed by name against the
+        existing entries: only new or changed entries are written, in parallel.
+        dimension (slug) and dimension_id are required to import dimension_value.
+        delete_missing removes entries that are not in the file. Malformed NDJSON lines
+        are skipped and reported; deletion is then skipped too.
+        """
+        try:
+            fmt = format or ("csv" if file_path.lower().endswith(".csv") else "ndjson")
+            if not os.path.isfile(file_path):
+                raise ValueError(f"File not found: {file_path}")
+            if bool(dimension) != bool(dimension_id):
+                raise ValueError("dimension and dimension_id must be provided together.")
+
+            params: Dict[str, Any] = {"datasource_id": datasource_id}
+            if dimension:
+                params["dimension"] = dimension
+            existing: Dict[str, Dict[str, Any]] = {}
+            async for entries in iter_datasource_entry_pages(client, params, concurrency):
+                for entry in entries:
+                    existing[entry["name"]] = {
+                        "id": entry["id"],
+                        "value": "" if entry.get("value") is None else str(entry["value"]),
+                        "dimension_value": entry.get("dimension_value") or None,
+                    }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        except ValueError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "failed": 0}
+        failures: List[Dict[str, Any]] = []
+        seen = set()
+        invalid_lines: List[int] = []
+
+        def fail(name: str, error: Exception) -> None:
+            counts["failed"] += 1
+            if len(failures) < MAX_REPORTED_FAILURES:
+                failures.append({"name": name, "error": str(error)})
+
+        async def write(method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+            url = build_management_url(path)
+            resp = await client.request(method, url, json=payload, headers=get_management_headers())
+            return _handle_response(resp, url) if resp.is_error or resp.content else None
+
+        async def apply_row(row: Dict[str, Any]) -> None:
+            name = str(row["name"])
+            value = "" if row.get("value") is None else str(row["value"])
+            # CSV exports write a missing dimension value as "", so empty means "not set"
+            dim_value = (row.get("dimension_value") or None) if dimension else None
+            current = existing.get(name)
+            try:
+                if current is None:
+                    created = await write("POST", "/datasource_entries", {
+                        "datasource_entry": {"datasource_id": datasource_id, "name": name, "value": value}
+                    })
+                    if dim_value:
+                        entry_id = (created or {}).get("datasource_entry", {}).get("id")
+                        if entry_id is None:
+                            fail(name, ValueError("created entry has no id; dimension value not set"))
+                            return
+                        await write("PUT", f"/datasource_entries/{entry_id}", {
+                            "datasource_entry": {"dimension_value": dim_value}, "dimension_id": dimension_id
+                        })
+                    counts["created"] += 1
+                    return
+
+                entry_update: Dict[str, Any] = {}
+                if current["value"] != value:
+                    entry_update["value"] = value
+                if dim_value is not None and current["dimension_value"] != dim_value:
+                    entry_update["dimension_value"] = dim_value
+                if not entry_update:
+                    counts["unchanged"] += 1
+                    return
+                payload: Dict[str, Any] = {"datasource_entry": entry_update}
+                if "dimension_value" in entry_update:
+                    payload["dimension_id"] = dimension_id
+                await write("PUT", f"/datasource_entries/{current['id']}", payload)
+                counts["updated"] += 1
+            except (APIError, httpx.HTTPError) as e:
+                fail(name, e)
+            finally:
+                if ctx is not None:
+                    await ctx.report_progress(sum(counts.values()), None)
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            for row in read_datasource_rows(file_path, fmt, invalid_lines):
+                if row["name"] in seen:
+                    continue  # first occurrence of a name wins
+                seen.add(row["name"])
+                yield row
+
+        try:
+            await stream_bounded(apply_row, rows(), concurrency)
+        except (OSError, ValueError) as e:
+            return {"isError": True, "content": [{"type": "text", "text": f"Failed reading {file_path}: {e}"}]}
+
+        # A malformed line may hold an entry that exists, so nothing is deleted in that case
+        deletes_skipped = delete_missing and bool(invalid_lines)
+        if delete_missing and not deletes_skipped:
+            async def delete(name: str) -> None:
+                try:
+                    await write("DELETE", f"/datasource_entries/{existing[name]['id']}")
+                    counts["deleted"] += 1
+                except (APIError, httpx.HTTPError) as e:
+                    fail(name, e)
+
+            await stream_bounded(delete, [n for n in existing if n not in seen], concurrency)
+
+        datasource_cache.invalidate()
+        return {
+            "datasource_id": datasource_id,
+            "rows_processed": len(seen),
+            **counts,
+            "invalid_lines": len(invalid_lines),
+            "invalid_line_numbers": invalid_lines[:MAX_REPORTED_FAILURES],
+            "delete_missing_skipped": deletes_skipped,
+            "failures": failures,
+        }
+
+    @mcp.tool()
+    async def lookup_datasource_values(
+        datasource_slug: str,
+        keys: List[str],
+        dimension: Optional[str] = None,
+        refresh: bool = False
+    ) -> Any:
+        """
+        Resolves many datasource keys (entry names) to values in one call.
+        The whole datasource is loaded once per slug and dimension, kept in memory,
+        and reused until it expires or entries are changed through this server.
+        """
+        try:
+            loaded_at, table, from_cache = await datasource_cache.get_table(client, datasource_slug, dimension, refresh)
+            values = {key: table[key] for key in keys if key in table}
+            return {
+                "datasource_slug": datasource_slug,
+                "dimension": dimension,
+                "values": values,
+                "missing": [key for key in keys if key not in table],
+                "from_cache": from_cache,
+                "cache_age_seconds": round(time.time() - loaded_at, 1),
+                "entries_in_datasource": len(table),
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
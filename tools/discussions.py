@@ -1,7 +1,49 @@
+import asyncio
+import heapq
+import json
+import os
 from typing import Any, Dict, List, Optional
+import httpx
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
-from utils.api import build_management_url, get_management_headers, _handle_response, APIError
+from mcp.server.fastmcp import Context, FastMCP
+from utils.api import build_management_url, get_management_headers, _handle_response, APIError, fetch_all_pages
+from utils.concurrency import DEFAULT_CONCURRENCY, gather_bounded, stream_bounded
+from utils.dates import parse_timestamp
+
+# Entries kept in each "top N" list of the collect_discussions report
+REPORT_TOP_N = 10
+MAX_REPORTED_FAILURES = 100
+
+
+def compact_discussion(discussion: Dict[str, Any], story: Dict[str, Any], comments: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Reduce a discussion and its comments to the fields a review report needs."""
+    record = {
+        "id": discussion.get("id"),
+        "uuid": discussion.get("uuid"),
+        "title": discussion.get("title"),
+        "story_id": story.get("id"),
+        "story_name": story.get("name"),
+        "full_slug": story.get("full_slug"),
+        "component": discussion.get("component"),
+        "fieldname": discussion.get("fieldname"),
+        "lang": discussion.get("lang"),
+        "created_at": discussion.get("created_at"),
+        "solved_at": discussion.get("solved_at"),
+        "status": "solved" if discussion.get("solved_at") else "unsolved",
+    }
+    if comments is not None:
+        record["comments_count"] = len(comments)
+        record["comments"] = [
+            {
+                "id": c.get("id"),
+                "author": (c.get("author") or {}).get("friendly_name") or c.get("author_id"),
+                "created_at": c.get("created_at"),
+                "message": c.get("message"),
+            }
+            for c in comments
+        ]
+    return record
+
 
 def register_discussions(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -263,4 +305,142 @@ def register_discussions(mcp: FastMCP, client: AsyncClient) -> None:
 
         except APIError as e:
             return {"isError": True,
-                    "content": [{"type": "text", "text": str(e)}]}
\ No newline at end of file
+                    "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def collect_discussions(
+        story_ids: Optional[List[int]] = None,
+        starts_with: Optional[str] = None,
+        by_status: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        include_comments: bool = True,
+        output_path: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Collects discussions (and their comments) across many stories in one call and
+        returns an aggregated report.
+
+        - story_ids: Stories to scan; otherwise all stories (optionally under starts_with).
+        - by_status: 'unsolved' or 'solved'.
+        - created_after / created_before: ISO 8601 bounds on the discussion creation date.
+        - include_comments: Also fetch comments for each matching discussion.
+        - output_path: Stream every matching discussion as NDJSON to this file.
+        - concurrency: Maximum API requests in flight across the whole crawl.
+        """
+        try:
+            after, before = parse_timestamp(created_after), parse_timestamp(created_before)
+            if (created_after and after is None) or (created_before and before is None):
+                return {"isError": True, "content": [{"type": "text", "text": "created_after/created_before must be ISO 8601 timestamps."}]}
+
+            if story_ids:
+                stories = [{"id": story_id} for story_id in story_ids]
+            else:
+                params: Dict[str, Any] = {"story_only": 1}
+                if starts_with:
+                    params["starts_with"] = starts_with
+                stories = await fetch_all_pages(client, build_management_url("/stories"), "stories", params)
+
+            # One limiter shared by every level of the crawl keeps total requests bounded;
+            # every page below is a single request through get_json, so nothing fans out past it
+            limiter = asyncio.Semaphore(max(1, concurrency))
+
+            async def get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+                url = build_management_url(path)
+                async with limiter:
+                    resp = await client.get(url, headers=get_management_headers(), params=params)
+                return _handle_response(resp, url)
+
+            async def all_pages(path: str, key: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+                items: List[Dict[str, Any]] = []
+                page = 1
+                while True:
+                    batch = (await get_json(path, {**(params or {}), "page": page, "per_page": 100})).get(key, [])
+                    items.extend(batch)
+                    if len(batch) < 100:
+                        return items
+                    page += 1
+
+            counts = {"stories_scanned": 0, "stories_with_discussions": 0, "discussions": 0, "solved": 0, "unsolved": 0, "comments": 0}
+            by_component: Dict[str, int] = {}
+            oldest_unsolved: List[tuple] = []
+            most_commented: List[tuple] = []
+            stories_with_most_unsolved: List[tuple] = []
+            failures: List[Dict[str, Any]] = []
+            out = open(output_path, "w", encoding="utf-8") if output_path else None
+
+            def keep_top(heap: List[tuple], item: tuple) -> None:
+                if len(heap) < REPORT_TOP_N:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+
+            async def process(story: Dict[str, Any]) -> None:
+                try:
+                    discussions = []
+                    query = {"by_status": by_status} if by_status else None
+                    for discussion in await all_pages(f"/stories/{story['id']}/discussions", "discussions", query):
+                        created = parse_timestamp(discussion.get("created_at"))
+                        if (after and (created is None or created < after)) or (before and (created is None or created > before)):
+                            continue
+                        discussions.append(discussion)
+
+                    async def with_comments(discussion: Dict[str, Any]) -> Dict[str, Any]:
+                        comments = None
+                        if include_comments:
+                            comments = await all_pages(f"/discussions/{discussion['id']}/comments", "comments")
+                        return compact_discussion(discussion, story, comments)
+
+                    records = await gather_bounded(with_comments, discussions, len(discussions) or 1)
+                except (APIError, httpx.TransportError) as e:
+                    if len(failures) < MAX_REPORTED_FAILURES:
+                        failures.append({"story_id": story["id"], "error": str(e)})
+                    return
+                finally:
+                    counts["stories_scanned"] += 1
+                    if ctx is not None:
+                        await ctx.report_progress(counts["stories_scanned"], len(stories), f"{counts['discussions']} discussions found")
+
+                unsolved = 0
+                for record in records:
+                    counts["discussions"] += 1
+                    counts[record["status"]] += 1
+                    component = record.get("component") or "unknown"
+                    by_component[component] = by_component.get(component, 0) + 1
+                    summary = {k: record[k] for k in ("id", "title", "story_id", "story_name", "created_at")}
+                    if record["status"] == "unsolved":
+                        unsolved += 1
+                        # keep the largest negated timestamps, i.e. the oldest discussions
+                        created = parse_timestamp(record["created_at"])
+                        keep_top(oldest_unsolved, (-(created.timestamp() if created else 0), record["id"], summary))
+                    if include_comments:
+                        counts["comments"] += record["comments_count"]
+                        keep_top(most_commented, (record["comments_count"], record["id"], {**summary, "comments_count": record["comments_count"]}))
+                    if out is not None:
+                        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                if records:
+                    counts["stories_with_discussions"] += 1
+                if unsolved:
+                    keep_top(stories_with_most_unsolved, (unsolved, story["id"], {"story_id": story["id"], "story_name": story.get("name"), "unsolved": unsolved}))
+
+            try:
+                await stream_bounded(process, stories, max(1, concurrency))
+            finally:
+                if out is not None:
+                    out.close()
+
+            return {
+                **counts,
+                "by_component": dict(sorted(by_component.items(), key=lambda kv: -kv[1])),
+                "oldest_unsolved": [item[2] for item in sorted(oldest_unsolved, reverse=True)],
+                "most_commented": [item[2] for item in sorted(most_commented, reverse=True)] if include_comments else None,
+                "stories_with_most_unsolved": [item[2] for item in sorted(stories_with_most_unsolved, reverse=True)],
+                "output_path": os.path.abspath(output_path) if output_path else None,
+                "failed_stories": failures,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        except OSError as e:
+            return {"isError": True, "content": [{"type": "text", "text": f"Cannot write {output_path}: {e}"}]}
@@ -2,7 +2,7 @@ import json
 from typing import Any, List, Optional
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
-from utils.api import get_management_headers, _handle_response, APIError
+from utils.api import build_account_url, get_management_headers, _handle_response, APIError
 
 def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -18,9 +18,9 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             # Determine the base URL based on the context
             if context == "org":
-                url = "https://mapi.storyblok.com/v1/org_apps/"
+                url = build_account_url("/org_apps/")
             elif context == "partner":
-                url = "https://mapi.storyblok.com/v1/partner_apps/"
+                url = build_account_url("/partner_apps/")
             else:
                 return {"isError": True, "content": [{"type": "text", "text": "Invalid context specified."}]}
 
@@ -42,9 +42,9 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             # Determine the base URL based on the context
             if context == "org":
-                url = f"https://app.storyblok.com/v1/org_apps/{extension_id}"
+                url = build_account_url(f"/org_apps/{extension_id}")
             elif context == "partner":
-                url = f"https://mapi.storyblok.com/v1/partner_apps/{extension_id}"
+                url = build_account_url(f"/partner_apps/{extension_id}")
             else:
                 return {"isError": True, "content": [{"type": "text", "text": "Invalid context specified."}]}
 
@@ -81,9 +81,9 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             # Determine the base URL based on the context
             if context == "org":
-                url = "https://mapi.storyblok.com/v1/org_apps"
+                url = build_account_url("/org_apps")
             elif context == "partner":
-                url = "https://mapi.storyblok.com/v1/partner_apps"
+                url = build_account_url("/partner_apps")
             else:
                 return {"isError": True, "content": [{"type": "text", "text": "Invalid context specified. Mention either 'org' or 'partner'."}]}
 
@@ -149,9 +149,9 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             # Determine the base URL based on the context
             if context == "org":
-                url = f"https://mapi.storyblok.com/v1/org_apps/{extension_id}"
+                url = build_account_url(f"/org_apps/{extension_id}")
             elif context == "partner":
-                url = f"https://mapi.storyblok.com/v1/partner_apps/{extension_id}"
+                url = build_account_url(f"/partner_apps/{extension_id}")
             else:
                 return {"isError": True, "content": [{"type": "text", "text": "Invalid context specified. Mention either 'org' or 'partner'"}]}
 
@@ -208,9 +208,9 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             # Determine the base URL based on the context
             if context == "org":
-                url = f"https://mapi.storyblok.com/v1/org_apps/{extension_id}"
+                url = build_account_url(f"/org_apps/{extension_id}")
             elif context == "partner":
-                url = f"https://mapi.storyblok.com/v1/partner_apps/{extension_id}"
+                url = build_account_url(f"/partner_apps/{extension_id}")
             else:
                 return {"isError": True, "content": [{"type": "text", "text": "Invalid context specified. Mention either 'org' or 'partner'"}]}
 
@@ -229,7 +229,7 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         Retrieve settings for a specific extension in a space.
         """
         try:
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}/app_provisions/{extension_id}"
+            url = build_account_url(f"/spaces/{space_id}/app_provisions/{extension_id}")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -241,7 +241,7 @@ def register_extensions(mcp: FastMCP, client: AsyncClient) -> None:
         Retrieve settings for all extensions installed in a space.
         """
         try:
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}/app_provisions/"
+            url = build_account_url(f"/spaces/{space_id}/app_provisions/")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
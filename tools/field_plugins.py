@@ -1,7 +1,7 @@
 from typing import Any, Dict, Optional
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
-from utils.api import get_management_headers, _handle_response, APIError
+from utils.api import build_account_url, get_management_headers, _handle_response, APIError
 
 def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -25,9 +25,9 @@ def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
         """
         try:
             url_map = {
-                "space": "https://mapi.storyblok.com/v1/field_types/",
-                "org":   "https://mapi.storyblok.com/v1/org_field_types/",
-                "partner": "https://mapi.storyblok.com/v1/partner_field_types/"
+                "space": build_account_url("/field_types/"),
+                "org":   build_account_url("/org_field_types/"),
+                "partner": build_account_url("/partner_field_types/")
             }
             if context not in url_map:
                 return {"isError": True, "content": [{"type": "text", "text": f"Context must be one of {list(url_map.keys())}"}]}
@@ -61,9 +61,9 @@ def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
             context (str): 'space', 'org', or 'partner'.
         """
         url_map = {
-            "space": f"https://mapi.storyblok.com/v1/field_types/{field_type_id}",
-            "org": f"https://mapi.storyblok.com/v1/org_field_types/{field_type_id}",
-            "partner": f"https://mapi.storyblok.com/v1/partner_field_types/{field_type_id}",
+            "space": build_account_url(f"/field_types/{field_type_id}"),
+            "org": build_account_url(f"/org_field_types/{field_type_id}"),
+            "partner": build_account_url(f"/partner_field_types/{field_type_id}"),
         }
 
         if context not in url_map:
@@ -95,9 +95,9 @@ def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
         """
         try:
             url_map = {
-                "space": "https://mapi.storyblok.com/v1/field_types/",
-                "org": "https://mapi.storyblok.com/v1/org_field_types/",
-                "partner": "https://mapi.storyblok.com/v1/partner_field_types/"
+                "space": build_account_url("/field_types/"),
+                "org": build_account_url("/org_field_types/"),
+                "partner": build_account_url("/partner_field_types/")
             }
 
             if context not in url_map:
@@ -139,9 +139,9 @@ def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
           context: 'space', 'org', or 'partner'.
         """
         url_map = {
-            "space": f"https://mapi.storyblok.com/v1/field_types/{field_type_id}",
-            "org": f"https://mapi.storyblok.com/v1/org_field_types/{field_type_id}",
-            "partner": f"https://mapi.storyblok.com/v1/partner_field_types/{field_type_id}"
+            "space": build_account_url(f"/field_types/{field_type_id}"),
+            "org": build_account_url(f"/org_field_types/{field_type_id}"),
+            "partner": build_account_url(f"/partner_field_types/{field_type_id}")
         }
         if context not in url_map:
             return {"isError": True, "content":[{"type":"text","text":"Invalid context: use 'space', 'org' or 'partner'."}]}
@@ -176,7 +176,7 @@ def register_field_plugin_retrieval(mcp: FastMCP, client: AsyncClient) -> None:
         Args:
             field_type_id (int): Numeric ID of the field plugin to delete.
         """
-        url = f"https://mapi.storyblok.com/v1/field_types/{field_type_id}"
+        url = build_account_url(f"/field_types/{field_type_id}")
         try:
             resp = await client.delete(url, headers=get_management_headers())
             if resp.status_code == 204:
@@ -0,0 +1,54 @@
+from typing import Any
+from httpx import AsyncClient
+from mcp.server.fastmcp import FastMCP
+from utils.jobs import JOB_RESULTS_PAGE_SIZE, MAX_JOB_RESULTS_PAGE_SIZE, job_manager
+
+
+def job_not_found(job_id: str) -> Any:
+    return {"isError": True, "content": [{"type": "text", "text": f"Job '{job_id}' not found."}]}
+
+
+def register_jobs(mcp: FastMCP, client: AsyncClient) -> None:
+
+    @mcp.tool()
+    async def get_job_status(job_id: str) -> Any:
+        """
+        Returns the status of a background job: state, items done/total, success and
+        failure counts, and the final summary once finished. Jobs survive reconnects.
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            return job_not_found(job_id)
+        return job.to_dict()
+
+    @mcp.tool()
+    async def get_job_results(job_id: str, offset: int = 0, limit: int = JOB_RESULTS_PAGE_SIZE) -> Any:
+        """
+        Returns a page of per-item results of a background job, in completion order.
+        Available while the job runs; use next_offset to continue.
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            return job_not_found(job_id)
+        limit = max(1, min(limit, MAX_JOB_RESULTS_PAGE_SIZE))
+        results = job.results(max(0, offset), limit)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "offset": offset,
+            "results": results,
+            "results_available": job.done,
+            "next_offset": offset + len(results) if offset + len(results) < job.done else None,
+        }
+
+    @mcp.tool()
+    async def cancel_job(job_id: str) -> Any:
+        """
+        Cancels a running background job. Items already processed keep their results.
+        """
+        job = job_manager.get(job_id)
+        if job is None:
+            return job_not_found(job_id)
+        if not job_manager.cancel(job_id):
+            return {"isError": True, "content": [{"type": "text", "text": f"Job '{job_id}' is not running (status: {job.status})."}]}
+        return {"job_id": job.id, "status": "cancelling", "done": job.done, "total": job.total}
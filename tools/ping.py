@@ -1,6 +1,8 @@
 from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient, HTTPStatusError
-from config import Config, API_ENDPOINTS
+from config import Config
+from utils.api import api_metrics
+from utils.endpoints import endpoints
 
 cfg = Config()
 
@@ -12,13 +14,13 @@ def register_ping(mcp: FastMCP, client: AsyncClient) -> None:
         Checks server health and Storyblok API connectivity.
         """
         try:
-            url = f"https://mapi.storyblok.com/?token={cfg.management_token}"
+            url = f"{endpoints.host()}/?token={cfg.management_token}"
             resp = await client.get(url)
 
             if 200 <= resp.status_code < 300:
                 return {
                     "content": [
-                        {"type": "text", "text": "Server is running and Storyblok API is reachable."}
+                        {"type": "text", "text": f"Server is running and Storyblok API is reachable (region: {endpoints.region})."}
                     ]
                 }
             else:
@@ -44,3 +46,12 @@ def register_ping(mcp: FastMCP, client: AsyncClient) -> None:
                     }
                 ]
             }
+
+    # Tool: get_api_metrics
+    @mcp.tool()
+    async def get_api_metrics() -> dict:
+        """
+        Returns upstream request counters: requests sent, retries by reason and
+        requests that ran out of retry attempts or deadline.
+        """
+        return {"region": endpoints.region, **api_metrics.snapshot()}
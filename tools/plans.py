@@ -0,0 +1,62 @@
+import time
+from typing import Any, Dict
+from httpx import AsyncClient
+from mcp.server.fastmcp import Context, FastMCP
+from utils.plans import APPLIED, MAX_PLAN_PAGE_SIZE, PENDING, PLAN_PREVIEW_SIZE, PlanError, plan_store
+from tools.stories import put_story_update, run_story_bulk
+from tools.tags import send_tag_lists
+
+# Tools whose plans hold {"story_id", "tag_list"} bulk_association items
+TAG_PLAN_TOOLS = {"tag_bulk_association", "bulk_update_story_tags"}
+
+
+def plan_error(text: str) -> Any:
+    return {"isError": True, "content": [{"type": "text", "text": text}]}
+
+
+def register_plans(mcp: FastMCP, client: AsyncClient) -> None:
+
+    @mcp.tool()
+    async def get_plan(plan_id: str, offset: int = 0, limit: int = PLAN_PREVIEW_SIZE) -> Any:
+        """
+        Returns a dry-run plan (from a bulk tool called with dry_run=True): its summary
+        and a page of per-story changes. Use next_offset to continue.
+        """
+        plan = plan_store.get(plan_id)
+        if plan is None:
+            return plan_error(f"Plan '{plan_id}' not found.")
+        return plan_store.view(plan, max(0, offset), max(1, min(limit, MAX_PLAN_PAGE_SIZE)))
+
+    @mcp.tool()
+    async def apply_plan(plan_id: str, background: bool = False, ctx: Context = None) -> Any:
+        """
+        Applies a dry-run plan by ID, sending exactly the writes computed when it was
+        made (nothing is re-fetched or re-diffed). A plan can be applied once, within
+        an hour of being computed. background=True runs story update plans as a job.
+        """
+        plan = plan_store.get(plan_id)
+        if plan is None:
+            return plan_error(f"Plan '{plan_id}' not found.")
+        if plan["status"] != PENDING:
+            return plan_error(f"Plan '{plan_id}' was already applied.")
+        if plan_store.expired(plan):
+            return plan_error(f"Plan '{plan_id}' has expired; run the bulk tool with dry_run=True again.")
+
+        # Recorded before any write, so a plan can never be applied twice
+        plan["status"], plan["applied_at"] = APPLIED, time.time()
+        try:
+            plan_store.save(plan)
+        except PlanError as e:
+            return plan_error(f"{e}; nothing was applied.")
+        operations = plan["operations"]
+
+        if plan["tool"] in TAG_PLAN_TOOLS:
+            options = plan["options"]
+            result = await send_tag_lists(client, operations, options["chunk_size"], options["concurrency"], ctx)
+            return {"plan_id": plan_id, "stories": len(operations), **result}
+
+        async def update(operation: Dict[str, Any]) -> Dict[str, Any]:
+            return await put_story_update(client, operation["id"], operation["update"], operation["publish"])
+
+        result = await run_story_bulk("apply_plan", operations, update, background, ctx)
+        return {"plan_id": plan_id, **result}
@@ -1,14 +1,49 @@
 import json
-from typing import Optional, Any, List
+from typing import Optional, Any, Dict, List
+import httpx
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
-    APIError
+    APIError,
+    fetch_all_pages
 )
+from utils.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from tools.stories import build_dependency_graph, fetch_stories_by, invalidate_story_caches
+
+
+def _manifest_entry(story: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields recorded for each story in a release manifest."""
+    return {k: story.get(k) for k in ("id", "uuid", "name", "full_slug", "published", "unpublished_changes")}
+
+
+async def select_stories(
+    client: AsyncClient,
+    story_ids: Optional[List[int]] = None,
+    starts_with: Optional[str] = None,
+    with_tag: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Resolve a story selection (IDs, a folder path and/or a tag) to stories with content.
+    Folders themselves are never selected. Results are de-duplicated by ID.
+    """
+    selected: Dict[int, Dict[str, Any]] = {}
+    if story_ids:
+        for story in await fetch_stories_by(client, "by_ids", story_ids, {"with_content": 1}):
+            selected[story["id"]] = story
+    if starts_with or with_tag:
+        params: Dict[str, Any] = {"story_only": 1, "with_content": 1}
+        if starts_with:
+            params["starts_with"] = starts_with
+        if with_tag:
+            params["with_tag"] = with_tag
+        for story in await fetch_all_pages(client, build_management_url("/stories"), "stories", params):
+            selected.setdefault(story["id"], story)
+    return [story for story in selected.values() if not story.get("is_folder")]
+
 
 def register_releases(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -124,3 +159,110 @@ def register_releases(mcp: FastMCP, client: AsyncClient) -> None:
             }
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+
+    @mcp.tool()
+    async def assemble_release(
+        release_id: Optional[int] = None,
+        release_name: Optional[str] = None,
+        story_ids: Optional[List[int]] = None,
+        starts_with: Optional[str] = None,
+        with_tag: Optional[str] = None,
+        include_dependencies: bool = False,
+        max_depth: Optional[int] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        do_release: bool = False,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Adds a selection of stories (IDs, folder path and/or tag) to a release and
+        returns a manifest verified against the release's actual contents.
+        Creates the release when only release_name is given. Linked stories outside
+        the selection that are unpublished are reported, or added too when
+        include_dependencies is set. do_release publishes the release only when every
+        story was attached and no unpublished dependency is left outside it.
+        """
+        try:
+            if release_id is None and not release_name:
+                return {"isError": True, "content": [{"type": "text", "text": "Provide release_id or release_name."}]}
+
+            stories = await select_stories(client, story_ids, starts_with, with_tag)
+            if not stories:
+                return {"isError": True, "content": [{"type": "text", "text": "The selection matched no stories."}]}
+
+            # Linked stories that would go live broken if the release shipped without them
+            nodes, unresolved, limit_reached = await build_dependency_graph(client, stories, max_depth)
+            selected_uuids = {story.get("uuid") for story in stories}
+            unpublished_dependencies = [
+                node for uuid, node in nodes.items()
+                if uuid not in selected_uuids and (not node["published"] or node["unpublished_changes"])
+            ]
+            if include_dependencies and unpublished_dependencies:
+                stories += await fetch_stories_by(
+                    client, "by_ids", [node["id"] for node in unpublished_dependencies]
+                )
+                unpublished_dependencies = []
+
+            # Created only once the selection is known, so a failed selection leaves no empty release
+            if release_id is None:
+                url = build_management_url("/releases")
+                resp = await client.post(url, json={"release": {"name": release_name}}, headers=get_management_headers())
+                release_id = _handle_response(resp, url)["release"]["id"]
+
+            failures: List[Dict[str, Any]] = []
+            done = 0
+
+            async def attach(story: Dict[str, Any]) -> None:
+                nonlocal done
+                url = build_management_url(f"/stories/{story['id']}")
+                # Only the release assignment: writing back fields read earlier would revert concurrent edits
+                payload: Dict[str, Any] = {"story": {"id": story["id"]}, "release_id": release_id}
+                try:
+                    resp = await client.put(url, json=payload, headers=get_management_headers())
+                    _handle_response(resp, url)
+                except (APIError, httpx.TransportError) as e:
+                    failures.append({"story_id": story["id"], "error": str(e)})
+                done += 1
+                if ctx is not None:
+                    await ctx.report_progress(done, len(stories), f"{done}/{len(stories)} stories attached")
+
+            await gather_bounded(attach, stories, concurrency)
+            invalidate_story_caches()
+
+            contents = await fetch_all_pages(
+                client, build_management_url("/stories"), "stories", {"in_release": release_id}
+            )
+            in_release = {story["id"] for story in contents}
+            failed_ids = {failure["story_id"] for failure in failures}
+            missing = [story["id"] for story in stories if story["id"] not in in_release and story["id"] not in failed_ids]
+            verified = not failures and not missing
+
+            released = False
+            if do_release and verified and not unpublished_dependencies:
+                url = build_management_url(f"/releases/{release_id}")
+                resp = await client.put(url, json={"do_release": True}, headers=get_management_headers())
+                if resp.is_error:
+                    _handle_response(resp, url)
+                released = True
+
+            return {
+                "release_id": release_id,
+                "stories_selected": len(stories),
+                "stories_attached": len(stories) - len(failures),
+                "verified": verified,
+                "manifest": sorted((_manifest_entry(story) for story in contents), key=lambda s: s["full_slug"] or ""),
+                "missing_from_release": missing,
+                "failed": failures,
+                "unpublished_dependencies": [
+                    {k: node[k] for k in ("id", "name", "full_slug", "published", "unpublished_changes")}
+                    for node in unpublished_dependencies
+                ],
+                "unresolved_references": len(unresolved),
+                "depth_limit_reached": limit_reached,
+                "released": released,
+                "release_skipped_reason": None if released or not do_release else (
+                    "unpublished dependencies outside the release" if verified else "manifest verification failed"
+                ),
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -1,7 +1,137 @@
-from typing import Any, Optional
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
-from utils.api import build_management_url, get_management_headers, _handle_response, APIError
+from mcp.server.fastmcp import Context, FastMCP
+from utils.api import build_management_url, get_management_headers, _handle_response, APIError, fetch_all_pages
+from utils.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from utils.dates import format_timestamp, parse_timestamp
+
+# Entries returned in a schedule overview timeline
+MAX_TIMELINE = 500
+MAX_REPORTED_FAILURES = 100
+
+
+class ScheduleIndex:
+    """
+    Time-ordered index of story schedules.
+    Keeps one list sorted by publish time for range queries, and per (story, language)
+    sorted lists for conflict checks. Inserts are O(log n) searches via bisect.
+    Attributes:
+        schedules (Dict[int, Dict[str, Any]]): Schedules by ID.
+    """
+    def __init__(self, schedules: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize ScheduleIndex.
+        Args:
+            schedules (Optional[List[Dict[str, Any]]]): story_schedulings list items.
+        """
+        self.schedules: Dict[Any, Dict[str, Any]] = {}
+        self._timeline: List[Tuple[float, Any]] = []
+        self._by_story: Dict[Tuple[Any, str], List[Tuple[float, Any]]] = {}
+        for schedule in schedules or []:
+            self.add(schedule)
+
+    @staticmethod
+    def story_key(story_id: Any, language: Optional[str]) -> Tuple[Any, str]:
+        """Key schedules per story and language ('' = default language)."""
+        return int(story_id), language or ""
+
+    def add(self, schedule: Dict[str, Any]) -> None:
+        """
+        Index a schedule; schedules without a parseable publish_at are ignored.
+        Args:
+            schedule (Dict[str, Any]): Schedule with id, story_id, publish_at and optional language.
+        """
+        publish_at = parse_timestamp(schedule.get("publish_at"))
+        if publish_at is None:
+            return
+        self.remove(schedule["id"])
+        entry = (publish_at.timestamp(), schedule["id"])
+        self.schedules[schedule["id"]] = schedule
+        insort(self._timeline, entry)
+        insort(self._by_story.setdefault(self.story_key(schedule["story_id"], schedule.get("language")), []), entry)
+
+    def remove(self, schedule_id: Any) -> None:
+        """
+        Drop a schedule from the index.
+        Args:
+            schedule_id (Any): Schedule ID.
+        """
+        schedule = self.schedules.pop(schedule_id, None)
+        if schedule is None:
+            return
+        entry = (parse_timestamp(schedule["publish_at"]).timestamp(), schedule_id)
+        self._timeline.pop(bisect_left(self._timeline, entry))
+        entries = self._by_story[self.story_key(schedule["story_id"], schedule.get("language"))]
+        entries.pop(bisect_left(entries, entry))
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Schedules publishing within [start, end], ordered by time.
+        Args:
+            start (Optional[datetime]): Lower bound (None = unbounded).
+            end (Optional[datetime]): Upper bound (None = unbounded).
+        Returns:
+            List[Dict[str, Any]]: Matching schedules.
+        """
+        lo = bisect_left(self._timeline, (start.timestamp(),)) if start else 0
+        hi = bisect_right(self._timeline, (end.timestamp(), float("inf"))) if end else len(self._timeline)
+        return [self.schedules[schedule_id] for _, schedule_id in self._timeline[lo:hi]]
+
+    def for_story(self, story_id: Any, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Schedules of one story and language, ordered by time.
+        Args:
+            story_id (Any): Story ID.
+            language (Optional[str]): Language code (None = default).
+        Returns:
+            List[Dict[str, Any]]: Schedules.
+        """
+        entries = self._by_story.get(self.story_key(story_id, language), [])
+        return [self.schedules[schedule_id] for _, schedule_id in entries]
+
+    def conflicts(self, min_gap_seconds: float = 0, story_keys: Optional[List[Tuple[Any, str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Stories (per language) scheduled more than once. Schedules of the same story
+        closer together than min_gap_seconds are flagged as overlapping.
+        Args:
+            min_gap_seconds (float): Gap below which two publishes count as overlapping.
+            story_keys (Optional[List[Tuple[Any, str]]]): Only check these story keys.
+        Returns:
+            List[Dict[str, Any]]: One entry per conflicting story/language.
+        """
+        result = []
+        for key in story_keys if story_keys is not None else list(self._by_story):
+            entries = self._by_story.get(key, [])
+            if len(entries) < 2:
+                continue
+            gaps = [b[0] - a[0] for a, b in zip(entries, entries[1:])]
+            result.append({
+                "story_id": key[0],
+                "language": key[1] or None,
+                "schedule_ids": [schedule_id for _, schedule_id in entries],
+                "publish_at": [self.schedules[schedule_id]["publish_at"] for _, schedule_id in entries],
+                "overlapping": min(gaps) <= min_gap_seconds,
+                "min_gap_seconds": min(gaps),
+            })
+        return result
+
+
+async def load_schedule_index(client: AsyncClient, by_status: Optional[str] = "scheduled") -> ScheduleIndex:
+    """
+    Load every story schedule (all pages) into a ScheduleIndex.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        by_status (Optional[str]): Status filter; 'scheduled' keeps pending schedules only.
+
+    Returns:
+        ScheduleIndex: Indexed schedules.
+    """
+    params = {"by_status": by_status} if by_status else {}
+    schedules = await fetch_all_pages(client, build_management_url("/story_schedulings/"), "story_schedulings", params)
+    return ScheduleIndex(schedules)
 
 def register_story_schedules(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -117,4 +247,137 @@ def register_story_schedules(mcp: FastMCP, client: AsyncClient) -> None:
             resp = await client.delete(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
-            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
\ No newline at end of file
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def get_schedule_overview(
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        by_status: Optional[str] = "scheduled",
+        min_gap_minutes: int = 0
+    ) -> Any:
+        """
+        Loads all story schedules into a time-ordered index and returns a timeline
+        (optionally limited to [start, end]), publishes per day, schedules already past
+        due, and stories scheduled more than once.
+
+        - start / end: ISO-8601 bounds for the timeline.
+        - by_status: "scheduled" (default), "published_before_schedule" or None for all.
+        - min_gap_minutes: Same-story publishes closer than this are flagged as overlapping.
+        """
+        try:
+            index = await load_schedule_index(client, by_status)
+            window = index.between(parse_timestamp(start), parse_timestamp(end))
+            per_day: Dict[str, int] = {}
+            for schedule in window:
+                day = schedule["publish_at"][:10]
+                per_day[day] = per_day.get(day, 0) + 1
+            now = datetime.now(timezone.utc)
+            return {
+                "total_schedules": len(index.schedules),
+                "in_window": len(window),
+                "timeline": [
+                    {k: schedule.get(k) for k in ("id", "story_id", "language", "publish_at")}
+                    for schedule in window[:MAX_TIMELINE]
+                ],
+                "timeline_truncated": len(window) > MAX_TIMELINE,
+                "per_day": per_day,
+                "past_due": [schedule["id"] for schedule in index.between(None, now)] if by_status == "scheduled" else [],
+                "conflicts": index.conflicts(min_gap_minutes * 60),
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def bulk_schedule_stories(
+        schedules: List[Dict[str, Any]],
+        update_existing: bool = True,
+        min_gap_minutes: int = 0,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Creates or moves many story schedules in one parallel batch.
+        Each item is {"story_id": ..., "publish_at": "<ISO-8601>", "language": optional}.
+        Items are checked locally first: invalid or past times and repeated stories in the
+        batch are rejected. A story that already has a pending schedule gets it moved
+        (update_existing) instead of a second one, or is rejected otherwise. Remaining
+        conflicts for the touched stories are reported after the batch.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            index = await load_schedule_index(client)
+
+            rejected: List[Dict[str, Any]] = []
+            operations: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+            unchanged: List[Any] = []
+            seen = set()
+            for item in schedules:
+                publish_at = parse_timestamp(item.get("publish_at"))
+                if item.get("story_id") is None or publish_at is None:
+                    rejected.append({"item": item, "error": "story_id and a valid ISO-8601 publish_at are required."})
+                    continue
+                if publish_at <= now:
+                    rejected.append({"item": item, "error": "publish_at is in the past."})
+                    continue
+                key = index.story_key(item["story_id"], item.get("language"))
+                if key in seen:
+                    rejected.append({"item": item, "error": "Story is scheduled more than once in this batch."})
+                    continue
+                seen.add(key)
+
+                wanted = {"story_id": key[0], "publish_at": format_timestamp(publish_at)}
+                if item.get("language"):
+                    wanted["language"] = item["language"]
+                existing = index.for_story(*key)
+                if not existing:
+                    operations.append(("create", wanted, None))
+                elif not update_existing:
+                    rejected.append({"item": item, "error": f"Story already scheduled (schedule {existing[0]['id']})."})
+                elif parse_timestamp(existing[0]["publish_at"]) == publish_at:
+                    unchanged.append(existing[0]["id"])
+                else:
+                    operations.append(("update", wanted, existing[0]))
+
+            created: List[Any] = []
+            updated: List[Any] = []
+            failures: List[Dict[str, Any]] = []
+            done = 0
+
+            async def apply(operation: Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]) -> None:
+                nonlocal done
+                kind, wanted, existing = operation
+                try:
+                    if kind == "create":
+                        url = build_management_url("/story_schedulings")
+                        resp = await client.post(url, json={"story_scheduling": wanted}, headers=get_management_headers())
+                        schedule = _handle_response(resp, url).get("story_scheduling") or {}
+                        if schedule.get("id") is not None:
+                            index.add({**wanted, **schedule})
+                        created.append(schedule.get("id"))
+                    else:
+                        url = build_management_url(f"/story_schedulings/{existing['id']}")
+                        resp = await client.put(url, json={"story_scheduling": {"publish_at": wanted["publish_at"]}}, headers=get_management_headers())
+                        _handle_response(resp, url)
+                        index.add({**existing, "publish_at": wanted["publish_at"]})
+                        updated.append(existing["id"])
+                except APIError as e:
+                    if len(failures) < MAX_REPORTED_FAILURES:
+                        failures.append({"story_id": wanted["story_id"], "operation": kind, "error": str(e)})
+                done += 1
+                if ctx is not None:
+                    await ctx.report_progress(done, len(operations), f"{done}/{len(operations)} schedules written")
+
+            await gather_bounded(apply, operations, concurrency)
+            return {
+                "requested": len(schedules),
+                "created": created,
+                "updated": updated,
+                "unchanged": unchanged,
+                "rejected": rejected[:MAX_REPORTED_FAILURES],
+                "rejected_count": len(rejected),
+                "failed": failures,
+                "conflicts": index.conflicts(min_gap_minutes * 60, sorted(seen)),
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
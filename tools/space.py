@@ -4,6 +4,7 @@ from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient
 from utils.api import (
     build_management_url,
+    build_account_url,
     get_management_headers,
     _handle_response,
     APIError,
@@ -17,7 +18,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
         Retrieve all accessible spaces.
         """
         try:
-            url = "https://mapi.storyblok.com/v1/spaces/"
+            url = build_account_url("/spaces/")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -29,7 +30,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
         Fetch a specific space by ID.
         """
         try:
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}"
+            url = build_account_url(f"/spaces/{space_id}")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -57,7 +58,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
             if environments:
                 payload["space"]["environments"] = environments
 
-            url = "https://mapi.storyblok.com/v1/spaces/"
+            url = build_account_url("/spaces/")
             resp = await client.post(url, json=payload, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -119,7 +120,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
             if options:
                 payload["space"]["options"] = options
 
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}"
+            url = build_account_url(f"/spaces/{space_id}")
             resp = await client.put(url, json=payload, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -152,7 +153,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
                 }
             }
 
-            url = "https://mapi.storyblok.com/v1/spaces/"
+            url = build_account_url("/spaces/")
             resp = await client.post(url, json=payload, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -166,7 +167,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
         Triggers a backup task for a Storyblok space using Management API.
         """
         try:
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}/backups"
+            url = build_account_url(f"/spaces/{space_id}/backups")
             resp = await client.post(url, json={}, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
@@ -180,7 +181,7 @@ def register_space(mcp: FastMCP, client: AsyncClient) -> None:
         Permanently deletes a Storyblok space using the Management API.
         """
         try:
-            url = f"https://mapi.storyblok.com/v1/spaces/{space_id}"
+            url = build_account_url(f"/spaces/{space_id}")
             resp = await client.delete(url, headers=get_management_headers())
             if resp.status_code == 204:
                 return {"isError": False, "content": [{"type": "text", "text": f"Space deleted successfully."}]}
@@ -1,16 +1,403 @@
+import asyncio
 import json
-from typing import Any, Optional, Dict, List, Union
-from mcp.server.fastmcp import FastMCP
+from typing import Any, Optional, Dict, List, Set, Tuple, Union
+from mcp.server.fastmcp import Context, FastMCP
 from httpx import AsyncClient
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    fetch_all_pages,
     APIError,
+    cache_version,
+    delivery_get,
+    use_delivery_api,
 )
+from utils.batching import MicroBatcher
+from utils.blok_diff import diff_bloks, summarize_patches
+from utils.cache import TTLCache
+from utils.disk_cache import JSONDiskCache
+from utils.concurrency import chunked, gather_bounded
+from utils.jobs import Job, job_manager, record_cancelled_call, run_bulk
+from utils.plans import PlanError, plan_store, story_field_diff
+from utils.story_graph import extract_references, publish_stages
 from tools.components import get_component_schema_by_name
 
+# Max IDs/UUIDs/slugs sent in one by_* list call (keeps URLs short, fits one page)
+STORY_BATCH_SIZE = 50
+# Upper bound on stories visited when walking dependencies
+MAX_GRAPH_STORIES = 2000
+MAX_REPORTED_FAILURES = 100
+
+# Dependency-graph nodes keyed by story UUID; cleared on any story write
+story_graph_cache = TTLCache(ttl=300, maxsize=MAX_GRAPH_STORIES * 2)
+# Current tag_list per story ID, used by bulk tagging to diff tag sets; cleared on any story write
+story_tag_cache = TTLCache(ttl=300, maxsize=50000)
+# fetch_stories filters the Delivery API understands, mapped to its parameter names
+DELIVERY_STORY_PARAMS = {
+    "starts_with": "starts_with",
+    "by_uuids": "by_uuids",
+    "by_uuids_ordered": "by_uuids_ordered",
+    "by_slugs": "by_slugs",
+    "excluding_slugs": "excluding_slugs",
+    "excluding_ids": "excluding_ids",
+    "with_tag": "with_tag",
+    "sort_by": "sort_by",
+    "text_search": "search_term",
+    "search": "search_term",
+    "filter_query": "filter_query",
+    "story_only": None,
+}
+# Story version content is immutable, so it is kept on disk keyed by version ID
+version_cache = JSONDiskCache("story_versions")
+
+
+async def fetch_stories_by(
+    client: AsyncClient,
+    field: str,
+    values: List[Any],
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch stories matching a list of IDs, UUIDs or slugs using chunked list calls.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        field (str): One of 'by_ids', 'by_uuids', 'by_slugs'.
+        values (List[Any]): Values to look up.
+        params (Optional[Dict[str, Any]]): Extra query parameters (e.g. with_content).
+
+    Returns:
+        List[Dict[str, Any]]: Stories found; unknown values are simply absent.
+    """
+    url = build_management_url("/stories")
+
+    async def fetch_chunk(chunk: List[Any]) -> List[Dict[str, Any]]:
+        query = {**(params or {}), field: ",".join(str(v) for v in chunk), "per_page": 100}
+        resp = await client.get(url, headers=get_management_headers(), params=query)
+        return _handle_response(resp, url).get("stories", [])
+
+    pages = await gather_bounded(fetch_chunk, list(chunked(list(values), STORY_BATCH_SIZE)))
+    return [story for page in pages for story in page]
+
+
+def invalidate_story_caches() -> None:
+    """Drop cached graph nodes, tag lists and the Delivery API cv after a story write."""
+    story_graph_cache.invalidate()
+    story_tag_cache.invalidate()
+    cache_version.reset()
+
+
+def delivery_story_params(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate fetch_stories filters to Delivery API parameters.
+
+    Args:
+        options (Dict[str, Any]): Filters that were set (None values already removed).
+
+    Returns:
+        Dict[str, Any]: Delivery API query parameters; filter_query dicts are
+        flattened to filter_query[field][operation]=value.
+
+    Raises:
+        ValueError: If a filter has no Delivery API equivalent.
+    """
+    unsupported = sorted(k for k in options if k not in DELIVERY_STORY_PARAMS)
+    if unsupported:
+        raise ValueError(f"Not available for published reads: {', '.join(unsupported)}. Use version='draft'.")
+    params: Dict[str, Any] = {}
+    for key, value in options.items():
+        target = DELIVERY_STORY_PARAMS[key]
+        if target is None:
+            continue
+        if key == "filter_query":
+            query = json.loads(value) if isinstance(value, str) else value
+            for field, operations in query.items():
+                for operation, operand in operations.items():
+                    params[f"filter_query[{field}][{operation}]"] = operand
+        else:
+            params[target] = value
+    return params
+
+
+def _version_content(version: Dict[str, Any]) -> Any:
+    """Extract the blok tree from a story_versions entry fetched with show_content."""
+    content = version.get("content")
+    if isinstance(content, dict) and "_uid" not in content and isinstance(content.get("content"), dict):
+        return content["content"]
+    return content
+
+
+def _graph_node(story: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a story to the fields the dependency graph needs."""
+    story_refs, asset_ids = extract_references(story.get("content") or {})
+    story_refs.discard(story.get("uuid"))
+    return {
+        "id": story.get("id"),
+        "uuid": story.get("uuid"),
+        "name": story.get("name"),
+        "full_slug": story.get("full_slug"),
+        "published": bool(story.get("published")),
+        "unpublished_changes": bool(story.get("unpublished_changes")),
+        "story_refs": sorted(story_refs),
+        "asset_ids": sorted(asset_ids),
+    }
+
+
+async def build_dependency_graph(
+    client: AsyncClient,
+    roots: List[Dict[str, Any]],
+    max_depth: Optional[int] = None,
+    refresh: bool = False,
+) -> Tuple[Dict[str, Dict[str, Any]], Set[str], bool]:
+    """
+    Walk story links, references and assets transitively from the given root stories.
+    Each level of unknown UUIDs is resolved with batched by_uuids calls; resolved
+    nodes are cached in story_graph_cache.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        roots (List[Dict[str, Any]]): Root stories including content.
+        max_depth (Optional[int]): Maximum link depth to follow (None = unlimited).
+        refresh (bool): Ignore cached nodes.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], Set[str], bool]: Nodes keyed by UUID,
+        UUIDs that did not resolve to a story, and whether a limit stopped the walk.
+    """
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for story in roots:
+        node = _graph_node(story)
+        nodes[node["uuid"]] = node
+        story_graph_cache.set(node["uuid"], node)
+
+    unresolved: Set[str] = set()
+    frontier = {ref for node in nodes.values() for ref in node["story_refs"]} - nodes.keys()
+    depth = 0
+    while frontier:
+        if (max_depth is not None and depth >= max_depth) or len(nodes) >= MAX_GRAPH_STORIES:
+            return nodes, unresolved, True
+        depth += 1
+
+        added: List[Dict[str, Any]] = []
+        missing: List[str] = []
+        for uuid in sorted(frontier):
+            cached = None if refresh else story_graph_cache.get(uuid)
+            if cached is False:
+                unresolved.add(uuid)
+            elif cached:
+                added.append(cached)
+            else:
+                missing.append(uuid)
+
+        if missing:
+            found = await fetch_stories_by(client, "by_uuids", missing, {"with_content": 1})
+            for story in found:
+                node = _graph_node(story)
+                story_graph_cache.set(node["uuid"], node)
+                added.append(node)
+            for uuid in set(missing) - {s.get("uuid") for s in found}:
+                story_graph_cache.set(uuid, False)
+                unresolved.add(uuid)
+
+        for node in added:
+            nodes[node["uuid"]] = node
+        frontier = {ref for node in added for ref in node["story_refs"]} - nodes.keys() - unresolved
+
+    return nodes, unresolved, False
+
+
+async def run_story_bulk(
+    tool: str,
+    items: List[Any],
+    apply: Any,
+    background: bool,
+    ctx: Optional[Context],
+) -> Any:
+    """
+    Run a bulk story operation now, or as a background job when requested.
+    If the client cancels a foreground run, what was applied is kept as a cancelled job.
+    """
+    async def on_cancel(summary: Dict[str, Any]) -> None:
+        await record_cancelled_call(tool, summary, ctx)
+
+    async def runner(job: Optional[Job] = None) -> Dict[str, Any]:
+        try:
+            return await run_bulk(items, apply, job, on_cancel)
+        finally:
+            invalidate_story_caches()
+
+    if background:
+        return job_manager.start(tool, runner, len(items), ctx)
+    return await runner()
+
+
+async def put_story_update(
+    client: AsyncClient,
+    sid: Any,
+    update_fields: Dict[str, Any],
+    publish: bool,
+) -> Dict[str, Any]:
+    """
+    Write fields of one story and optionally publish it, as bulk_update_stories does.
+    With no fields the story is only published.
+
+    Returns:
+        Dict[str, Any]: Per-story result with 'status' and 'published'.
+    """
+    try:
+        data: Dict[str, Any] = {}
+        if update_fields:
+            resp = await client.put(
+                build_management_url(f"/stories/{sid}"),
+                headers=get_management_headers(),
+                json={"story": update_fields}
+            )
+            data = _handle_response(resp, resp.url)
+        published = False
+
+        if publish:
+            try:
+                publish_resp = await client.post(
+                    build_management_url(f"/stories/{sid}/publish"),
+                    headers=get_management_headers()
+                )
+                _handle_response(publish_resp, publish_resp.url)
+                published = True
+            except APIError:
+                pass  # Publishing errors don't block update success
+
+        return {
+            "id": sid,
+            "status": "success",
+            "data": data,
+            "published": published
+        }
+    except APIError as e:
+        return {
+            "id": sid,
+            "status": "error",
+            "error": str(e)
+        }
+
+
+async def plan_story_updates(client: AsyncClient, stories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Dry run of bulk_update_stories: fetch the current stories concurrently, diff
+    each update locally and store only the writes that change something.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        stories (List[Dict[str, Any]]): bulk_update_stories input.
+
+    Returns:
+        Dict[str, Any]: Compact plan view (see PlanStore.create).
+
+    Raises:
+        PlanError: If the plan could not be stored.
+    """
+    async def fetch(sid: Any) -> Tuple[Any, Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            url = build_management_url(f"/stories/{sid}")
+            resp = await client.get(url, headers=get_management_headers())
+            return sid, _handle_response(resp, url).get("story"), None
+        except APIError as e:
+            return sid, None, str(e)
+
+    ids = list(dict.fromkeys(s.get("id") for s in stories))
+    fetched = {sid: (story, error) for sid, story, error in await gather_bounded(fetch, ids)}
+
+    operations: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    unreadable: List[Dict[str, Any]] = []
+    unchanged = 0
+    for story_update in stories:
+        sid = story_update.get("id")
+        story, error = fetched[sid]
+        if story is None:
+            if len(unreadable) < MAX_REPORTED_FAILURES:
+                unreadable.append({"id": sid, "error": error})
+            continue
+        fields = {k: v for k, v in story_update.items() if k not in ("id", "publish") and v is not None}
+        diff = story_field_diff(story, fields)
+        publish = bool(story_update.get("publish")) and bool(
+            diff["changed"] or story.get("unpublished_changes") or not story.get("published")
+        )
+        if not diff["changed"] and not publish:
+            unchanged += 1
+            continue
+        operations.append({"id": sid, "update": diff["changed"], "publish": publish})
+        changes.append({"id": sid, "name": story.get("name"), "fields": diff["diff"], "publish": publish})
+
+    summary = {
+        "stories_requested": len(stories),
+        "stories_changed": len(operations),
+        "stories_unchanged": unchanged,
+        "stories_unreadable": unreadable,
+    }
+    return plan_store.create("bulk_update_stories", operations, changes, summary)
+
+
 def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
+
+    async def load_stories_by_id(story_ids: List[int]) -> Dict[int, Any]:
+        """
+        Batch loader for coalesced story reads. Every story comes from a by_ids list call,
+        so the shape ({"story": <list-endpoint story>}) does not depend on how many calls
+        were coalesced; a single GET is only made for IDs the list did not return, to
+        surface their error.
+        """
+        async def fetch_one(story_id: int) -> Any:
+            url = build_management_url(f"/stories/{story_id}")
+            resp = await client.get(url, headers=get_management_headers())
+            try:
+                return _handle_response(resp, url)
+            except APIError as e:
+                return e
+
+        stories = await fetch_stories_by(client, "by_ids", story_ids, {"with_content": 1})
+        results: Dict[int, Any] = {s["id"]: {"story": s} for s in stories}
+        missing = [sid for sid in story_ids if sid not in results]
+        for sid, result in zip(missing, await gather_bounded(fetch_one, missing)):
+            results[sid] = result
+        return results
+
+    # Coalesces get_story calls arriving within a few milliseconds into by_ids list calls
+    story_batcher = MicroBatcher(load_stories_by_id, window=0.005, max_batch=STORY_BATCH_SIZE)
+
+    async def load_version_contents(story_id: int, version_ids: List[int]) -> Tuple[Dict[int, Any], int, int]:
+        """
+        Return content for the requested versions, reading the disk cache first and
+        paging story_versions (show_content=1) only for versions not cached yet.
+        Every version seen while paging is cached.
+        Returns contents, cache hits and pages fetched.
+        """
+        contents: Dict[int, Any] = {}
+        for vid in version_ids:
+            cached = version_cache.get(vid)
+            if cached is not None:
+                contents[vid] = cached
+
+        cache_hits = len(contents)
+        missing = set(version_ids) - contents.keys()
+        url = build_management_url("/story_versions")
+        page = 0
+        while missing:
+            page += 1
+            params = {"by_story_id": story_id, "show_content": 1, "page": page, "per_page": 100}
+            resp = await client.get(url, headers=get_management_headers(), params=params)
+            versions = _handle_response(resp, url).get("story_versions", [])
+            for version in versions:
+                content = _version_content(version)
+                if content is None:
+                    continue
+                version_cache.set(version["id"], content)
+                if version["id"] in missing:
+                    contents[version["id"]] = content
+                    missing.discard(version["id"])
+            if len(versions) < 100:
+                break
+        return contents, cache_hits, page
     
     @mcp.tool()
     async def fetch_stories(
@@ -44,17 +431,37 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         scheduled_at_lt: Optional[str] = None,
         favourite: Optional[bool] = None,
         reference_search: Optional[str] = None,
+        version: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Fetch multiple stories from Storyblok with advanced filtering and pagination.
+        version='published' reads published stories from the CDN-backed Delivery API
+        (supports starts_with, by_uuids, by_slugs, excluding_*, with_tag, sort_by,
+        search and filter_query).
         """
         try:
+            raw_params = locals()
+            if use_delivery_api(version):
+                options = {
+                    k: v for k, v in raw_params.items()
+                    if k not in ("mcp", "client", "page", "per_page", "version") and v is not None
+                }
+                data = await delivery_get(client, "/stories", {
+                    **delivery_story_params(options), "page": page, "per_page": per_page
+                })
+                return {
+                    "stories": data.get("stories", []),
+                    "total": len(data.get("stories", [])),
+                    "page": page,
+                    "per_page": per_page,
+                    "cv": data.get("cv"),
+                }
+
             url = build_management_url("/stories")
             # Build query parameters
-            raw_params = locals()
             params = {"page": page, "per_page": per_page}
             for key, val in raw_params.items():
-                if key in ["mcp", "client"] or val is None:
+                if key in ["mcp", "client", "version"] or val is None:
                     continue
                 if isinstance(val, bool):
                     params[key] = 1 if val else 0
@@ -73,21 +480,78 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             }
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        except ValueError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
     @mcp.tool()
     async def get_story(
-        story_id: int
+        story_id: int,
+        version: Optional[str] = None,
+        batch: bool = False
     ) -> Any:
         """
         Retrieves a specific story by its ID.
+        batch=True lets concurrent calls be coalesced into by_ids list requests; the
+        story then has the list endpoint's fields rather than the single endpoint's.
+        version='published' reads the published story from the CDN-backed Delivery API.
         """
         try:
-            url = build_management_url(f"/stories/{story_id}")
+            if use_delivery_api(version):
+                return await delivery_get(client, f"/stories/{int(story_id)}")
+            if batch:
+                return await story_batcher.load(int(story_id))
+            url = build_management_url(f"/stories/{int(story_id)}")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def get_stories_batch(
+        story_ids: Optional[List[int]] = None,
+        uuids: Optional[List[str]] = None,
+        slugs: Optional[List[str]] = None,
+        with_content: bool = True
+    ) -> Any:
+        """
+        Retrieves many stories at once by IDs, UUIDs and/or full slugs.
+        Lookups are split into chunks and fetched with one list call per chunk.
+        """
+        try:
+            lookups = [
+                ("by_ids", "id", story_ids or []),
+                ("by_uuids", "uuid", uuids or []),
+                ("by_slugs", "full_slug", slugs or []),
+            ]
+            if not any(values for _, _, values in lookups):
+                return {"isError": True, "content": [{"type": "text", "text": "Provide story_ids, uuids or slugs."}]}
+
+            params = {"with_content": 1} if with_content else {}
+
+            async def lookup(entry: Tuple[str, str, List[Any]]) -> List[Dict[str, Any]]:
+                field, _, values = entry
+                return await fetch_stories_by(client, field, values, params) if values else []
+
+            found = await gather_bounded(lookup, lookups)
+
+            stories: Dict[int, Dict[str, Any]] = {}
+            missing: Dict[str, List[Any]] = {}
+            for (field, attr, values), result in zip(lookups, found):
+                seen = {str(story.get(attr)) for story in result}
+                for story in result:
+                    stories[story["id"]] = story
+                not_found = [v for v in values if str(v) not in seen]
+                if not_found:
+                    missing[field] = not_found
+
+            return {
+                "stories": list(stories.values()),
+                "total": len(stories),
+                "missing": missing,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def create_story(
         name: str,
@@ -219,6 +683,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/stories/{story_id}")
             resp = await client.put(url, headers=get_management_headers(), json=payload)
+            invalidate_story_caches()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -231,6 +696,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             url = build_management_url(f"/stories/{id}")
             resp = await client.delete(url, headers=get_management_headers())
             _handle_response(resp, url)
+            invalidate_story_caches()
             return {"message": f"Story {id} has been successfully deleted."}
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -253,6 +719,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                 params["release_id"] = release_id
 
             resp = await client.get(url, headers=get_management_headers(), params=params)
+            invalidate_story_caches()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -275,6 +742,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                 params["lang"] = lang
             
             resp = await client.get(url, headers=get_management_headers(), params=params)
+            invalidate_story_caches()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -309,6 +777,11 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
             resp = await client.get(url, headers=get_management_headers(), params=params)
             data = _handle_response(resp, url)
+            if show_content:
+                for version in data.get("story_versions", []):
+                    content = _version_content(version)
+                    if content is not None:
+                        version_cache.set(version["id"], content)
 
             return {
                 "versions": data.get("story_versions", []),
@@ -327,6 +800,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/stories/{id}/restore/{version_id}")
             resp = await client.post(url, headers=get_management_headers())
+            invalidate_story_caches()
             return _handle_response(resp, url)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -475,117 +949,87 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         }
 
     @mcp.tool()
-    async def bulk_publish_stories(story_ids: List[str]) -> Any:
-        """Publishes multiple stories by ID."""
-        results = []
-        success = fail = 0
-        for sid in story_ids:
+    async def bulk_publish_stories(story_ids: List[str], background: bool = False, ctx: Context = None) -> Any:
+        """
+        Publishes multiple stories by ID.
+        With background=True, returns a job ID at once; follow it with get_job_status
+        and get_job_results.
+        """
+        async def publish(sid: str) -> Dict[str, Any]:
             try:
                 resp = await client.post(
                     build_management_url(f"/stories/{sid}/publish"),
                     headers=get_management_headers()
                 )
                 data = _handle_response(resp, resp.url)
-                results.append({"id": sid, "status": "success", "data": data})
-                success += 1
+                return {"id": sid, "status": "success", "data": data}
             except APIError as e:
-                results.append({"id": sid, "status": "error", "error": str(e)})
-                fail += 1
-        return {"total_processed": len(story_ids), "successful_operations": success,
-                "failed_operations": fail, "results": results}
+                return {"id": sid, "status": "error", "error": str(e)}
+
+        return await run_story_bulk("bulk_publish_stories", story_ids, publish, background, ctx)
 
 
     @mcp.tool()
-    async def bulk_delete_stories(story_ids: List[str]) -> Any:
-        """Deletes multiple stories in Storyblok."""
-        results = []
-        success = fail = 0
-        for sid in story_ids:
+    async def bulk_delete_stories(story_ids: List[str], background: bool = False, ctx: Context = None) -> Any:
+        """
+        Deletes multiple stories in Storyblok.
+        With background=True, returns a job ID at once.
+        """
+        async def delete(sid: str) -> Dict[str, Any]:
             try:
                 resp = await client.delete(
                     build_management_url(f"/stories/{sid}"),
                     headers=get_management_headers()
                 )
                 _handle_response(resp, resp.url)
-                results.append({"id": sid, "status": "success"})
-                success += 1
+                return {"id": sid, "status": "success"}
             except APIError as e:
-                results.append({
+                return {
                     "id": sid,
                     "status": "error",
                     "error": str(e)
-                })
-                fail += 1
-        return {
-            "total_processed": len(story_ids),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+                }
+
+        return await run_story_bulk("bulk_delete_stories", story_ids, delete, background, ctx)
 
     @mcp.tool()
     async def bulk_update_stories(
-        stories: List[Dict[str, Any]]
+        stories: List[Dict[str, Any]],
+        background: bool = False,
+        dry_run: bool = False,
+        ctx: Context = None
     ) -> Any:
-        """Updates multiple stories in Storyblok, optionally publishing them."""
-        results = []
-        success = fail = 0
+        """
+        Updates multiple stories in Storyblok, optionally publishing them.
+        With background=True, returns a job ID at once.
+        With dry_run=True, nothing is written: the current stories are diffed against
+        the updates and a plan of the changing stories is returned; run it with apply_plan.
+        """
+        if dry_run:
+            try:
+                return await plan_story_updates(client, stories)
+            except PlanError as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
-        for story_update in stories:
+        async def update(story_update: Dict[str, Any]) -> Dict[str, Any]:
             sid = story_update.get("id")
             publish = story_update.pop("publish", False)
             update_fields = {k: v for k, v in story_update.items() if v is not None}
-            try:
-                resp = await client.put(
-                    build_management_url(f"/stories/{sid}"),
-                    headers=get_management_headers(),
-                    json={"story": update_fields}
-                )
-                data = _handle_response(resp, resp.url)
-                published = False
-
-                if publish:
-                    try:
-                        publish_resp = await client.post(
-                            build_management_url(f"/stories/{sid}/publish"),
-                            headers=get_management_headers()
-                        )
-                        _handle_response(publish_resp, publish_resp.url)
-                        published = True
-                    except APIError:
-                        pass  # Publishing errors don't block update success
-
-                results.append({
-                    "id": sid,
-                    "status": "success",
-                    "data": data,
-                    "published": published
-                })
-                success += 1
-            except APIError as e:
-                results.append({
-                    "id": sid,
-                    "status": "error",
-                    "error": str(e)
-                })
-                fail += 1
+            return await put_story_update(client, sid, update_fields, publish)
 
-        return {
-            "total_processed": len(stories),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+        return await run_story_bulk("bulk_update_stories", stories, update, background, ctx)
 
     @mcp.tool()
     async def bulk_create_stories(
-        stories: List[Dict[str, Any]]
+        stories: List[Dict[str, Any]],
+        background: bool = False,
+        ctx: Context = None
     ) -> Any:
-        """Creates multiple stories in Storyblok."""
-        results = []
-        success = fail = 0
-
-        for story_input in stories:
+        """
+        Creates multiple stories in Storyblok.
+        With background=True, returns a job ID at once.
+        """
+        async def create(story_input: Dict[str, Any]) -> Dict[str, Any]:
             try:
                 resp = await client.post(
                     build_management_url("/stories"),
@@ -593,29 +1037,22 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                     json={"story": story_input}
                 )
                 data = _handle_response(resp, resp.url)
-                results.append({
+                return {
                     "input": story_input,
                     "id": data.get("story", {}).get("id"),
                     "slug": data.get("story", {}).get("slug"),
                     "status": "success",
                     "data": data
-                })
-                success += 1
+                }
             except APIError as e:
-                results.append({
+                return {
                     "input": story_input,
                     "slug": story_input.get("slug"),
                     "status": "error",
                     "error": str(e)
-                })
-                fail += 1
+                }
 
-        return {
-            "total_processed": len(stories),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+        return await run_story_bulk("bulk_create_stories", stories, create, background, ctx)
 
     
     @mcp.tool()
@@ -641,7 +1078,73 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
-        
+
+    @mcp.tool()
+    async def plan_release_publish(
+        story_ids: Optional[List[int]] = None,
+        release_id: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        include_published: bool = False,
+        refresh: bool = False
+    ) -> Any:
+        """
+        Builds the transitive dependency graph (story links, references, assets) for
+        the given stories and/or the stories in a release, and returns a publish plan
+        ordered so linked stories are published before the stories that link to them.
+        Stories in the same stage can be published in parallel; cycles are reported
+        and kept together in one stage.
+        """
+        try:
+            if not story_ids and release_id is None:
+                return {"isError": True, "content": [{"type": "text", "text": "Provide story_ids and/or release_id."}]}
+
+            roots: List[Dict[str, Any]] = []
+            if story_ids:
+                roots.extend(await fetch_stories_by(client, "by_ids", story_ids, {"with_content": 1}))
+            if release_id is not None:
+                roots.extend(await fetch_all_pages(
+                    client,
+                    build_management_url("/stories"),
+                    "stories",
+                    {"in_release": release_id, "with_content": 1},
+                ))
+
+            nodes, unresolved, limit_reached = await build_dependency_graph(client, roots, max_depth, refresh)
+            edges = {
+                uuid: {ref for ref in node["story_refs"] if ref in nodes}
+                for uuid, node in nodes.items()
+            }
+            stages, cycles = publish_stages(edges)
+
+            def summary(uuid: str) -> Dict[str, Any]:
+                node = nodes[uuid]
+                return {k: node[k] for k in ("id", "name", "full_slug", "published", "unpublished_changes")}
+
+            def needs_publish(uuid: str) -> bool:
+                node = nodes[uuid]
+                return include_published or not node["published"] or node["unpublished_changes"]
+
+            plan = []
+            for stage in stages:
+                members = [summary(uuid) for uuid in stage if needs_publish(uuid)]
+                if members:
+                    plan.append({"stage": len(plan) + 1, "stories": members})
+
+            return {
+                "root_story_ids": sorted({s.get("id") for s in roots}),
+                "release_id": release_id,
+                "stories_analyzed": len(nodes),
+                "publish_plan": plan,
+                "publish_order": [story["id"] for stage in plan for story in stage["stories"]],
+                "cycles": [[summary(uuid) for uuid in cycle] for cycle in cycles],
+                "asset_dependencies": sorted({a for node in nodes.values() for a in node["asset_ids"]}),
+                "unresolved_references": len(unresolved),
+                "depth_limit_reached": limit_reached,
+            }
+
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def ai_translate_story(
         space_id: int,
@@ -694,7 +1197,70 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
-        
-    
 
+    @mcp.tool()
+    async def diff_story_versions(
+        story_id: int,
+        version_ids: List[int],
+        include_current: bool = False
+    ) -> Any:
+        """
+        Computes a local structural diff across story versions, in the order given
+        (v1->v2, v2->v3, ...). Bloks are matched by _uid and reported as
+        insert/delete/move/update patches. Version content is cached on disk, so
+        repeated diffs need no API calls. include_current appends the current draft.
+        """
+        try:
+            if len(version_ids) + (1 if include_current else 0) < 2:
+                return {"isError": True, "content": [{"type": "text", "text": "Provide at least two versions (or one with include_current)."}]}
+
+            contents, cache_hits, pages_fetched = await load_version_contents(story_id, version_ids)
+            not_found = [vid for vid in version_ids if vid not in contents]
+            if not_found:
+                return {"isError": True, "content": [{"type": "text", "text": f"Versions not found for story {story_id}: {not_found}"}]}
+
+            sequence: List[Tuple[Any, Any]] = [(vid, contents[vid]) for vid in version_ids]
+            if include_current:
+                current = await story_batcher.load(int(story_id))
+                sequence.append(("current", (current or {}).get("story", {}).get("content")))
+
+            diffs = []
+            for (from_id, old), (to_id, new) in zip(sequence, sequence[1:]):
+                patches = diff_bloks(old, new)
+                diffs.append({"from": from_id, "to": to_id, "summary": summarize_patches(patches), "patches": patches})
+
+            return {
+                "story_id": story_id,
+                "diffs": diffs,
+                "versions_from_cache": cache_hits,
+                "api_pages_fetched": pages_fetched,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def diff_stories(
+        story_id_a: int,
+        story_id_b: int
+    ) -> Any:
+        """
+        Computes a local structural diff between the current content of two stories
+        (e.g. a page and its copy or translation), matching bloks by _uid.
+        """
+        try:
+            story_a, story_b = await asyncio.gather(
+                story_batcher.load(int(story_id_a)),
+                story_batcher.load(int(story_id_b)),
+            )
+            patches = diff_bloks(
+                (story_a or {}).get("story", {}).get("content"),
+                (story_b or {}).get("story", {}).get("content"),
+            )
+            return {
+                "from": story_id_a,
+                "to": story_id_b,
+                "summary": summarize_patches(patches),
+                "patches": patches,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -1,25 +1,184 @@
 import json
 from typing import Any, Optional, Dict, List, Union
+import httpx
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
     APIError,
+    delivery_get,
+    use_delivery_api,
 )
+from utils.concurrency import DEFAULT_CONCURRENCY, chunked, gather_bounded
+from utils.plans import PlanError, plan_store
+from tools.stories import fetch_stories_by, story_tag_cache
+
+# Stories per bulk_association payload; larger payloads risk request timeouts
+TAG_BULK_CHUNK_SIZE = 100
+MAX_REPORTED_FAILURES = 100
+
+
+async def load_story_tags(
+    client: AsyncClient,
+    story_ids: List[int],
+    refresh: bool = False,
+) -> Dict[int, List[str]]:
+    """
+    Current tag_list for each story, served from story_tag_cache where possible.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        story_ids (List[int]): Stories to look up.
+        refresh (bool): Ignore cached tag lists.
+
+    Returns:
+        Dict[int, List[str]]: Tags per story ID; unknown stories are absent.
+    """
+    tags: Dict[int, List[str]] = {}
+    missing = []
+    for story_id in story_ids:
+        cached = None if refresh else story_tag_cache.get(story_id)
+        if cached is None:
+            missing.append(story_id)
+        else:
+            tags[story_id] = cached
+    if missing:
+        for story in await fetch_stories_by(client, "by_ids", missing):
+            tags[story["id"]] = list(story.get("tag_list") or [])
+            story_tag_cache.set(story["id"], tags[story["id"]])
+    return tags
+
+
+def apply_tag_changes(current: List[str], add: List[str], remove: List[str]) -> List[str]:
+    """
+    New tag list after removing and adding tags, keeping the existing order.
+
+    Args:
+        current (List[str]): Tags the story has now.
+        add (List[str]): Tags to add.
+        remove (List[str]): Tags to remove (wins over add).
+
+    Returns:
+        List[str]: Resulting tag list.
+    """
+    removed = set(remove)
+    result = [tag for tag in current if tag not in removed]
+    for tag in add:
+        if tag not in removed and tag not in result:
+            result.append(tag)
+    return result
+
+
+async def post_idempotent(client: AsyncClient, url: str, payload: Dict[str, Any]) -> Any:
+    """
+    POST a payload that is safe to repeat, letting the retry transport resend it on
+    rate limits, server errors and network errors.
+
+    Returns:
+        Any: Parsed response.
+
+    Raises:
+        APIError: Final error response.
+        httpx.TransportError: Final network error.
+    """
+    resp = await client.post(url, json=payload, headers=get_management_headers(), extensions={"idempotent": True})
+    return _handle_response(resp, url) if resp.content else {}
+
+
+async def send_tag_lists(
+    client: AsyncClient,
+    stories: List[Dict[str, Any]],
+    chunk_size: int,
+    concurrency: int,
+    ctx: Optional[Context],
+) -> Dict[str, Any]:
+    """Post story tag lists in chunks concurrently; failed chunks are reported, not raised."""
+    url = build_management_url("/tags/bulk_association")
+    chunks = list(chunked(stories, max(1, min(chunk_size, TAG_BULK_CHUNK_SIZE))))
+    failures: List[Dict[str, Any]] = []
+    done = 0
+
+    async def send(chunk: List[Dict[str, Any]]) -> None:
+        nonlocal done
+        try:
+            await post_idempotent(client, url, {"tags": {"stories": chunk}})
+            for story in chunk:
+                if "tag_list" in story:
+                    story_tag_cache.set(story["story_id"], list(story["tag_list"]))
+        except (APIError, httpx.TransportError) as e:
+            for story in chunk:
+                story_tag_cache.invalidate(story["story_id"])
+            if len(failures) < MAX_REPORTED_FAILURES:
+                failures.append({"story_ids": [story["story_id"] for story in chunk], "error": str(e)})
+        done += 1
+        if ctx is not None:
+            await ctx.report_progress(done, len(chunks), f"{done}/{len(chunks)} payloads sent")
+
+    await gather_bounded(send, chunks, concurrency)
+    return {"payloads": len(chunks), "failed_payloads": failures}
+
+
+def plan_tag_lists(
+    tool: str,
+    desired: List[Dict[str, Any]],
+    current: Dict[int, List[str]],
+    summary: Dict[str, Any],
+    options: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Store a dry-run plan of tag list writes, skipping stories whose tags would not change.
+
+    Args:
+        tool (str): Tool that computed the plan.
+        desired (List[Dict[str, Any]]): {"story_id", "tag_list"} items to write.
+        current (Dict[int, List[str]]): Current tags per story ID.
+        summary (Dict[str, Any]): Counts reported with the plan.
+        options (Dict[str, Any]): chunk_size and concurrency used when applying.
+
+    Returns:
+        Dict[str, Any]: Compact plan view (see PlanStore.create).
+
+    Raises:
+        PlanError: If the plan could not be stored.
+    """
+    operations: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    for story in desired:
+        before, after = current[story["story_id"]], list(story["tag_list"])
+        if after == before:
+            continue
+        operations.append({"story_id": story["story_id"], "tag_list": after})
+        changes.append({
+            "story_id": story["story_id"],
+            "added": [tag for tag in after if tag not in before],
+            "removed": [tag for tag in before if tag not in after],
+        })
+    summary = {**summary, "stories_changed": len(operations), "stories_unchanged": len(desired) - len(operations)}
+    return plan_store.create(tool, operations, changes, summary, options)
 
 
 def register_tags(mcp: FastMCP, client: AsyncClient) -> None:
 
     @mcp.tool()
     async def retrieve_multiple_tags(
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        version: Optional[str] = None
     ) -> Any:
         """
         Retrieves multiple tags from a specified Storyblok space using the Management API.
+        version='published' lists tags of published stories (with taggings_count) from
+        the CDN-backed Delivery API.
         """
         try:
+            if use_delivery_api(version):
+                data = await delivery_get(client, "/tags")
+                if search:
+                    needle = search.lower()
+                    data["tags"] = [tag for tag in data.get("tags", []) if needle in tag.get("name", "").lower()]
+                return data
+
             params: dict[str, Any] = {}
             if search is not None:
                 params["search"] = search
@@ -93,21 +252,107 @@ def register_tags(mcp: FastMCP, client: AsyncClient) -> None:
 
     @mcp.tool()
     async def tag_bulk_association(
-        stories: List[Dict[str, Any]]
+        stories: List[Dict[str, Any]],
+        chunk_size: int = TAG_BULK_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        dry_run: bool = False,
+        ctx: Context = None
     ) -> Any:
         """
         Adds tags to multiple stories in a Storyblok space.
+        Each item is {"story_id": ..., "tag_list": [...]}; large lists are split into
+        several payloads sent concurrently with retry.
+        With dry_run=True, nothing is written: the tag lists are diffed against the
+        current (cached) tags and a plan of the changing stories is returned for apply_plan.
+        """
+        if dry_run:
+            try:
+                desired = [
+                    {"story_id": int(story["story_id"]), "tag_list": list(story["tag_list"])}
+                    for story in stories
+                ]
+            except (KeyError, TypeError, ValueError):
+                return {"isError": True, "content": [{"type": "text", "text": 'Each item must be {"story_id": <int>, "tag_list": [...]}.'}]}
+            try:
+                current = await load_story_tags(client, [story["story_id"] for story in desired])
+                return plan_tag_lists(
+                    "tag_bulk_association",
+                    [story for story in desired if story["story_id"] in current],
+                    current,
+                    {
+                        "stories_requested": len(stories),
+                        "stories_not_found": [story["story_id"] for story in desired if story["story_id"] not in current],
+                    },
+                    {"chunk_size": chunk_size, "concurrency": concurrency},
+                )
+            except (APIError, PlanError) as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        result = await send_tag_lists(client, stories, chunk_size, concurrency, ctx)
+        return {"stories": len(stories), **result}
+
+    @mcp.tool()
+    async def bulk_update_story_tags(
+        story_ids: Optional[List[int]] = None,
+        add_tags: Optional[List[str]] = None,
+        remove_tags: Optional[List[str]] = None,
+        changes: Optional[List[Dict[str, Any]]] = None,
+        chunk_size: int = TAG_BULK_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        refresh: bool = False,
+        dry_run: bool = False,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Adds and removes tags on many stories, sending only stories whose tags change.
+        add_tags/remove_tags apply to every story in story_ids; changes holds per-story
+        operations {"story_id": ..., "add": [...], "remove": [...]}.
+        Current tags come from a short-lived cache (refresh=True reloads them).
+        With dry_run=True, returns a plan of the tag changes for apply_plan instead of writing.
         """
         try:
-            payload = {
-                "tags": {
-                    "stories": stories
-                }
-            }
+            operations: Dict[int, Dict[str, List[str]]] = {}
+            for story_id in story_ids or []:
+                op = operations.setdefault(int(story_id), {"add": [], "remove": []})
+                op["add"] += add_tags or []
+                op["remove"] += remove_tags or []
+            for change in changes or []:
+                op = operations.setdefault(int(change["story_id"]), {"add": [], "remove": []})
+                op["add"] += change.get("add") or []
+                op["remove"] += change.get("remove") or []
+            if not operations:
+                return {"isError": True, "content": [{"type": "text", "text": "Provide story_ids with add_tags/remove_tags, or changes."}]}
 
-            url = build_management_url(f"/tags/bulk_association")
-            resp = await client.post(url, json=payload, headers=get_management_headers())
-            return _handle_response(resp, url)
-        except APIError as e:
-            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+            current = await load_story_tags(client, list(operations), refresh)
+            not_found = [story_id for story_id in operations if story_id not in current]
+            if dry_run:
+                desired = [
+                    {"story_id": story_id, "tag_list": apply_tag_changes(current[story_id], op["add"], op["remove"])}
+                    for story_id, op in operations.items() if story_id in current
+                ]
+                return plan_tag_lists(
+                    "bulk_update_story_tags",
+                    desired,
+                    current,
+                    {"stories_requested": len(operations), "stories_not_found": not_found},
+                    {"chunk_size": chunk_size, "concurrency": concurrency},
+                )
+
+            updates = []
+            for story_id, op in operations.items():
+                if story_id not in current:
+                    continue
+                tag_list = apply_tag_changes(current[story_id], op["add"], op["remove"])
+                if tag_list != current[story_id]:
+                    updates.append({"story_id": story_id, "tag_list": tag_list})
 
+            result = await send_tag_lists(client, updates, chunk_size, concurrency, ctx)
+            return {
+                "stories_requested": len(operations),
+                "stories_changed": len(updates),
+                "stories_unchanged": len(current) - len(updates),
+                "stories_not_found": not_found,
+                **result,
+            }
+        except (APIError, PlanError) as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -1,7 +1,118 @@
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import build_management_url, get_management_headers, _handle_response, APIError
+from utils.cache import TTLCache
+
+# Workflow and stage read responses keyed by (path, params); cleared by any workflow or stage write
+workflow_cache = TTLCache(ttl=600, maxsize=256)
+_model_lock = asyncio.Lock()
+
+
+async def cached_workflow_get(client: AsyncClient, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a workflow/stage endpoint through workflow_cache.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        path (str): Management API path.
+        params (Optional[Dict[str, Any]]): Query parameters; None values are dropped.
+
+    Returns:
+        Any: Parsed response.
+    """
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    key = (path, tuple(sorted(params.items())))
+    cached = workflow_cache.get(key)
+    if cached is not None:
+        return cached
+    url = build_management_url(path)
+    resp = await client.get(url, params=params, headers=get_management_headers())
+    data = _handle_response(resp, url)
+    workflow_cache.set(key, data)
+    return data
+
+
+class WorkflowModel:
+    """
+    Workflows, their stages and the allowed stage transitions.
+    A stage lists the stages stories may move to next in workflow_stage_ids, unless
+    allow_all_stages is set, in which case any stage of the same workflow is allowed.
+    Attributes:
+        workflows (Dict[int, Dict[str, Any]]): Workflows by ID.
+        stages (Dict[int, Dict[str, Any]]): Stages by ID.
+    """
+    def __init__(self, workflows: List[Dict[str, Any]], stages: List[Dict[str, Any]]):
+        """
+        Initialize WorkflowModel.
+        Args:
+            workflows (List[Dict[str, Any]]): Items of the workflows list response.
+            stages (List[Dict[str, Any]]): Items of the workflow_stages list response.
+        """
+        self.workflows = {w["id"]: w for w in workflows}
+        self.stages = {s["id"]: s for s in stages}
+        self._by_workflow: Dict[Any, List[int]] = {}
+        for stage in stages:
+            self._by_workflow.setdefault(stage.get("workflow_id"), []).append(stage["id"])
+
+    def workflow_stages(self, workflow_id: Any) -> List[int]:
+        """Stage IDs belonging to a workflow."""
+        return list(self._by_workflow.get(workflow_id, []))
+
+    def default_stage(self, workflow_id: Any) -> Optional[int]:
+        """The workflow's default stage (where stories without a stage change sit), if any."""
+        for stage_id in self._by_workflow.get(workflow_id, []):
+            if self.stages[stage_id].get("is_default"):
+                return stage_id
+        return None
+
+    def transition_error(self, from_stage_id: Optional[int], to_stage_id: int) -> Optional[str]:
+        """
+        Check a stage change against the model.
+        Args:
+            from_stage_id (Optional[int]): Current stage, or None if the story has none yet.
+            to_stage_id (int): Target stage.
+        Returns:
+            Optional[str]: Why the transition is not allowed, or None if it is.
+        """
+        target = self.stages.get(to_stage_id)
+        if target is None:
+            return f"Workflow stage {to_stage_id} does not exist."
+        if from_stage_id is None:
+            return None
+        current = self.stages.get(from_stage_id)
+        if current is None:
+            return None
+        if current.get("workflow_id") != target.get("workflow_id"):
+            return f"Stage '{target.get('name')}' belongs to a different workflow than '{current.get('name')}'."
+        if current.get("allow_all_stages") or to_stage_id in (current.get("workflow_stage_ids") or []):
+            return None
+        return f"Moving from '{current.get('name')}' to '{target.get('name')}' is not allowed."
+
+
+async def get_workflow_model(client: AsyncClient, refresh: bool = False) -> WorkflowModel:
+    """
+    Build the workflow model from cached workflow and stage listings.
+
+    Args:
+        client (AsyncClient): HTTP client.
+        refresh (bool): Drop cached listings first.
+
+    Returns:
+        WorkflowModel: Current workflows, stages and transitions.
+    """
+    async with _model_lock:
+        if refresh:
+            workflow_cache.invalidate()
+        model = workflow_cache.get("model")
+        if model is None:
+            workflows = await cached_workflow_get(client, "/workflows")
+            stages = await cached_workflow_get(client, "/workflow_stages/")
+            model = WorkflowModel(workflows.get("workflows", []), stages.get("workflow_stages", []))
+            workflow_cache.set("model", model)
+        return model
+
 
 def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -28,12 +139,7 @@ def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
                 "search": search,
                 "in_workflow": in_workflow
             }
-            # Filter out any parameters that are None
-            params = {key: value for key, value in params.items() if value is not None}
-
-            url = build_management_url(f"/workflow_stages/")
-            resp = await client.get(url, params=params, headers=get_management_headers())
-            return _handle_response(resp, url)
+            return await cached_workflow_get(client, "/workflow_stages/", params)
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -46,9 +152,7 @@ def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
         Retrieves a single workflow stage by its ID in a Storyblok space via the Management API.
         """
         try:
-            url = build_management_url(f"/workflow_stages/{workflow_stage_id}")
-            resp = await client.get(url, headers=get_management_headers())
-            return _handle_response(resp, url)
+            return await cached_workflow_get(client, f"/workflow_stages/{workflow_stage_id}")
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -97,6 +201,7 @@ def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/workflow_stages")
             resp = await client.post(url, json=payload, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -146,6 +251,7 @@ def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/workflow_stages/{workflow_id}")
             resp = await client.put(url, json=payload, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -161,6 +267,7 @@ def register_workflow_stages(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/workflow_stages/{workflow_id}")
             resp = await client.delete(url, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -1,7 +1,25 @@
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 from httpx import AsyncClient
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from utils.api import build_management_url, get_management_headers, _handle_response, APIError
+from utils.concurrency import DEFAULT_CONCURRENCY, gather_bounded
+from tools.stories import fetch_stories_by
+from tools.workflow_stage import get_workflow_model
+
+MAX_REPORTED_FAILURES = 100
+
+
+async def current_story_stages(client: AsyncClient, story_ids: List[int], stage_ids: List[int]) -> Dict[int, int]:
+    """
+    Map story ID -> current stage for the given stories that sit in one of the given
+    stages, using by_ids lookups filtered by in_workflow_stages (one per stage and chunk).
+    """
+    async def stories_in(stage_id: int) -> List[Dict[str, Any]]:
+        return await fetch_stories_by(client, "by_ids", story_ids, {"in_workflow_stages": stage_id, "story_only": 1})
+
+    listings = await gather_bounded(stories_in, stage_ids)
+    return {story["id"]: stage_id for stage_id, stories in zip(stage_ids, listings) for story in stories}
+
 
 def register_workflow_stage_changes(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -44,3 +62,80 @@ def register_workflow_stage_changes(mcp: FastMCP, client: AsyncClient) -> None:
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def bulk_change_workflow_stage(
+        story_ids: List[int],
+        workflow_stage_id: int,
+        check_transitions: bool = True,
+        refresh: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        ctx: Context = None
+    ) -> Any:
+        """
+        Moves many stories to a workflow stage concurrently.
+        With check_transitions, each story's current stage is looked up and the move is checked
+        against the cached workflow model first: stories already in the stage are
+        skipped, and disallowed transitions are rejected without calling the API.
+        Stories without a stage in the target workflow are treated as being in its
+        default stage.
+        """
+        try:
+            model = await get_workflow_model(client, refresh)
+            error = model.transition_error(None, workflow_stage_id)
+            if error:
+                return {"isError": True, "content": [{"type": "text", "text": error}]}
+
+            story_ids = list(dict.fromkeys(story_ids))
+            to_move, skipped, rejected = story_ids, [], []
+            if check_transitions:
+                workflow_id = model.stages[workflow_stage_id].get("workflow_id")
+                current = await current_story_stages(client, story_ids, model.workflow_stages(workflow_id))
+                default = model.default_stage(workflow_id)
+                to_move = []
+                for story_id in story_ids:
+                    from_stage = current.get(story_id, default)
+                    if from_stage == workflow_stage_id:
+                        skipped.append(story_id)
+                        continue
+                    error = model.transition_error(from_stage, workflow_stage_id)
+                    if error is None:
+                        to_move.append(story_id)
+                    elif len(rejected) < MAX_REPORTED_FAILURES:
+                        rejected.append({"story_id": story_id, "error": error})
+                rejected_count = len(story_ids) - len(to_move) - len(skipped)
+            else:
+                rejected_count = 0
+
+            url = build_management_url("/workflow_stage_changes")
+            failures: List[Dict[str, Any]] = []
+            failed = done = 0
+
+            async def change(story_id: int) -> None:
+                nonlocal done, failed
+                payload = {"workflow_stage_change": {"story_id": story_id, "workflow_stage_id": workflow_stage_id}}
+                try:
+                    resp = await client.post(url, json=payload, headers=get_management_headers())
+                    _handle_response(resp, url)
+                except APIError as e:
+                    failed += 1
+                    if len(failures) < MAX_REPORTED_FAILURES:
+                        failures.append({"story_id": story_id, "error": str(e)})
+                done += 1
+                if ctx is not None:
+                    await ctx.report_progress(done, len(to_move), f"{done}/{len(to_move)} stories moved")
+
+            await gather_bounded(change, to_move, concurrency)
+            return {
+                "workflow_stage_id": workflow_stage_id,
+                "stage_name": model.stages[workflow_stage_id].get("name"),
+                "stories_requested": len(story_ids),
+                "changed": len(to_move) - failed,
+                "already_in_stage": skipped,
+                "rejected_count": rejected_count,
+                "rejected": rejected,
+                "failed_count": failed,
+                "failed": failures,
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
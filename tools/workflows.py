@@ -2,6 +2,7 @@ from typing import Any, List, Optional
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import build_management_url, get_management_headers, _handle_response, APIError
+from tools.workflow_stage import cached_workflow_get, workflow_cache
 
 def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
 
@@ -18,9 +19,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
             if content_type is not None:
                 params['content_type'] = content_type
 
-            url = build_management_url("/workflows")
-            resp = await client.get(url, params=params, headers=get_management_headers())
-            return _handle_response(resp, url)
+            return await cached_workflow_get(client, "/workflows", params)
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
@@ -32,9 +31,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
         Retrieves a single workflow by its ID in a Storyblok space via the Management API.
         """
         try:
-            url = build_management_url(f"/workflows/{workflow_id}")
-            resp = await client.get(url, headers=get_management_headers())
-            return _handle_response(resp, url)
+            return await cached_workflow_get(client, f"/workflows/{workflow_id}")
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
         
@@ -56,6 +53,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url("/workflows")
             resp = await client.post(url, json=payload, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -81,6 +79,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/workflows/{workflow_id}")
             resp = await client.put(url, json=payload, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -105,6 +104,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/workflows/{workflow_id}/duplicate")
             resp = await client.post(url, json=payload, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
@@ -121,6 +121,7 @@ def register_workflows(mcp: FastMCP, client: AsyncClient) -> None:
         try:
             url = build_management_url(f"/workflows/{workflow_id}")
             resp = await client.delete(url, headers=get_management_headers())
+            workflow_cache.invalidate()
             return _handle_response(resp, url)
 
         except APIError as e:
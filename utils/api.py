@@ -1,7 +1,16 @@
+import asyncio
 import json
-from typing import Any, Dict, Optional
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
 import httpx
-from config import API_ENDPOINTS, Config
+from config import Config
+from utils.concurrency import gather_bounded
+from utils.endpoints import endpoints
 
 cfg = Config()
 
@@ -71,13 +80,114 @@ def get_management_headers() -> Dict[str, str]:
 
 def build_management_url(path: str) -> str:
     """
-    Construct a full Management API URL for a given path.
+    Construct a full Management API URL for a given path in the configured space,
+    on the API host of the space's region.
     Args:
         path (str): The API path (e.g., '/stories').
     Returns:
         str: Full URL for the Management API endpoint.
     """
-    return f"{API_ENDPOINTS['MANAGEMENT']}/spaces/{cfg.space_id}{path}"
+    return endpoints.url(path)
+
+
+def build_account_url(path: str) -> str:
+    """
+    Construct a Management API URL that is not scoped to the configured space
+    (e.g. '/spaces/', '/org_apps', '/partner_field_types/'), on the regional host.
+    Args:
+        path (str): The API path.
+    Returns:
+        str: Full URL for the Management API endpoint.
+    """
+    return endpoints.url(path, space_scoped=False)
+
+
+def build_delivery_url(path: str) -> str:
+    """
+    Construct a full Content Delivery API URL for a given path.
+    Args:
+        path (str): The API path (e.g., '/stories').
+    Returns:
+        str: Full URL for the Delivery API endpoint.
+    """
+    return endpoints.url(path, api="DELIVERY")
+
+
+class CacheVersion:
+    """
+    Tracks the Delivery API cache version (cv).
+    Requests carry the last known cv so the CDN can answer from cache; after
+    max_age seconds, or after a write through this server, the cv is dropped so the
+    next response reports the latest one.
+    Attributes:
+        value (Optional[int]): Last known cache version.
+        max_age (float): Seconds a known cv is reused.
+    """
+    def __init__(self, max_age: float = 60.0):
+        """
+        Initialize CacheVersion.
+        Args:
+            max_age (float): Seconds a known cv is reused (default 60).
+        """
+        self.value: Optional[int] = None
+        self.max_age = max_age
+        self._updated_at = 0.0
+
+    def current(self) -> Optional[int]:
+        """The cv to send, or None when unknown or too old."""
+        if self.value is None or time.monotonic() - self._updated_at > self.max_age:
+            return None
+        return self.value
+
+    def update(self, cv: Any) -> None:
+        """Record the cv reported by a Delivery API response."""
+        if isinstance(cv, int):
+            self.value = cv
+            self._updated_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget the cv, e.g. after publishing, so the next read fetches fresh content."""
+        self.value = None
+
+
+cache_version = CacheVersion()
+
+
+def use_delivery_api(version: Optional[str]) -> bool:
+    """
+    Read-path routing: published reads go to the CDN-backed Delivery API; drafts
+    (and any unspecified version) stay on the Management API, as do all writes.
+    Args:
+        version (Optional[str]): Requested content version ('published' or 'draft').
+    Returns:
+        bool: True when the read should use the Delivery API.
+    """
+    return version == "published" and bool(cfg.public_token)
+
+
+async def delivery_get(client: httpx.AsyncClient, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET published content from the Delivery API with the public token and cv.
+    Args:
+        client (httpx.AsyncClient): HTTP client to use.
+        path (str): Delivery API path (e.g. '/stories/123').
+        params (Optional[Dict[str, Any]]): Query parameters; None values are dropped.
+    Returns:
+        Any: Parsed JSON response.
+    Raises:
+        APIError: If the response indicates an error.
+    """
+    query = {k: v for k, v in (params or {}).items() if v is not None}
+    query.update({"token": cfg.public_token, "version": "published"})
+    cv = cache_version.current()
+    if cv is not None:
+        query["cv"] = cv
+    url = build_delivery_url(path)
+    resp = await client.get(url, params=query, follow_redirects=True)
+    data = _handle_response(resp, url)
+    if isinstance(data, dict):
+        cache_version.update(data.get("cv"))
+    return data
 
 
 def create_pagination_params(page: int = 1, per_page: int = 25) -> Dict[str, Any]:
@@ -101,3 +211,216 @@ def add_optional_params(params: Dict[str, Any], options: Dict[str, Optional[Any]
     for k, v in options.items():
         if v is not None:
             params[k] = v
+
+async def fetch_all_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    key: str,
+    params: Optional[Dict[str, Any]] = None,
+    per_page: int = 100,
+    max_pages: Optional[int] = None,
+) -> List[Any]:
+    """
+    Fetch every page of a paginated Management API list endpoint.
+    Reads the `Total` response header after the first page and requests the
+    remaining pages concurrently; falls back to sequential paging until a short
+    page when the header is absent.
+    Args:
+        client (httpx.AsyncClient): HTTP client to use.
+        url (str): Full endpoint URL.
+        key (str): Response key holding the list (e.g. 'stories').
+        params (Optional[Dict[str, Any]]): Extra query parameters.
+        per_page (int): Items per page (max 100, default 100).
+        max_pages (Optional[int]): Stop after this many pages.
+    Returns:
+        List[Any]: All items across pages, in page order.
+    Raises:
+        APIError: If any page request fails.
+    """
+    base = dict(params or {})
+
+    async def fetch_page(page: int) -> httpx.Response:
+        resp = await client.get(
+            url,
+            headers=get_management_headers(),
+            params={**base, **create_pagination_params(page, per_page)},
+        )
+        _handle_response(resp, url)
+        return resp
+
+    first = await fetch_page(1)
+    per_page = min(per_page, 100)
+    items = list(first.json().get(key, []))
+    total = first.headers.get("total")
+
+    if total is not None and total.isdigit():
+        last_page = -(-int(total) // per_page)
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+        responses = await gather_bounded(fetch_page, range(2, last_page + 1))
+        for resp in responses:
+            items.extend(resp.json().get(key, []))
+        return items
+
+    page = 1
+    last = items
+    while len(last) >= per_page and (max_pages is None or page < max_pages):
+        page += 1
+        last = (await fetch_page(page)).json().get(key, [])
+        items.extend(last)
+    return items
+
+
+# Retry policy for upstream requests
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Methods that are safe to repeat; POST is only repeated when marked idempotent
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Seconds a single tool call may keep retrying before failures are returned as-is
+TOOL_CALL_DEADLINE = 120.0
+
+_deadline: ContextVar[Optional[float]] = ContextVar("storyblok_deadline", default=None)
+
+
+@contextmanager
+def call_deadline(seconds: Optional[float] = TOOL_CALL_DEADLINE) -> Iterator[None]:
+    """
+    Bound the time spent retrying upstream requests made inside the block (and in
+    tasks it starts). The first attempt of a request is always sent.
+    Args:
+        seconds (Optional[float]): Retry budget from now (default TOOL_CALL_DEADLINE);
+            None removes any enclosing deadline, e.g. for background jobs.
+    """
+    token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class APIMetrics:
+    """
+    Process-wide counters for upstream traffic (requests, retries by reason,
+    exhausted retries), reported by the get_api_metrics tool. Other components
+    add their own state as named sections.
+    Attributes:
+        counters (Counter): Counter name -> count.
+    """
+    def __init__(self):
+        """Initialize APIMetrics."""
+        self.counters: Counter = Counter()
+        self.started_at = time.time()
+        self._sections: Dict[str, Callable[[], Any]] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters[name] += amount
+
+    def register(self, name: str, provider: Callable[[], Any]) -> None:
+        """
+        Add a section to the snapshot.
+        Args:
+            name (str): Section key.
+            provider (Callable[[], Any]): Returns the section's current state.
+        """
+        self._sections[name] = provider
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters, registered sections and uptime."""
+        data = {"uptime_seconds": round(time.time() - self.started_at), "counters": dict(sorted(self.counters.items()))}
+        for name, provider in self._sections.items():
+            data[name] = provider()
+        return data
+
+
+api_metrics = APIMetrics()
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """
+    Delay requested by a Retry-After header (seconds or HTTP date).
+    Args:
+        response (httpx.Response): Upstream response.
+    Returns:
+        Optional[float]: Seconds to wait, or None when absent or unparsable.
+    """
+    value = response.headers.get("retry-after", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that retries transient upstream failures (429, 5xx, network
+    errors) with capped exponential backoff and full jitter, honouring Retry-After.
+    GET/PUT/DELETE are retried freely. POST is retried only when it cannot have
+    been applied (connection never established, or 429), unless the caller marks
+    it safe to repeat with extensions={"idempotent": True}.
+    Attributes:
+        attempts (int): Maximum attempts per request.
+    """
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, attempts: int = RETRY_ATTEMPTS):
+        """
+        Initialize RetryTransport.
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): Wrapped transport (default httpx.AsyncHTTPTransport).
+            attempts (int): Maximum attempts per request (default RETRY_ATTEMPTS).
+        """
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.attempts = max(1, attempts)
+
+    @staticmethod
+    def _repeatable(request: httpx.Request) -> bool:
+        return request.method in IDEMPOTENT_METHODS or bool(request.extensions.get("idempotent"))
+
+    def _retry_reason(self, request: httpx.Request, response: Optional[httpx.Response], error: Optional[Exception]) -> Optional[str]:
+        if error is not None:
+            if self._repeatable(request) or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+                return type(error).__name__
+            return None
+        if response.status_code == 429 or (response.status_code in RETRY_STATUSES and self._repeatable(request)):
+            return str(response.status_code)
+        return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        api_metrics.increment("requests")
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as exc:
+                error = exc
+            reason = self._retry_reason(request, response, error)
+            if reason is None:
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            if response is not None:
+                delay = max(delay, min(retry_after_seconds(response) or 0.0, RETRY_MAX_DELAY * 4))
+            deadline = _deadline.get()
+            if attempt >= self.attempts or (deadline is not None and time.monotonic() + delay > deadline):
+                api_metrics.increment("retries_exhausted" if attempt >= self.attempts else "retries_deadline")
+                if error is not None:
+                    raise error
+                return response
+
+            api_metrics.increment("retries")
+            api_metrics.increment(f"retries.{reason}")
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
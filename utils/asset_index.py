@@ -0,0 +1,147 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Union
+from config import Config
+
+cfg = Config()
+
+# Read size used when hashing files and downloads
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: str) -> str:
+    """
+    SHA-256 of a local file, read in chunks.
+    Args:
+        path (str): File path.
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def perceptual_hash(source: Union[str, bytes]) -> Optional[str]:
+    """
+    64-bit difference hash (dHash) of an image, robust to re-encoding and resizing.
+    Requires Pillow; returns None when it is not installed or the data is not an image.
+    Args:
+        source (Union[str, bytes]): Image file path or raw bytes.
+    Returns:
+        Optional[str]: 16-char hex hash, or None.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+        pixels = list(image.convert("L").resize((9, 8)).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def hamming_distance(a: str, b: str) -> int:
+    """Number of differing bits between two hex hashes."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class AssetFingerprintIndex:
+    """
+    Persistent index of asset fingerprints (SHA-256 and optional perceptual hash) keyed
+    by asset ID, used to find an existing asset before uploading the same file again.
+    Attributes:
+        path (str): JSON file backing the index.
+        assets (Dict[str, Dict[str, Any]]): Fingerprint record per asset ID.
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize AssetFingerprintIndex, loading any saved state.
+        Args:
+            path (Optional[str]): Index file (default <cache_dir>/asset_index.json).
+        """
+        self.path = path or os.path.join(cfg.cache_dir, "asset_index.json")
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self._by_sha256: Dict[str, str] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for asset_id, record in json.load(f).get("assets", {}).items():
+                    self.add(asset_id, record)
+        except (OSError, ValueError):
+            pass
+
+    def add(self, asset_id: Any, record: Dict[str, Any]) -> None:
+        """
+        Store or replace an asset's fingerprint record.
+        Args:
+            asset_id (Any): Asset ID.
+            record (Dict[str, Any]): Must contain 'sha256'; may contain 'phash', 'filename', 'size'.
+        """
+        self.remove(asset_id)
+        self.assets[str(asset_id)] = record
+        self._by_sha256[record["sha256"]] = str(asset_id)
+
+    def remove(self, asset_id: Any) -> None:
+        """
+        Drop an asset from the index.
+        Args:
+            asset_id (Any): Asset ID.
+        """
+        record = self.assets.pop(str(asset_id), None)
+        if record and self._by_sha256.get(record["sha256"]) == str(asset_id):
+            del self._by_sha256[record["sha256"]]
+
+    def find_by_sha256(self, sha256: str) -> Optional[str]:
+        """
+        Look up an asset with identical content.
+        Args:
+            sha256 (str): Hex digest.
+        Returns:
+            Optional[str]: Asset ID, or None.
+        """
+        return self._by_sha256.get(sha256)
+
+    def find_similar(self, phash: str, max_distance: int) -> Optional[str]:
+        """
+        Look up the visually closest asset within a Hamming distance.
+        Args:
+            phash (str): Perceptual hash of the candidate image.
+            max_distance (int): Maximum differing bits (0-64).
+        Returns:
+            Optional[str]: Asset ID, or None.
+        """
+        best, best_distance = None, max_distance + 1
+        for asset_id, record in self.assets.items():
+            if record.get("phash"):
+                distance = hamming_distance(phash, record["phash"])
+                if distance < best_distance:
+                    best, best_distance = asset_id, distance
+        return best
+
+    def save(self) -> None:
+        """
+        Write the index atomically.
+        Raises:
+            OSError: If the index file could not be written.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"assets": self.assets}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
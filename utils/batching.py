@@ -0,0 +1,89 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+
+class MicroBatcher:
+    """
+    Coalesces single-key lookups that arrive within a short window into batched loads.
+    The loader receives up to `max_batch` keys and returns a mapping of key to value;
+    a value that is an Exception is raised to that key's caller only. Keys missing
+    from the mapping resolve to None.
+    Attributes:
+        window (float): Seconds to wait for more keys before flushing.
+        max_batch (int): Keys per loader call; a full batch flushes immediately.
+    """
+    def __init__(
+        self,
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        window: float = 0.005,
+        max_batch: int = 50,
+    ):
+        """
+        Initialize MicroBatcher.
+        Args:
+            loader (Callable): Coroutine function loading a list of keys.
+            window (float): Collection window in seconds (default 5 ms).
+            max_batch (int): Maximum keys per loader call (default 50).
+        """
+        self.loader = loader
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to running loader tasks; the event loop only keeps weak ones
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "loader_calls": 0}
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Queue a key and wait for its value.
+        Args:
+            key (Hashable): Key to load.
+        Returns:
+            Any: The loaded value, or None if the loader did not return the key.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.stats["requests"] += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Hand every pending key to the loader in chunks of max_batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for i in range(0, len(keys), self.max_batch):
+            chunk = {k: pending[k] for k in keys[i:i + self.max_batch]}
+            task = asyncio.ensure_future(self._run(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, chunk: Dict[Hashable, List[asyncio.Future]]) -> None:
+        """Run the loader for one chunk and fan results out to waiting callers."""
+        self.stats["loader_calls"] += 1
+        try:
+            results = await self.loader(list(chunk))
+        except asyncio.CancelledError:
+            for futures in chunk.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as e:
+            results = {key: e for key in chunk}
+        for key, futures in chunk.items():
+            value = results.get(key)
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
@@ -0,0 +1,115 @@
+from bisect import bisect_left
+from typing import Any, Dict, List
+
+# Path segment used for a blok inside a list, e.g. /body/#<_uid>/title
+UID_SEGMENT = "#{}"
+
+
+def _is_blok_list(value: Any) -> bool:
+    """A list whose items are all bloks (dicts carrying a `_uid`)."""
+    return isinstance(value, list) and all(isinstance(v, dict) and "_uid" in v for v in value)
+
+
+def _longest_increasing_subsequence(seq: List[int]) -> List[int]:
+    """Return the indices into seq of one longest strictly increasing subsequence."""
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev: List[int] = [-1] * len(seq)
+    for i, value in enumerate(seq):
+        pos = bisect_left(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tail_idx.append(i)
+        else:
+            tails[pos] = value
+            tail_idx[pos] = i
+        prev[i] = tail_idx[pos - 1] if pos > 0 else -1
+    result: List[int] = []
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        result.append(i)
+        i = prev[i]
+    return result[::-1]
+
+
+def _diff_blok_list(old: List[Dict[str, Any]], new: List[Dict[str, Any]], path: str, patches: List[Dict[str, Any]]) -> None:
+    """Diff two blok lists by `_uid`: deletes, inserts, moves (outside the LIS) and nested updates."""
+    old_pos = {b["_uid"]: i for i, b in enumerate(old)}
+    new_pos = {b["_uid"]: i for i, b in enumerate(new)}
+
+    for i, blok in enumerate(old):
+        if blok["_uid"] not in new_pos:
+            patches.append({
+                "op": "delete", "path": f"{path}/{UID_SEGMENT.format(blok['_uid'])}",
+                "uid": blok["_uid"], "component": blok.get("component"), "from_index": i,
+            })
+
+    common = [b["_uid"] for b in old if b["_uid"] in new_pos]
+    stable = {common[i] for i in _longest_increasing_subsequence([new_pos[uid] for uid in common])}
+
+    for i, blok in enumerate(new):
+        uid = blok["_uid"]
+        blok_path = f"{path}/{UID_SEGMENT.format(uid)}"
+        if uid not in old_pos:
+            patches.append({
+                "op": "insert", "path": blok_path, "uid": uid,
+                "component": blok.get("component"), "index": i, "value": blok,
+            })
+            continue
+        if uid not in stable:
+            patches.append({
+                "op": "move", "path": blok_path, "uid": uid,
+                "component": blok.get("component"), "from_index": old_pos[uid], "index": i,
+            })
+        _diff(old[old_pos[uid]], blok, blok_path, patches)
+
+
+def _diff(old: Any, new: Any, path: str, patches: List[Dict[str, Any]]) -> None:
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                patches.append({"op": "delete", "path": f"{path}/{key}", "old": old[key]})
+        for key, value in new.items():
+            if key not in old:
+                patches.append({"op": "insert", "path": f"{path}/{key}", "value": value})
+            else:
+                _diff(old[key], value, f"{path}/{key}", patches)
+    elif _is_blok_list(old) and _is_blok_list(new):
+        _diff_blok_list(old, new, path, patches)
+    else:
+        patches.append({"op": "update", "path": path or "/", "old": old, "new": new})
+
+
+def diff_bloks(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    Structural diff of two Storyblok content (blok) trees.
+    Child bloks are matched by `_uid`, so reordering yields 'move' patches instead of
+    field-by-field noise; moves are minimal (bloks on a longest increasing subsequence
+    of positions stay put). Other values are compared by key and replaced wholesale
+    when they differ.
+    Args:
+        old (Any): Previous content tree.
+        new (Any): New content tree.
+    Returns:
+        List[Dict[str, Any]]: Patches with 'op' in insert/delete/move/update and a
+        '/'-separated path where '#<uid>' addresses a blok in a list.
+    """
+    patches: List[Dict[str, Any]] = []
+    _diff(old, new, "", patches)
+    return patches
+
+
+def summarize_patches(patches: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count patches per operation.
+    Args:
+        patches (List[Dict[str, Any]]): Output of diff_bloks.
+    Returns:
+        Dict[str, int]: Counts keyed by op.
+    """
+    counts = {"insert": 0, "delete": 0, "move": 0, "update": 0}
+    for patch in patches:
+        counts[patch["op"]] += 1
+    return counts
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small in-memory cache with per-entry expiry and LRU eviction.
+    Attributes:
+        ttl (float): Seconds an entry stays fresh.
+        maxsize (int): Maximum number of entries kept before evicting the oldest.
+    """
+    def __init__(self, ttl: float = 300.0, maxsize: int = 1024):
+        """
+        Initialize TTLCache.
+        Args:
+            ttl (float): Seconds an entry stays fresh (default 300).
+            maxsize (int): Maximum number of entries (default 1024).
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return a fresh cached value, or default if missing or expired.
+        Args:
+            key (Hashable): Cache key.
+            default (Any): Value returned on a miss.
+        Returns:
+            Any: The cached value or default.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+            ttl (Optional[float]): Override for the default TTL.
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one entry, or every entry when no key is given.
+        Args:
+            key (Optional[Hashable]): Key to drop; None clears the cache.
+        """
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def items(self) -> Dict[Hashable, Any]:
+        """
+        Return a snapshot of all fresh entries.
+        Returns:
+            Dict[Hashable, Any]: Mapping of key to cached value.
+        """
+        now = time.monotonic()
+        return {k: v for k, (exp, v) in self._data.items() if exp >= now}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
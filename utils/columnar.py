@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Schema type for dictionary-encoded string columns (stored as uint32 codes)
+STRING = "str"
+
+
+class ColumnStore:
+    """
+    Compact append-only table kept as one typed array per column.
+    Numeric columns use array typecodes ('q' int64, 'd' float64); string columns are
+    dictionary-encoded into uint32 codes. Each column is persisted as a raw binary
+    file next to a small JSON file holding dictionaries and metadata.
+    Attributes:
+        directory (str): Folder holding the column files.
+        schema (Dict[str, str]): Column name -> typecode or STRING.
+        columns (Dict[str, array]): Column data.
+        meta (Dict[str, Any]): Free-form metadata saved with the table.
+    """
+    def __init__(self, directory: str, schema: Dict[str, str]):
+        """
+        Initialize ColumnStore, loading saved data if present and matching the schema.
+        Args:
+            directory (str): Folder holding the column files.
+            schema (Dict[str, str]): Column name -> typecode or STRING.
+        """
+        self.directory = directory
+        self.schema = schema
+        self.meta: Dict[str, Any] = {}
+        self.dictionaries: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        self.columns = {name: array("I" if kind == STRING else kind) for name, kind in self.schema.items()}
+        self.dictionaries = {name: [] for name, kind in self.schema.items() if kind == STRING}
+        self._codes = {name: {} for name in self.dictionaries}
+
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), None)
+        return len(first) if first is not None else 0
+
+    def _encode(self, name: str, value: Any) -> int:
+        value = "" if value is None else str(value)
+        code = self._codes[name].get(value)
+        if code is None:
+            code = self._codes[name][value] = len(self.dictionaries[name])
+            self.dictionaries[name].append(value)
+        return code
+
+    def append(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append rows; missing numeric values are stored as -1 and missing strings as ''.
+        Args:
+            rows (Iterable[Dict[str, Any]]): Rows keyed by column name.
+        Returns:
+            int: Number of rows appended.
+        """
+        count = 0
+        for row in rows:
+            for name, kind in self.schema.items():
+                value = row.get(name)
+                if kind == STRING:
+                    self.columns[name].append(self._encode(name, value))
+                else:
+                    self.columns[name].append(-1 if value is None else value)
+            count += 1
+        return count
+
+    def sort_by(self, name: str) -> None:
+        """
+        Reorder all rows by a numeric column (stable).
+        Args:
+            name (str): Column to sort on.
+        """
+        key = self.columns[name]
+        if all(key[i] <= key[i + 1] for i in range(len(key) - 1)):
+            return
+        order = sorted(range(len(key)), key=key.__getitem__)
+        for column, data in self.columns.items():
+            self.columns[column] = array(data.typecode, (data[i] for i in order))
+
+    def range(self, name: str, low: Optional[float] = None, high: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Row span [start, stop) whose values in a sorted numeric column lie in [low, high].
+        Args:
+            name (str): Column the table is sorted on.
+            low (Optional[float]): Lower bound (None = unbounded).
+            high (Optional[float]): Upper bound (None = unbounded).
+        Returns:
+            Tuple[int, int]: Start and stop row indices.
+        """
+        data = self.columns[name]
+        start = bisect_left(data, low) if low is not None else 0
+        stop = bisect_right(data, high) if high is not None else len(data)
+        return start, stop
+
+    def decode(self, name: str, code: int) -> str:
+        """Value of a dictionary code in a string column."""
+        return self.dictionaries[name][code]
+
+    def code(self, name: str, value: str) -> Optional[int]:
+        """Dictionary code of a string value, or None if the column never held it."""
+        return self._codes[name].get(value)
+
+    def _load(self) -> None:
+        try:
+            with open(os.path.join(self.directory, "table.json"), "r", encoding="utf-8") as f:
+                header = json.load(f)
+            if header.get("schema") != self.schema:
+                return
+            for name, data in self.columns.items():
+                with open(os.path.join(self.directory, f"{name}.bin"), "rb") as f:
+                    data.fromfile(f, header["rows"])
+        except (OSError, ValueError, EOFError, KeyError):
+            self._reset()
+            return
+        self.meta = header.get("meta", {})
+        self.dictionaries = header.get("dictionaries", {})
+        self._codes = {name: {v: i for i, v in enumerate(values)} for name, values in self.dictionaries.items()}
+
+    def save(self) -> None:
+        """Write every column file and then the header, each atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        for name, data in self.columns.items():
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                data.tofile(f)
+            os.replace(tmp, os.path.join(self.directory, f"{name}.bin"))
+        header = {"schema": self.schema, "rows": len(self), "dictionaries": self.dictionaries, "meta": self.meta}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(header, f, separators=(",", ":"))
+        os.replace(tmp, os.path.join(self.directory, "table.json"))
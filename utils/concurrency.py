@@ -0,0 +1,232 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, TypeVar
+import httpx
+
+T = TypeVar("T")
+
+# Default number of workers a single fan-out starts; how many upstream requests
+# actually run at once is decided by the shared adaptive limiter.
+DEFAULT_CONCURRENCY = 16
+
+# Adaptive (AIMD) limit on upstream requests in flight across the whole server
+ADAPTIVE_INITIAL_LIMIT = 4
+ADAPTIVE_MIN_LIMIT = 1
+ADAPTIVE_MAX_LIMIT = 32
+# Multiplicative decrease factor, applied at most once per cooldown
+ADAPTIVE_BACKOFF = 0.5
+ADAPTIVE_COOLDOWN = 1.0
+# A response slower than this multiple of its endpoint's average counts as a spike
+LATENCY_SPIKE_FACTOR = 3.0
+LATENCY_SPIKE_FLOOR = 0.5
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """
+    Split a sequence into consecutive chunks.
+    Args:
+        items (Sequence[T]): Items to split.
+        size (int): Maximum chunk length.
+    Returns:
+        Iterator[List[T]]: Chunks in input order.
+    """
+    for i in range(0, len(items), size):
+        yield list(items[i:i + size])
+
+
+async def gather_bounded(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    limit: int = DEFAULT_CONCURRENCY,
+) -> List[Any]:
+    """
+    Run func(item) for every item with at most `limit` calls in flight.
+    Exceptions are not caught; handle them inside func if partial results are needed.
+    Args:
+        func (Callable[[T], Awaitable[Any]]): Coroutine function applied to each item.
+        items (Iterable[T]): Items to process.
+        limit (int): Maximum concurrent calls (default DEFAULT_CONCURRENCY).
+    Returns:
+        List[Any]: Results in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(item: T) -> Any:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+
+async def stream_bounded(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    limit: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """
+    Like gather_bounded, but pulls items lazily and keeps no results, so very large
+    iterables (e.g. rows streamed from a file) are processed in constant memory.
+    Exceptions are not caught; handle them inside func.
+    Args:
+        func (Callable[[T], Awaitable[Any]]): Coroutine function applied to each item.
+        items (Iterable[T]): Items to process; consumed lazily.
+        limit (int): Maximum concurrent calls (default DEFAULT_CONCURRENCY).
+    Returns:
+        int: Number of items processed.
+    """
+    in_flight: Set[asyncio.Task] = set()
+    count = 0
+    try:
+        for item in items:
+            if len(in_flight) >= max(1, limit):
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            in_flight.add(asyncio.ensure_future(func(item)))
+            count += 1
+        if in_flight:
+            done, _ = await asyncio.wait(in_flight)
+            in_flight = set()
+            for task in done:
+                task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+    return count
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: each healthy completion raises the limit by 1/limit
+    (about +1 per round trip of the whole window), and a 429, 5xx, network error
+    or latency spike halves it, at most once per cooldown.
+    Attributes:
+        limit (float): Current limit; floor(limit) requests may be in flight.
+        in_flight (int): Requests currently holding a slot.
+    """
+    def __init__(
+        self,
+        initial: float = ADAPTIVE_INITIAL_LIMIT,
+        minimum: float = ADAPTIVE_MIN_LIMIT,
+        maximum: float = ADAPTIVE_MAX_LIMIT,
+    ):
+        """
+        Initialize AdaptiveLimiter.
+        Args:
+            initial (float): Starting limit.
+            minimum (float): Lowest limit.
+            maximum (float): Highest limit.
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.peak = float(initial)
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # slot was handed over just as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand free capacity to waiters in FIFO order."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self) -> None:
+        """Additive increase after a healthy response."""
+        if self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.peak = max(self.peak, self.limit)
+            self.increases += 1
+            self._wake()
+
+    def on_overload(self) -> None:
+        """Multiplicative decrease after a throttle, error or latency spike."""
+        now = time.monotonic()
+        if now - self._last_decrease < ADAPTIVE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * ADAPTIVE_BACKOFF)
+        self.decreases += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit, usage and adjustment counts."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "peak_limit": round(self.peak, 2),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+adaptive_limiter = AdaptiveLimiter()
+
+
+class AdaptiveLimitTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that runs every upstream request under the shared adaptive
+    limiter, feeding it each outcome: 429/5xx, network errors and responses
+    slower than LATENCY_SPIKE_FACTOR x their host-and-path-prefix average shrink
+    the limit; other responses grow it.
+    """
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, limiter: AdaptiveLimiter = adaptive_limiter):
+        """
+        Initialize AdaptiveLimitTransport.
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): Wrapped transport (default httpx.AsyncHTTPTransport).
+            limiter (AdaptiveLimiter): Limiter to use (default the shared one).
+        """
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.limiter = limiter
+        self._average: Dict[str, float] = {}
+
+    def _spike(self, request: httpx.Request, seconds: float) -> bool:
+        key = request.method + " " + "/".join(request.url.path.split("/")[:5])
+        average = self._average.get(key)
+        self._average[key] = seconds if average is None else 0.9 * average + 0.1 * seconds
+        return average is not None and seconds > LATENCY_SPIKE_FLOOR and seconds > LATENCY_SPIKE_FACTOR * average
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.limiter.on_overload()
+            raise
+        finally:
+            self.limiter.release()
+        if response.status_code == 429 or response.status_code >= 500 or self._spike(request, time.monotonic() - started):
+            self.limiter.on_overload()
+        else:
+            self.limiter.on_success()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp as returned by the Management API.
+    Accepts a trailing 'Z', an offset, or no zone (treated as UTC), and plain dates.
+    Args:
+        value (Optional[str]): Timestamp string.
+    Returns:
+        Optional[datetime]: Timezone-aware datetime, or None if empty or invalid.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_timestamp(value: datetime) -> str:
+    """
+    Format an aware datetime as the API's UTC form, e.g. '2025-06-20T15:30:00.000Z'.
+    Args:
+        value (datetime): Timezone-aware datetime.
+    Returns:
+        str: ISO 8601 string in UTC.
+    """
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
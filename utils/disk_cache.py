@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+from config import Config
+
+cfg = Config()
+
+
+class JSONDiskCache:
+    """
+    Persistent key/value store of JSON documents, one file per key.
+    Intended for immutable data (e.g. story version content), so entries never expire.
+    Attributes:
+        directory (str): Folder holding this cache's files.
+    """
+    def __init__(self, namespace: str):
+        """
+        Initialize JSONDiskCache.
+        Args:
+            namespace (str): Sub-folder of the configured cache directory.
+        """
+        self.directory = os.path.join(cfg.cache_dir, namespace)
+
+    def _path(self, key: Any) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(key))
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def get(self, key: Any) -> Optional[Any]:
+        """
+        Read a cached document.
+        Args:
+            key (Any): Cache key.
+        Returns:
+            Optional[Any]: The stored document, or None if missing or unreadable.
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, key: Any, value: Any) -> None:
+        """
+        Store a document atomically.
+        Args:
+            key (Any): Cache key.
+            value (Any): JSON-serialisable document.
+        Raises:
+            OSError, TypeError, ValueError: If the document could not be serialised or written.
+        """
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except (OSError, TypeError, ValueError):
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def set(self, key: Any, value: Any) -> None:
+        """
+        Store a document atomically. Write failures are ignored; the cache is best-effort.
+        Args:
+            key (Any): Cache key.
+            value (Any): JSON-serialisable document.
+        """
+        try:
+            self.write(key, value)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def __contains__(self, key: Any) -> bool:
+        return os.path.exists(self._path(key))
+
+
+class JSONLJournal:
+    """
+    Append-only journal of per-key state records (one JSON object per line).
+    Replaying the file yields the latest record for every key, which makes long
+    batch operations resumable without rewriting a large manifest on each change.
+    Attributes:
+        path (str): Journal file location.
+        state (Dict[str, Dict[str, Any]]): Latest record per key.
+    """
+    def __init__(self, path: str):
+        """
+        Initialize JSONLJournal and replay any existing records.
+        Args:
+            path (str): Journal file location.
+        """
+        self.path = path
+        self.state: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line after an interruption
+                    self.state.setdefault(record["key"], {}).update(record)
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest record for a key.
+        Args:
+            key (str): Record key.
+        Returns:
+            Optional[Dict[str, Any]]: Merged record, or None.
+        """
+        return self.state.get(key)
+
+    def record(self, key: str, **fields: Any) -> None:
+        """
+        Merge fields into a key's record and append them to the journal.
+        Args:
+            key (str): Record key.
+            **fields (Any): JSON-serialisable fields to store.
+        """
+        entry = {"key": key, **fields}
+        self.state.setdefault(key, {}).update(entry)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
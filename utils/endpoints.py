@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from typing import List, Optional
+from urllib.parse import urlsplit
+import httpx
+from config import Config, REGION_ENDPOINTS
+
+cfg = Config()
+
+# Region assumed until detection has run
+DEFAULT_REGION = "eu"
+
+# Timeout for each region probe during detection
+PROBE_TIMEOUT = 10.0
+
+
+def guess_region(space_id: str) -> str:
+    """
+    First guess of a space's region from its ID, used to order detection probes.
+    Legacy US spaces were allocated IDs between 1,000,000 and 2,000,000; anything
+    else starts with the default region and is confirmed by probing.
+    Args:
+        space_id (str): Storyblok space ID.
+    Returns:
+        str: Region code.
+    """
+    try:
+        number = int(space_id)
+    except (TypeError, ValueError):
+        return DEFAULT_REGION
+    return "us" if 1_000_000 <= number < 2_000_000 else DEFAULT_REGION
+
+
+class EndpointResolver:
+    """
+    Resolves the regional API hosts for the configured space and builds every
+    Storyblok URL, so requests go to the API host of the space's own region.
+    The region comes from STORYBLOK_REGION when set, otherwise from a one-time
+    probe of the Management API whose result is cached on disk.
+    Attributes:
+        region (str): Active region code.
+        detected (bool): True once the region is pinned, cached or confirmed by a probe.
+        path (str): File holding the detected region.
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize EndpointResolver from the pinned or cached region, else the ID guess.
+        Args:
+            path (Optional[str]): Region cache file (default <cache_dir>/region.json).
+        """
+        self.path = path or os.path.join(cfg.cache_dir, "region.json")
+        self.region = guess_region(cfg.space_id)
+        self.detected = False
+        if cfg.region:
+            self.region, self.detected = cfg.region, True
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("space_id") == str(cfg.space_id) and cached.get("region") in REGION_ENDPOINTS:
+                self.region, self.detected = cached["region"], True
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def base(self, api: str = "MANAGEMENT") -> str:
+        """
+        Base URL of an API in the active region.
+        Args:
+            api (str): 'MANAGEMENT' or 'DELIVERY'.
+        Returns:
+            str: Base URL without trailing slash.
+        """
+        return REGION_ENDPOINTS[self.region][api]
+
+    def host(self, api: str = "MANAGEMENT") -> str:
+        """Scheme and host of an API in the active region, e.g. 'https://mapi.storyblok.com'."""
+        parts = urlsplit(self.base(api))
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def url(self, path: str, api: str = "MANAGEMENT", space_scoped: bool = True) -> str:
+        """
+        Build a full URL in the active region.
+        Args:
+            path (str): API path (e.g. '/stories', or '/org_apps' when not space-scoped).
+            api (str): 'MANAGEMENT' or 'DELIVERY'.
+            space_scoped (bool): Prefix Management paths with /spaces/<space_id>.
+        Returns:
+            str: Full URL.
+        """
+        if api == "MANAGEMENT" and space_scoped:
+            return f"{self.base(api)}/spaces/{cfg.space_id}{path}"
+        return f"{self.base(api)}{path}"
+
+    def _probe_order(self) -> List[str]:
+        guess = guess_region(cfg.space_id)
+        return [guess] + [region for region in REGION_ENDPOINTS if region != guess]
+
+    async def detect(self, client: httpx.AsyncClient, refresh: bool = False) -> str:
+        """
+        Find the space's region by requesting the space from each regional
+        Management API, starting with the guessed one; the first success wins and
+        is cached. Network failures keep the current region.
+        Args:
+            client (httpx.AsyncClient): HTTP client to use.
+            refresh (bool): Probe again even if the region is already known.
+        Returns:
+            str: Active region code.
+        """
+        if self.detected and not refresh:
+            return self.region
+        if cfg.region:
+            return self.region
+        for region in self._probe_order():
+            url = f"{REGION_ENDPOINTS[region]['MANAGEMENT']}/spaces/{cfg.space_id}"
+            try:
+                resp = await client.get(url, headers={"Authorization": cfg.management_token}, timeout=PROBE_TIMEOUT)
+            except httpx.HTTPError:
+                continue
+            if resp.is_success:
+                self.region, self.detected = region, True
+                self._save()
+                break
+        return self.region
+
+    def _save(self) -> None:
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"space_id": str(cfg.space_id), "region": self.region}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+
+endpoints = EndpointResolver()
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Set
+import httpx
+from utils.api import api_metrics
+from utils.resilience import endpoint_class
+
+# Latency samples kept per endpoint class
+LATENCY_WINDOW = 200
+# Samples needed before an endpoint class is hedged
+HEDGE_MIN_SAMPLES = 20
+# Lower bound on the hedge delay, so fast endpoints are never hedged on noise
+HEDGE_MIN_DELAY = 0.05
+# Maximum hedged requests as a share of all GETs
+HEDGE_BUDGET = 0.05
+
+
+def usable(task: asyncio.Task) -> bool:
+    """Whether a finished request copy produced a response worth returning (not 5xx or 429)."""
+    if task.exception() is not None:
+        return False
+    status = task.result().status_code
+    return status < 500 and status != 429
+
+
+class LatencyTracker:
+    """
+    Sliding window of response latencies for one endpoint class.
+    Attributes:
+        samples (deque): Most recent latencies in seconds.
+    """
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """
+        Initialize LatencyTracker.
+        Args:
+            window (int): Samples kept (default LATENCY_WINDOW).
+        """
+        self.samples: deque = deque(maxlen=window)
+        self._sorted: Optional[list] = None
+
+    def add(self, seconds: float) -> None:
+        """Record one latency."""
+        self.samples.append(seconds)
+        self._sorted = None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency at quantile q (0-1) of the window, or None without samples.
+        Args:
+            q (float): Quantile, e.g. 0.95.
+        Returns:
+            Optional[float]: Latency in seconds.
+        """
+        if not self.samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (the p95), or None while samples are too few."""
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, self.percentile(0.95))
+
+
+class HedgingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that hedges slow GETs: when no response has arrived by the
+    endpoint class's observed p95, an identical request is sent and whichever
+    answers first is used. Hedges are capped at HEDGE_BUDGET of all GETs. Pass
+    extensions={"hedge": False} to opt a request out. Latency is always that of the
+    original request: when a hedge wins, the original is left to finish in the
+    background so the tracked p95 is not pulled down by hedge wins.
+    Attributes:
+        trackers (Dict[str, LatencyTracker]): Latency window per endpoint class.
+    """
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, budget: float = HEDGE_BUDGET):
+        """
+        Initialize HedgingTransport.
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): Wrapped transport (default httpx.AsyncHTTPTransport).
+            budget (float): Maximum share of GETs that may be hedged (default HEDGE_BUDGET).
+        """
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.budget = budget
+        self.trackers: Dict[str, LatencyTracker] = {}
+        self.requests = 0
+        self.hedges = 0
+        # Originals outrun by their hedge, still running so their latency is recorded
+        self._draining: Set[asyncio.Task] = set()
+
+    def tracker(self, name: str) -> LatencyTracker:
+        """Latency tracker for an endpoint class, created on first use."""
+        if name not in self.trackers:
+            self.trackers[name] = LatencyTracker()
+        return self.trackers[name]
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def _drain(self, task: asyncio.Task, tracker: LatencyTracker, started: float) -> None:
+        """Wait for an original request that lost to its hedge, record its latency and close it."""
+        try:
+            response = await task
+        except Exception:
+            return
+        tracker.add(time.monotonic() - started)
+        await response.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or request.extensions.get("hedge") is False:
+            return await self._send(request)
+        tracker = self.tracker(endpoint_class(request))
+        delay = tracker.hedge_delay()
+        self.requests += 1
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(self._send(request))]
+        winner = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.hedges + 1 <= self.budget * self.requests:
+                    self.hedges += 1
+                    api_metrics.increment("hedges")
+                    tasks.append(asyncio.ensure_future(self._send(request)))
+                elif not done:
+                    api_metrics.increment("hedges_over_budget")
+            pending = set(tasks)
+            while winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if usable(task)]
+                if succeeded:
+                    winner = succeeded[0]
+                elif not pending:
+                    # every copy failed; surface an error response over an exception, the original's first
+                    answered = [task for task in tasks if task.exception() is None]
+                    winner = answered[0] if answered else tasks[0]
+            response = winner.result()
+            if winner is tasks[0]:
+                tracker.add(time.monotonic() - started)
+            else:
+                api_metrics.increment("hedge_wins")
+            return response
+        finally:
+            for index, task in enumerate(tasks):
+                if task is winner:
+                    continue
+                if index == 0 and winner is not None and not task.done():
+                    drain = asyncio.ensure_future(self._drain(task, tracker, started))
+                    self._draining.add(drain)
+                    drain.add_done_callback(self._draining.discard)
+                elif not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    if index == 0:
+                        tracker.add(time.monotonic() - started)
+                    await task.result().aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """p50/p95 per endpoint class plus hedge budget usage."""
+        return {
+            "latency_ms": {
+                name: {
+                    "samples": len(t.samples),
+                    "p50": round(t.percentile(0.5) * 1000),
+                    "p95": round(t.percentile(0.95) * 1000),
+                }
+                for name, t in sorted(self.trackers.items()) if t.samples
+            },
+            "hedged_share": round(self.hedges / self.requests, 4) if self.requests else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        for task in list(self._draining):
+            task.cancel()
+        await self._transport.aclose()
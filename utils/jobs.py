@@ -0,0 +1,386 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+import anyio
+from config import Config
+from utils.api import APIError, call_deadline
+
+cfg = Config()
+
+T = TypeVar("T")
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED, INTERRUPTED = (
+    "queued", "running", "completed", "failed", "cancelled", "interrupted"
+)
+FINISHED_STATES = {COMPLETED, FAILED, CANCELLED, INTERRUPTED}
+
+# Finished jobs kept on disk before the oldest are pruned
+MAX_STORED_JOBS = 100
+# Minimum seconds between status writes and progress notifications while running
+PROGRESS_INTERVAL = 1.0
+# Default and maximum results returned per get_job_results page
+JOB_RESULTS_PAGE_SIZE = 100
+MAX_JOB_RESULTS_PAGE_SIZE = 1000
+
+
+class Job:
+    """
+    A long-running tool invocation executed in the background. Status is saved
+    to <dir>/<id>.json and each per-item result is appended to <dir>/<id>.jsonl
+    as soon as it is known, so a client can page through results while the job
+    runs or after reconnecting.
+    Attributes:
+        id (str): Job ID.
+        tool (str): Name of the tool that started the job.
+        status (str): queued, running, completed, failed, cancelled or interrupted.
+        done (int): Items processed so far.
+        total (int): Items to process.
+        succeeded (int): Items that succeeded.
+        failed (int): Items that failed.
+        summary (Optional[Dict[str, Any]]): Final tool result, without the per-item list.
+        error (Optional[str]): Failure reason.
+    """
+    def __init__(self, directory: str, tool: str, total: int, job_id: Optional[str] = None):
+        """
+        Initialize Job.
+        Args:
+            directory (str): Folder holding job files.
+            tool (str): Tool that started the job.
+            total (int): Items to process.
+            job_id (Optional[str]): Existing ID when loading from disk.
+        """
+        self.directory = directory
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.tool = tool
+        self.status = QUEUED
+        self.done = 0
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.message = ""
+        self.summary: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.session: Any = None
+        self._last_flush = 0.0
+
+    @property
+    def status_path(self) -> str:
+        return os.path.join(self.directory, f"{self.id}.json")
+
+    @property
+    def results_path(self) -> str:
+        return os.path.join(self.directory, f"{self.id}.jsonl")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status fields as saved and returned by get_job_status."""
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "message": self.message,
+            "summary": self.summary,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Job"]:
+        """Read a saved job; jobs that were running when the server stopped become interrupted."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        job = cls(os.path.dirname(path), data.get("tool", ""), data.get("total", 0), data.get("job_id"))
+        for key in ("status", "done", "succeeded", "failed", "message", "summary", "error",
+                    "created_at", "updated_at", "finished_at"):
+            setattr(job, key, data.get(key, getattr(job, key)))
+        if job.status not in FINISHED_STATES:
+            job.status = INTERRUPTED
+        return job
+
+    def save(self) -> None:
+        """Write the status file atomically."""
+        self.updated_at = time.time()
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, self.status_path)
+
+    def add_result(self, result: Dict[str, Any]) -> None:
+        """
+        Append one per-item result and count it.
+        Args:
+            result (Dict[str, Any]): Item result; status 'success' counts as succeeded.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.results_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, separators=(",", ":"), default=str) + "\n")
+        self.done += 1
+        if result.get("status") == "success":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def results(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Read a page of saved results.
+        Args:
+            offset (int): Results to skip.
+            limit (int): Maximum results returned.
+        Returns:
+            List[Dict[str, Any]]: Results in completion order.
+        """
+        try:
+            with open(self.results_path, "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in islice(f, offset, offset + limit) if line.strip()]
+        except OSError:
+            return []
+
+    async def progress(self, message: str = "", force: bool = False) -> None:
+        """
+        Save status and send a progress log notification, throttled to PROGRESS_INTERVAL.
+        Args:
+            message (str): Short progress text.
+            force (bool): Skip throttling (used for state changes).
+        """
+        self.message = message or self.message
+        now = time.monotonic()
+        if not force and now - self._last_flush < PROGRESS_INTERVAL:
+            return
+        self._last_flush = now
+        self.save()
+        if self.session is not None:
+            try:
+                await self.session.send_log_message(
+                    level="info",
+                    data={"job_id": self.id, "status": self.status, "done": self.done,
+                          "total": self.total, "message": self.message},
+                    logger="storyblok.jobs",
+                )
+            except Exception:
+                self.session = None  # client went away; status stays available on disk
+
+
+class JobManager:
+    """
+    Starts background jobs and finds them again, in memory or on disk.
+    Attributes:
+        directory (str): Folder holding job files.
+        jobs (Dict[str, Job]): Jobs known to this process.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize JobManager.
+        Args:
+            directory (Optional[str]): Job folder (default <cache_dir>/jobs).
+        """
+        self.directory = directory or os.path.join(cfg.cache_dir, "jobs")
+        self.jobs: Dict[str, Job] = {}
+
+    def start(
+        self,
+        tool: str,
+        runner: Callable[[Job], Awaitable[Dict[str, Any]]],
+        total: int,
+        ctx: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        Run runner(job) in the background and return the job's status at once.
+        The runner records per-item results on the job and returns the final summary.
+        Args:
+            tool (str): Name of the tool being run.
+            runner (Callable[[Job], Awaitable[Dict[str, Any]]]): Job body.
+            total (int): Items to process.
+            ctx (Any): MCP Context of the starting call; progress is sent to its session.
+        Returns:
+            Dict[str, Any]: Initial job status, including job_id.
+        """
+        self._prune()
+        job = Job(self.directory, tool, total)
+        if ctx is not None:
+            try:
+                job.session = ctx.session
+            except ValueError:
+                pass  # no active request context (e.g. called outside MCP)
+        job.save()
+        self.jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, runner))
+        return job.to_dict()
+
+    async def _run(self, job: Job, runner: Callable[[Job], Awaitable[Dict[str, Any]]]) -> None:
+        job.status = RUNNING
+        await job.progress("started", force=True)
+        try:
+            with call_deadline(None):
+                job.summary = await runner(job)
+            job.status = COMPLETED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            job.status, job.error = FAILED, str(e)
+        job.finished_at = time.time()
+        job.task = None
+        await job.progress(job.status, force=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Find a job by ID, loading it from disk if it ran in an earlier process.
+        Args:
+            job_id (str): Job ID.
+        Returns:
+            Optional[Job]: The job, or None.
+        """
+        if job_id in self.jobs:
+            return self.jobs[job_id]
+        safe = "".join(c for c in job_id if c.isalnum())
+        job = Job.load(os.path.join(self.directory, f"{safe}.json"))
+        if job is None or job.id != job_id:
+            return None  # a record found under the sanitized name belongs to another ID
+        self.jobs[job.id] = job
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a running job.
+        Args:
+            job_id (str): Job ID.
+        Returns:
+            bool: True if the job was running and has been asked to stop.
+        """
+        job = self.get(job_id)
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        return True
+
+    def _prune(self) -> None:
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".json")]
+        except OSError:
+            return
+        finished = []
+        for name in names:
+            job = self.jobs.get(name[:-5]) or Job.load(os.path.join(self.directory, name))
+            if job is not None and job.status in FINISHED_STATES and (job.task is None or job.task.done()):
+                finished.append((job.updated_at, job.id))
+        for _, job_id in sorted(finished)[:max(0, len(finished) - MAX_STORED_JOBS + 1)]:
+            for suffix in (".json", ".jsonl"):
+                try:
+                    os.remove(os.path.join(self.directory, job_id + suffix))
+                except OSError:
+                    pass
+            self.jobs.pop(job_id, None)
+
+
+job_manager = JobManager()
+
+
+async def run_bulk(
+    items: Iterable[T],
+    apply: Callable[[T], Awaitable[Dict[str, Any]]],
+    job: Optional[Job] = None,
+    on_cancel: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Apply an operation to each item in order and collect per-item results in the
+    shape bulk tools return. An APIError escaping apply is recorded as that item's
+    failure. With a job, results go to the job's file instead of the summary.
+    If the call is cancelled, the partial summary (what was already applied, the
+    item in flight, if any, and how many were never started) is stored on the job
+    or passed to on_cancel, and the cancellation is re-raised.
+    Args:
+        items (Iterable[T]): Items to process.
+        apply (Callable[[T], Awaitable[Dict[str, Any]]]): Returns a result with a 'status' field.
+        job (Optional[Job]): Background job to report to.
+        on_cancel (Optional[Callable[[Dict[str, Any]], Awaitable[None]]]): Receives the
+            partial summary of a cancelled foreground run.
+    Returns:
+        Dict[str, Any]: total_processed, successful_operations, failed_operations and,
+            without a job, results.
+    """
+    items = list(items)
+    results: List[Dict[str, Any]] = []
+    success = fail = 0
+
+    def summarize() -> Dict[str, Any]:
+        summary = {"total_processed": success + fail, "successful_operations": success, "failed_operations": fail}
+        if job is None:
+            summary["results"] = results
+        return summary
+
+    # Index of the item being applied; None once its result is counted
+    in_flight: Optional[int] = None
+    index = -1
+    try:
+        for index, item in enumerate(items):
+            in_flight = index
+            try:
+                result = await apply(item)
+            except APIError as e:
+                result = {"item": item, "status": "error", "error": str(e)}
+            if result.get("status") == "success":
+                success += 1
+            else:
+                fail += 1
+            in_flight = None
+            if job is not None:
+                job.add_result(result)
+                await job.progress(f"{job.done}/{job.total} processed")
+            else:
+                results.append(result)
+    except asyncio.CancelledError:
+        summary = {**summarize(), "cancelled": True, "not_started": len(items) - index - 1}
+        if in_flight is not None:
+            summary["interrupted_item"] = items[in_flight]
+        if job is not None:
+            job.summary = {k: v for k, v in summary.items() if k != "results"}
+        elif on_cancel is not None:
+            with anyio.CancelScope(shield=True):
+                await on_cancel(summary)
+        raise
+    return summarize()
+
+
+async def record_cancelled_call(tool: str, summary: Dict[str, Any], ctx: Any = None) -> None:
+    """
+    Keep the partial outcome of a cancelled foreground call. MCP has already
+    answered the call with a cancellation error, so the outcome is saved as a
+    cancelled job (readable with get_job_status / get_job_results) and announced
+    with a log notification.
+    Args:
+        tool (str): Tool that was cancelled.
+        summary (Dict[str, Any]): Partial summary from run_bulk, including results.
+        ctx (Any): MCP Context of the cancelled call.
+    """
+    results = summary.get("results", [])
+    total = summary["total_processed"] + summary.get("not_started", 0) + ("interrupted_item" in summary)
+    job = Job(job_manager.directory, tool, total)
+    for result in results:
+        job.add_result(result)
+    job.status = CANCELLED
+    job.summary = {k: v for k, v in summary.items() if k != "results"}
+    job.finished_at = time.time()
+    job_manager.jobs[job.id] = job
+    if ctx is not None:
+        try:
+            job.session = ctx.session
+        except ValueError:
+            pass
+    await job.progress("cancelled by client", force=True)
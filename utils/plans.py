@@ -0,0 +1,167 @@
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from utils.blok_diff import diff_bloks, summarize_patches
+from utils.disk_cache import JSONDiskCache
+
+# Seconds a plan can be applied after it was computed; older plans must be recomputed
+PLAN_TTL = 3600
+# Per-story changes returned inline with a new plan; the rest is paged with get_plan
+PLAN_PREVIEW_SIZE = 50
+MAX_PLAN_PAGE_SIZE = 1000
+# Content patch paths listed per story in a plan
+MAX_PATCH_PATHS = 10
+
+PENDING, APPLIED = "pending", "applied"
+
+
+class PlanError(Exception):
+    """A plan could not be stored."""
+
+
+def story_field_diff(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields of an update that would change a story. 'content' is compared blok by blok,
+    other fields by value.
+    Args:
+        current (Dict[str, Any]): Story as returned by the Management API.
+        update (Dict[str, Any]): Fields to write (without 'id').
+    Returns:
+        Dict[str, Any]: 'changed' (the subset of update that differs) and 'diff'
+            ({field: {"from", "to"}} plus a patch summary for content); both empty for a no-op.
+    """
+    changed: Dict[str, Any] = {}
+    diff: Dict[str, Any] = {}
+    for field, value in update.items():
+        if field == "content":
+            patches = diff_bloks(current.get("content") or {}, value)
+            if patches:
+                changed[field] = value
+                diff[field] = {
+                    "patches": summarize_patches(patches),
+                    "paths": [p["path"] for p in patches[:MAX_PATCH_PATHS]],
+                }
+        elif current.get(field) != value:
+            changed[field] = value
+            diff[field] = {"from": current.get(field), "to": value}
+    return {"changed": changed, "diff": diff}
+
+
+class PlanStore:
+    """
+    Dry-run plans of bulk mutations, kept on disk so they can be applied later by ID.
+    A plan holds the exact write operations computed at planning time, a per-story
+    change list for review, and is applied at most once before PLAN_TTL expires.
+    Attributes:
+        cache (JSONDiskCache): Plan documents keyed by plan ID.
+        ttl (float): Seconds a plan stays applicable.
+    """
+    def __init__(self, namespace: str = "plans", ttl: float = PLAN_TTL):
+        """
+        Initialize PlanStore.
+        Args:
+            namespace (str): Sub-folder of the cache directory (default 'plans').
+            ttl (float): Seconds a plan stays applicable (default PLAN_TTL).
+        """
+        self.cache = JSONDiskCache(namespace)
+        self.ttl = ttl
+
+    def create(
+        self,
+        tool: str,
+        operations: List[Dict[str, Any]],
+        changes: List[Dict[str, Any]],
+        summary: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store a new plan and return its compact view.
+        Args:
+            tool (str): Bulk tool the plan belongs to (decides how it is applied).
+            operations (List[Dict[str, Any]]): Write payloads, applied as-is.
+            changes (List[Dict[str, Any]]): Per-story diffs for review.
+            summary (Dict[str, Any]): Counts (changed, unchanged, not found...).
+            options (Optional[Dict[str, Any]]): Tool settings reused when applying.
+        Returns:
+            Dict[str, Any]: Plan ID, expiry, summary and the first PLAN_PREVIEW_SIZE changes.
+        Raises:
+            PlanError: If the plan could not be written.
+        """
+        self._prune()
+        now = time.time()
+        plan = {
+            "plan_id": uuid.uuid4().hex[:12],
+            "tool": tool,
+            "status": PENDING,
+            "created_at": now,
+            "expires_at": now + self.ttl,
+            "summary": summary,
+            "options": options or {},
+            "changes": changes,
+            "operations": operations,
+        }
+        self.save(plan)
+        return self.view(plan, 0, PLAN_PREVIEW_SIZE)
+
+    def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """Stored plan, or None if unknown."""
+        plan = self.cache.get(plan_id)
+        return plan if isinstance(plan, dict) and plan.get("plan_id") == plan_id else None
+
+    def save(self, plan: Dict[str, Any]) -> None:
+        """
+        Persist a plan.
+        Raises:
+            PlanError: If the plan could not be written.
+        """
+        try:
+            self.cache.write(plan["plan_id"], plan)
+        except (OSError, TypeError, ValueError) as e:
+            raise PlanError(f"Could not store plan {plan['plan_id']}: {e}")
+
+    @staticmethod
+    def expired(plan: Dict[str, Any]) -> bool:
+        return time.time() > plan["expires_at"]
+
+    @staticmethod
+    def view(plan: Dict[str, Any], offset: int, limit: int) -> Dict[str, Any]:
+        """
+        Compact view of a plan: everything but the write payloads, with a page of changes.
+        Args:
+            plan (Dict[str, Any]): Stored plan.
+            offset (int): First change returned.
+            limit (int): Maximum changes returned.
+        Returns:
+            Dict[str, Any]: Plan metadata, summary and changes[offset:offset+limit].
+        """
+        changes = plan["changes"][offset:offset + limit]
+        return {
+            "plan_id": plan["plan_id"],
+            "tool": plan["tool"],
+            "status": plan["status"],
+            "expires_in_seconds": max(0, round(plan["expires_at"] - time.time())),
+            "summary": plan["summary"],
+            "changes": changes,
+            "next_offset": offset + len(changes) if offset + len(changes) < len(plan["changes"]) else None,
+        }
+
+    def _prune(self) -> None:
+        """Remove plan files past their expiry."""
+        try:
+            names = os.listdir(self.cache.directory)
+        except OSError:
+            return
+        now = time.time()
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            plan = self.cache.get(name[:-len(".json")])
+            if not isinstance(plan, dict) or now > plan.get("expires_at", 0):
+                try:
+                    os.remove(os.path.join(self.cache.directory, name))
+                except OSError:
+                    pass
+
+
+plan_store = PlanStore()
@@ -0,0 +1,257 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from config import REGION_ENDPOINTS
+from utils.api import api_metrics
+
+# Consecutive failures (after retries) that open an endpoint class's breaker
+BREAKER_FAILURE_THRESHOLD = 5
+# Seconds a breaker stays open before a single probe request is let through
+BREAKER_RESET_TIMEOUT = 30.0
+# Budget for last-known-good GET bodies kept for stale-on-error serving
+STALE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+STALE_ENTRY_MAX_BYTES = 2 * 1024 * 1024
+# Headers worth replaying with a stale body (pagination and encoding)
+STALE_HEADERS = ("content-type", "content-encoding", "total", "per-page")
+# Hosts of the Management and Delivery APIs in every region; other hosts (asset CDN, S3) pass through
+API_HOSTS = {urlsplit(base).hostname for region in REGION_ENDPOINTS.values() for base in region.values()}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def endpoint_class(request: httpx.Request) -> str:
+    """
+    Group a request by API and top-level resource, e.g. 'mapi:stories' or 'cdn:links'.
+    Args:
+        request (httpx.Request): Outgoing request.
+    Returns:
+        str: Endpoint class name.
+    """
+    segments = [s for s in request.url.path.split("/") if s]
+    api = "cdn" if "cdn" in segments[:3] else "mapi"
+    segments = [s for s in segments if s not in ("v1", "v2", "cdn")]
+    if len(segments) >= 3 and segments[0] == "spaces" and segments[1].isdigit():
+        return f"{api}:{segments[2]}"
+    return f"{api}:{segments[0] if segments else ''}"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Closed: requests flow. Open: requests fail
+    fast until reset_timeout has passed. Half-open: one probe decides whether to
+    close again or re-open.
+    Attributes:
+        state (str): CLOSED, OPEN or HALF_OPEN.
+        failures (int): Consecutive failures seen.
+        opened_at (float): Monotonic time the breaker last opened.
+    """
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        """
+        Initialize CircuitBreaker.
+        Args:
+            threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds open before a probe is allowed.
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; in half-open state only one probe at a time."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed."""
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.state, self.failures, self._probing = CLOSED, 0, False
+
+    def record_failure(self) -> None:
+        """Count a failure; open on threshold or when a probe fails."""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            if self.state != OPEN:
+                api_metrics.increment("breaker_opened")
+            self.state, self.opened_at = OPEN, time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """Give up a probe that never completed (e.g. the call was cancelled)."""
+        self._probing = False
+
+
+class StaleCache:
+    """
+    LRU store of last-known-good GET responses, bounded by total body size.
+    Attributes:
+        max_bytes (int): Total body bytes kept.
+    """
+    def __init__(self, max_bytes: int = STALE_CACHE_MAX_BYTES):
+        """
+        Initialize StaleCache.
+        Args:
+            max_bytes (int): Total body bytes kept (default STALE_CACHE_MAX_BYTES).
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, str], bytes]]" = OrderedDict()
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        """Cache key: the URL without the Delivery API cache version."""
+        params = [(k, v) for k, v in request.url.params.multi_items() if k != "cv"]
+        return str(request.url.copy_with(params=params))
+
+    def set(self, request: httpx.Request, headers: httpx.Headers, body: bytes) -> None:
+        """Store a successful raw response body."""
+        if len(body) > STALE_ENTRY_MAX_BYTES:
+            return
+        key = self.key(request)
+        self.invalidate(key)
+        kept = {name: headers[name] for name in STALE_HEADERS if name in headers}
+        self._data[key] = (time.time(), kept, body)
+        self.size += len(body)
+        while self.size > self.max_bytes and self._data:
+            _, (_, _, old) = self._data.popitem(last=False)
+            self.size -= len(old)
+
+    def get(self, request: httpx.Request) -> Optional[Tuple[float, Dict[str, str], bytes]]:
+        """Stored (saved_at, headers, raw body) for a request, or None."""
+        entry = self._data.get(self.key(request))
+        if entry is not None:
+            self._data.move_to_end(self.key(request))
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or everything when no key is given."""
+        if key is None:
+            self._data.clear()
+            self.size = 0
+        elif key in self._data:
+            self.size -= len(self._data.pop(key)[2])
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport adding a circuit breaker per endpoint class and stale-on-error
+    reads. Failures are 5xx responses and network errors left after the wrapped
+    transport's retries. While a breaker is open, GETs are answered from the last
+    known good response, marked with a '_stale' field, and other requests fail
+    fast with a 503. Only Storyblok API hosts are covered and only JSON bodies are
+    kept; requests sent with extensions={"stream": True} are passed through untouched.
+    Attributes:
+        breakers (Dict[str, CircuitBreaker]): Breaker per endpoint class.
+        stale (StaleCache): Last known good GET responses.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        """
+        Initialize ResilientTransport.
+        Args:
+            transport (httpx.AsyncBaseTransport): Wrapped (retrying) transport.
+        """
+        self._transport = transport
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stale = StaleCache()
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Breaker for an endpoint class, created on first use."""
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker()
+        return self.breakers[name]
+
+    def _serve_stale(self, request: httpx.Request, reason: str) -> Optional[httpx.Response]:
+        entry = self.stale.get(request) if request.method == "GET" else None
+        if entry is None:
+            return None
+        saved_at, headers, body = entry
+        try:
+            data = httpx.Response(200, headers=headers, content=body).json()
+        except ValueError:
+            return None
+        if isinstance(data, dict):
+            data["_stale"] = {"reason": reason, "age_seconds": round(time.time() - saved_at)}
+        api_metrics.increment("stale_served")
+        kept = {k: v for k, v in headers.items() if k not in ("content-encoding", "content-type")}
+        return httpx.Response(200, headers={**kept, "x-stale": "1"}, json=data, request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.extensions.get("stream") or request.url.host not in API_HOSTS:
+            return await self._transport.handle_async_request(request)
+        name = endpoint_class(request)
+        breaker = self.breaker(name)
+        if not breaker.allow():
+            api_metrics.increment("breaker_rejected")
+            stale = self._serve_stale(request, f"circuit open for {name}")
+            if stale is not None:
+                return stale
+            wait = breaker.retry_in()
+            return httpx.Response(
+                503,
+                headers={"retry-after": str(int(wait) + 1)},
+                json={"error": f"Storyblok API unhealthy ({name}); failing fast, next probe in {wait:.0f}s"},
+                request=request,
+            )
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as exc:
+            breaker.record_failure()
+            stale = self._serve_stale(request, f"{type(exc).__name__}: {exc}")
+            if stale is not None:
+                return stale
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+            stale = self._serve_stale(request, f"upstream {response.status_code}")
+            if stale is not None:
+                await response.aclose()
+                return stale
+            return response
+
+        breaker.record_success()
+        if request.method != "GET" or response.status_code != 200 or "json" not in response.headers.get("content-type", ""):
+            return response
+        body = b"".join([chunk async for chunk in response.stream])
+        await response.aclose()
+        self.stale.set(request, response.headers, body)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breakers that are not closed, plus stale cache usage."""
+        return {
+            "breakers": {
+                name: {"state": b.state, "failures": b.failures, "retry_in_seconds": round(b.retry_in())}
+                for name, b in sorted(self.breakers.items()) if b.state != CLOSED or b.failures
+            },
+            "stale_cache": {"entries": len(self.stale), "bytes": self.stale.size},
+        }
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,133 @@
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+
+
+def extract_references(content: Any) -> Tuple[Set[str], Set[int]]:
+    """
+    Collect story and asset references from a story's content tree.
+    Recognises multilink fields (linktype 'story'), richtext link marks,
+    single/multi-option reference fields (bare story UUIDs) and asset/multiasset fields.
+    Blok `_uid` values are ignored. UUIDs that do not belong to a story are
+    dropped later when they fail to resolve.
+    Args:
+        content (Any): Story content (blok tree).
+    Returns:
+        Tuple[Set[str], Set[int]]: Referenced story UUIDs and asset IDs.
+    """
+    story_uuids: Set[str] = set()
+    asset_ids: Set[int] = set()
+    stack = [content]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            if node.get("linktype") == "story" and node.get("id"):
+                story_uuids.add(str(node["id"]))
+            elif node.get("type") == "link" and isinstance(node.get("attrs"), dict):
+                attrs = node["attrs"]
+                if attrs.get("linktype") == "story" and attrs.get("uuid"):
+                    story_uuids.add(str(attrs["uuid"]))
+            elif node.get("fieldtype") == "asset" and isinstance(node.get("id"), int):
+                asset_ids.add(node["id"])
+            for key, value in node.items():
+                if key == "_uid":
+                    continue
+                if isinstance(value, str):
+                    if UUID_RE.match(value):
+                        story_uuids.add(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, str) and UUID_RE.match(node):
+            story_uuids.add(node)
+
+    return story_uuids, asset_ids
+
+
+def strongly_connected_components(edges: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Tarjan's algorithm (iterative) over a dependency graph.
+    Args:
+        edges (Dict[str, Set[str]]): Node -> nodes it depends on.
+    Returns:
+        List[List[str]]: Components in reverse topological order (dependencies first).
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in edges:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(edges.get(root, ()))))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in edges:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(edges.get(child, ())))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+    return components
+
+
+def publish_stages(edges: Dict[str, Set[str]]) -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    Order nodes so every story is published after the stories it links to.
+    Cycles are collapsed into a single unit and placed in the same stage.
+    Args:
+        edges (Dict[str, Set[str]]): Node -> nodes it depends on.
+    Returns:
+        Tuple[List[List[str]], List[List[str]]]: Stages (each publishable in parallel,
+        dependencies first) and detected cycles.
+    """
+    components = strongly_connected_components(edges)
+    owner = {node: i for i, comp in enumerate(components) for node in comp}
+    cycles = [
+        comp for comp in components
+        if len(comp) > 1 or comp[0] in edges.get(comp[0], ())
+    ]
+
+    level: Dict[int, int] = {}
+    for i, comp in enumerate(components):
+        deps = {owner[d] for n in comp for d in edges.get(n, ()) if d in owner} - {i}
+        level[i] = 1 + max((level[d] for d in deps), default=-1)
+
+    stages: List[List[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for i, comp in enumerate(components):
+        stages[level[i]].extend(comp)
+    return [sorted(stage) for stage in stages], cycles